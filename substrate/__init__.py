@@ -0,0 +1,51 @@
+"""grid3 substrate client
+
+The public classes are importable from the package, their modules are only imported on first access:
+
+    from substrate import Manager
+"""
+
+import importlib
+
+# public names by module, imported on first access
+_LAZY_ATTRIBUTES = {
+    "Client": "substrate.manager",
+    "Manager": "substrate.manager",
+    "ConnectionPool": "substrate.pool",
+    "Identity": "substrate.identity",
+    "Keyring": "substrate.keyring",
+    "Account": "substrate.account",
+    "BalanceWatcher": "substrate.balance_watcher",
+    "Twin": "substrate.twin",
+    "Farm": "substrate.farm",
+    "Node": "substrate.node",
+    "Contract": "substrate.contract",
+    "Deployment": "substrate.deployment",
+    "RefundTransaction": "substrate.bridge",
+    "MintTransaction": "substrate.bridge",
+    "BridgeBatchProcessor": "substrate.bridge",
+    "BridgeIndex": "substrate.bridge_index",
+    "EventRecords": "substrate.event_records",
+    "EventSubscription": "substrate.subscription",
+    "StorageCache": "substrate.cache",
+    "NodeTable": "substrate.node_table",
+    "Placement": "substrate.placement",
+    "GeoIndex": "substrate.geo",
+    "GridMirror": "substrate.mirror",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    attribute = getattr(importlib.import_module(module), name)
+    globals()[name] = attribute
+    return attribute
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,13 +1,19 @@
 """Account module"""
+
+from __future__ import annotations
+
 from dataclasses import dataclass
 import hashlib
 import http
-import requests
-
-from substrateinterface import SubstrateInterface
+from typing import TYPE_CHECKING
 
 from substrate.exceptions import AcceptingTermsAndConditionsFailed, AccountActivationFailed
-from .identity import Identity
+from substrate.nonce import NonceManager
+from substrate.storage import DEFAULT_CHUNK_SIZE, query_multi
+from .identity import SS58_FORMAT, Identity
+
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
 
 
 @dataclass
@@ -32,14 +38,26 @@ class Balance:
         """
 
         account_info = substrate.query("System", "Account", [public_key])
-        data = account_info["data"]
+        return Balance.from_value(account_info.value["data"])
 
-        free = data["free"].value
-        reserved = data["reserved"].value
-        misc_frozen = data["misc_frozen"].value
-        fee_frozen = data["fee_frozen"].value
+    @staticmethod
+    def from_value(data: dict):
+        """create a balance from the decoded data of an account
+
+        Args:
+            data (dict): decoded AccountData, like the data of a System Account storage entry
 
-        return Balance(free, reserved, misc_frozen, fee_frozen)
+        Returns:
+            Balance: account balance
+        """
+        # runtimes with a single frozen balance have no misc and fee frozen balances
+        frozen = data.get("frozen", 0)
+        return Balance(
+            free=data["free"],
+            reserved=data["reserved"],
+            misc_frozen=data.get("misc_frozen", frozen),
+            fee_frozen=data.get("fee_frozen", frozen),
+        )
 
 
 @dataclass
@@ -52,6 +70,74 @@ class AccountInfo:
     sufficients: int
     balance: Balance
 
+    @staticmethod
+    def from_value(account_info: dict):
+        """create an account info from its decoded value
+
+        Args:
+            account_info (dict): decoded AccountInfo, like the value of a System Account storage entry
+
+        Returns:
+            AccountInfo: account information including balance, nonce, ..
+        """
+        return AccountInfo(
+            nonce=account_info["nonce"],
+            consumers=account_info["consumers"],
+            providers=account_info["providers"],
+            sufficients=account_info["sufficients"],
+            balance=Balance.from_value(account_info["data"]),
+        )
+
+
+@dataclass
+class BalanceSnapshot:
+    """balances of many accounts at a single block, a list per balance field in the order of the addresses"""
+
+    block_hash: str
+    addresses: list[str]
+    free: list[int]
+    reserved: list[int]
+    misc_frozen: list[int]
+    fee_frozen: list[int]
+
+    def __post_init__(self):
+        self._rows = {address: row for row, address in enumerate(self.addresses)}
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __contains__(self, address: str):
+        return address in self._rows
+
+    def row_of(self, address: str):
+        """get the row of an account
+
+        Args:
+            address (str): account address
+
+        Raises:
+            KeyError: account is not in the snapshot
+
+        Returns:
+            int: row
+        """
+        return self._rows[address]
+
+    def get(self, address: str):
+        """get the balance of an account
+
+        Args:
+            address (str): account address
+
+        Raises:
+            KeyError: account is not in the snapshot
+
+        Returns:
+            Balance: account balance
+        """
+        row = self._rows[address]
+        return Balance(self.free[row], self.reserved[row], self.misc_frozen[row], self.fee_frozen[row])
+
 
 class Account:
     """Account class"""
@@ -64,22 +150,7 @@ class Account:
     def get(self):
         """get account of the provided account ID"""
         account_info = self.substrate.query("System", "Account", [self.identity.public_key])
-
-        nonce = account_info["nonce"].value
-        consumers = account_info["consumers"].value
-        providers = account_info["providers"].value
-        sufficients = account_info["sufficients"].value
-
-        data = account_info["data"]
-
-        free = data["free"].value
-        reserved = data["reserved"].value
-        misc_frozen = data["misc_frozen"].value
-        fee_frozen = data["fee_frozen"].value
-
-        balance = Balance(free, reserved, misc_frozen, fee_frozen)
-
-        self.account_info = AccountInfo(nonce, consumers, providers, sufficients, balance)
+        self.account_info = AccountInfo.from_value(account_info.value)
 
         return self.account_info
 
@@ -104,8 +175,7 @@ class Account:
             {"document_link": document_link, "document_hash": document_hash},
         )
 
-        extrinsic = self.substrate.create_signed_extrinsic(call, self.identity.key_pair)
-        call_response = self.substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(self.identity).submit(self.substrate, call)
 
         if not call_response.is_success:
             raise AcceptingTermsAndConditionsFailed(call_response.error_message)
@@ -129,22 +199,51 @@ class Account:
         """
 
         account_info = substrate.query("System", "Account", [public_key])
+        return AccountInfo.from_value(account_info.value)
 
-        nonce = account_info["nonce"].value
-        consumers = account_info["consumers"].value
-        providers = account_info["providers"].value
-        sufficients = account_info["sufficients"].value
-
-        data = account_info["data"]
-
-        free = data["free"].value
-        reserved = data["reserved"].value
-        misc_frozen = data["misc_frozen"].value
-        fee_frozen = data["fee_frozen"].value
+    @staticmethod
+    def get_many(
+        substrate: SubstrateInterface,
+        public_keys: list,
+        at_block=None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """get the balances of many accounts at a single block, with a request per chunk of accounts
 
-        balance = Balance(free, reserved, misc_frozen, fee_frozen)
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            public_keys (list[bytes | str]): public keys or addresses
+            at_block (str | int, optional): block hash or number to read at, the finalized head is used if not set
+            chunk_size (int, optional): maximum number of accounts per request
 
-        return AccountInfo(nonce, consumers, providers, sufficients, balance)
+        Returns:
+            BalanceSnapshot: balances by address
+        """
+        # pylint: disable=import-outside-toplevel
+        from substrate.pool import connection
+
+        with connection(substrate) as conn:
+            if at_block is None:
+                block_hash = conn.get_chain_finalised_head()
+            elif isinstance(at_block, int):
+                block_hash = conn.get_block_hash(at_block)
+            else:
+                block_hash = at_block
+
+            addresses = list(dict.fromkeys(_address(public_key) for public_key in public_keys))
+            accounts = query_multi(
+                conn, "System", "Account", [[address] for address in addresses], block_hash, chunk_size
+            )
+
+        balances = [Balance.from_value(account_info.value["data"]) for account_info in accounts]
+        return BalanceSnapshot(
+            block_hash=block_hash,
+            addresses=addresses,
+            free=[balance.free for balance in balances],
+            reserved=[balance.reserved for balance in balances],
+            misc_frozen=[balance.misc_frozen for balance in balances],
+            fee_frozen=[balance.fee_frozen for balance in balances],
+        )
 
     @staticmethod
     def signed_terms_and_conditions(substrate: SubstrateInterface, public_key: bytes):
@@ -166,7 +265,20 @@ class Account:
             address (str): identity address
             substrate (SubstrateInterface): substrate client
         """
+        # requests is slow to import and only needed here
+        import requests  # pylint: disable=import-outside-toplevel
+
         response: requests.Response = requests.post(activation_url, {"substrateAccountID": address})
 
         if response.status_code != http.HTTPStatus.OK and response.status_code != http.HTTPStatus.CONFLICT:
             raise AccountActivationFailed("account activation failed")
+
+
+def _address(public_key):
+    """get the address of a public key, addresses are kept as they are"""
+    # pylint: disable=import-outside-toplevel
+    from substrateinterface.utils.ss58 import ss58_encode
+
+    if isinstance(public_key, str) and not public_key.startswith("0x"):
+        return public_key
+    return ss58_encode(public_key, SS58_FORMAT)
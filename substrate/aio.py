@@ -0,0 +1,990 @@
+"""asyncio substrate module
+
+Awaitable versions of the substrate getters and calls. JSON-RPC requests are multiplexed
+over one websocket and correlated by request ID, so many requests can be in flight at once:
+
+    substrate = await AsyncSubstrate.connect(url)
+    nodes = await asyncio.gather(*[Node.get(substrate, node_id) for node_id in node_ids])
+"""
+
+import asyncio
+import ipaddress
+import itertools
+import json
+import logging
+import threading
+from contextlib import aclosing
+
+from substrateinterface import ExtrinsicReceipt, SubstrateInterface
+from substrateinterface.exceptions import SubstrateRequestException
+from websocket import WebSocketException, create_connection
+
+from substrate.contract import Contract as SyncContract
+from substrate.contract import pad_hash
+from substrate.deployment import Deployment as SyncDeployment
+from substrate.event_records import EventRecords
+from substrate.events import CallResponse, Event
+from substrate.exceptions import (
+    ContractCancelException,
+    DeploymentCancelException,
+    DeploymentCreationException,
+    DeploymentUpdateException,
+    FarmCreationException,
+    NameContractCreationException,
+    NodeContractCreationException,
+    NodeContractUpdateException,
+    NodeCreationException,
+    NodeUpdateException,
+    RentContractCreationException,
+    TwinCreationException,
+    TwinUpdateException,
+)
+from substrate.farm import Farm as SyncFarm
+from substrate.farm import PublicIPInput
+from substrate.identity import Identity
+from substrate.metadata import open_connection
+from substrate.node import Interface, Location, OptionSerial, Resources
+from substrate.node import Node as SyncNode
+from substrate.nonce import NonceManager
+from substrate.resolver import LOOKUP_STORAGE, IdResolver
+from substrate.storage import decode_storage_value, storage_key_from_metadata
+from substrate.twin import Twin as SyncTwin
+
+# terminal extrinsic statuses without inclusion, the node sends them as a string or as a single key dict
+FAILED_EXTRINSIC_STATUSES = ("dropped", "invalid", "usurped", "finalityTimeout")
+
+
+class AsyncSubstrate:
+    """asyncio substrate client
+
+    Reads are encoded and decoded locally with the runtime metadata fetched at connection time,
+    only the JSON-RPC round trips go over the websocket. Composing and signing extrinsics still
+    relies on a blocking SubstrateInterface, it is run in a worker thread.
+    """
+
+    def __init__(self, url: str, substrate: SubstrateInterface):
+        self.url = url
+        self.substrate = substrate
+
+        self._loop = asyncio.get_running_loop()
+        self._sync_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._requests: dict[int, asyncio.Future] = {}
+        self._subscriptions: dict[str, asyncio.Queue] = {}
+        self._early_notifications: dict[str, list] = {}
+        self._closed = False
+
+        self._websocket = create_connection(url, enable_multithread=True, **substrate.ws_options)
+        self._reader = threading.Thread(target=self._read_messages, name=f"aio-substrate-{url}", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    async def connect(cls, url: str):
+        """connect to a substrate node
+
+        Args:
+            url (str): substrate websocket url
+
+        Returns:
+            AsyncSubstrate: async substrate instance
+        """
+        substrate = await asyncio.to_thread(open_connection, url)
+        await asyncio.to_thread(substrate.init_runtime)
+        return cls(url, substrate)
+
+    async def close(self):
+        """close the websocket connections"""
+        self._closed = True
+        await asyncio.to_thread(self._websocket.close)
+        await self.run_sync(self.substrate.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def init_runtime(self):
+        """reload the runtime metadata, needed after a runtime upgrade"""
+        await self.run_sync(self.substrate.init_runtime)
+
+    async def run_sync(self, func, *args, **kwargs):
+        """run a blocking call on the underlying SubstrateInterface in a worker thread
+
+        Args:
+            func (callable): blocking function
+
+        Returns:
+            any: function result
+        """
+
+        def locked():
+            with self._sync_lock:
+                return func(*args, **kwargs)
+
+        return await asyncio.to_thread(locked)
+
+    async def rpc_request(self, method: str, params: list):
+        """send a JSON-RPC request and wait for its response
+
+        Args:
+            method (str): JSON-RPC method
+            params (list): JSON-RPC params
+
+        Raises:
+            SubstrateRequestException: the request failed
+
+        Returns:
+            dict: JSON-RPC response
+        """
+        if self._closed:
+            raise ConnectionError("substrate connection is closed")
+
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self._requests[request_id] = future
+
+        payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+        try:
+            # the send blocks while the frame is written, keep it off the event loop
+            await self._loop.run_in_executor(None, self._websocket.send, json.dumps(payload))
+        except (WebSocketException, OSError):
+            self._requests.pop(request_id, None)
+            raise
+
+        response = await future
+        if "error" in response:
+            raise SubstrateRequestException(response["error"]["message"])
+
+        return response
+
+    async def subscribe(self, method: str, params: list, unsubscribe_method: str):
+        """subscribe to JSON-RPC notifications
+
+        Args:
+            method (str): JSON-RPC subscription method
+            params (list): JSON-RPC params
+            unsubscribe_method (str): JSON-RPC method to end the subscription
+
+        Yields:
+            any: notification results
+        """
+        response = await self.rpc_request(method, params)
+        subscription_id = response["result"]
+
+        notifications = asyncio.Queue()
+        self._subscriptions[subscription_id] = notifications
+        for notification in self._early_notifications.pop(subscription_id, []):
+            notifications.put_nowait(notification)
+
+        try:
+            while True:
+                notification = await notifications.get()
+                if isinstance(notification, Exception):
+                    raise notification
+                yield notification
+        finally:
+            self._subscriptions.pop(subscription_id, None)
+            if not self._closed:
+                try:
+                    await self.rpc_request(unsubscribe_method, [subscription_id])
+                except (SubstrateRequestException, WebSocketException, ConnectionError):
+                    pass
+
+    async def query(self, module: str, storage_function: str, params: list = None, block_hash: str = None):
+        """query a storage entry
+
+        Args:
+            module (str): storage module name
+            storage_function (str): storage function name
+            params (list, optional): storage function params
+            block_hash (str, optional): block hash to query at, the chain head is used if not set
+
+        Returns:
+            ScaleType: decoded entry, None for missing optional entries
+        """
+        metadata_module = self.substrate.metadata.get_metadata_pallet(module)
+        storage_item = metadata_module.get_storage_function(storage_function) if metadata_module else None
+        if storage_item is None:
+            raise ValueError(f'Storage function "{module}.{storage_function}" not found')
+
+        key = storage_key_from_metadata(self.substrate, metadata_module, storage_item, list(params or []))
+        response = await self.rpc_request("state_getStorage", [key, block_hash] if block_hash else [key])
+        return decode_storage_value(self.substrate, storage_item, response["result"])
+
+    async def subscribe_events(self, filters: list[tuple[str, str]] = None, twin_ids: set[int] = None):
+        """stream the decoded events of every finalized block
+
+            async for block_number, block_hash, records in substrate.subscribe_events(twin_ids={twin_id}):
+                ...
+
+        Args:
+            filters (list[tuple[str, str]], optional): (module, event) names to keep, all decodable events if not set
+            twin_ids (set[int], optional): keep the events of these twins only
+
+        Yields:
+            tuple[int, str, EventRecords]: block number, block hash and event records of the blocks with matching events
+        """
+        wanted = Event.wanted_events(filters)
+
+        metadata_module = self.substrate.metadata.get_metadata_pallet("System")
+        storage_item = metadata_module.get_storage_function("Events")
+        events_key = storage_key_from_metadata(self.substrate, metadata_module, storage_item, [])
+
+        last_block = None
+        heads = self.subscribe("chain_subscribeFinalizedHeads", [], "chain_unsubscribeFinalizedHeads")
+        async with aclosing(heads) as heads:
+            async for head in heads:
+                head_number = int(head["number"], 16)
+                first_block = head_number if last_block is None else last_block + 1
+
+                # a finality jump finalizes many blocks at once
+                for block_number in range(first_block, head_number + 1):
+                    block_hash = (await self.rpc_request("chain_getBlockHash", [block_number]))["result"]
+                    response = await self.rpc_request("state_getStorage", [events_key, block_hash])
+                    last_block = block_number
+
+                    events = decode_storage_value(self.substrate, storage_item, response["result"])
+                    events = [e for e in events.value_object if (e.value["module_id"], e.value["event_id"]) in wanted]
+                    if len(events) == 0:
+                        continue
+
+                    records = EventRecords.decode(events)
+                    if twin_ids is not None:
+                        records = records.filter_twins(twin_ids)
+                        if len(records) == 0:
+                            continue
+
+                    yield block_number, block_hash, records
+
+    async def sign_and_submit(
+        self,
+        identity: Identity,
+        call_module: str,
+        call_function: str,
+        call_params: dict,
+        wait_for_finalization: bool = True,
+    ):
+        """compose, sign and submit an extrinsic and wait for its inclusion
+
+        Args:
+            identity (Identity): signer identity
+            call_module (str): call module name
+            call_function (str): call function name
+            call_params (dict): call params
+            wait_for_finalization (bool, optional): wait for finalization instead of inclusion
+
+        Raises:
+            SubstrateRequestException: the extrinsic was dropped, is invalid, usurped or not finalized in time
+
+        Returns:
+            ExtrinsicReceipt: extrinsic receipt
+        """
+
+        def sign():
+            call = self.substrate.compose_call(call_module, call_function, call_params)
+            return nonce_manager.sign(self.substrate, call)
+
+        nonce_manager = NonceManager.for_identity(identity)
+        extrinsic = await self.run_sync(sign)
+        extrinsic_hash = f"0x{extrinsic.extrinsic_hash.hex()}"
+
+        status_key = "finalized" if wait_for_finalization else "inBlock"
+        subscription = self.subscribe(
+            "author_submitAndWatchExtrinsic", [str(extrinsic.data)], "author_unwatchExtrinsic"
+        )
+        try:
+            async with aclosing(subscription) as statuses:
+                async for status in statuses:
+                    status_name = _status_name(status)
+                    if status_name == status_key:
+                        receipt = ExtrinsicReceipt(
+                            self.substrate, extrinsic_hash, status[status_key], finalized=wait_for_finalization
+                        )
+                        # process the events while holding the lock, the receipt queries them lazily
+                        await self.run_sync(lambda: receipt.is_success)
+                        return receipt
+
+                    if status_name == "retracted":
+                        # the block including the extrinsic left the best chain, it is included again or fails later
+                        logging.warning("extrinsic %s block %s is retracted", extrinsic_hash, status["retracted"])
+                    elif status_name in FAILED_EXTRINSIC_STATUSES:
+                        raise SubstrateRequestException(f"extrinsic {extrinsic_hash} failed with status {status}")
+        except SubstrateRequestException:
+            # the extrinsic did not use its nonce
+            nonce_manager.resync()
+            raise
+
+        raise ConnectionError(f"extrinsic {extrinsic_hash} status subscription ended")
+
+    def _read_messages(self):
+        """read websocket messages in a thread and hand them to the event loop"""
+        try:
+            while True:
+                message = json.loads(self._websocket.recv())
+                self._loop.call_soon_threadsafe(self._dispatch, message)
+        except (WebSocketException, OSError, ValueError) as exp:
+            if not self._closed:
+                logging.exception("substrate websocket reader stopped")
+            self._loop.call_soon_threadsafe(self._fail_all, ConnectionError(f"substrate connection lost: {exp}"))
+
+    def _dispatch(self, message: dict):
+        """resolve the request or feed the subscription a message belongs to"""
+        if "id" in message:
+            future = self._requests.pop(message["id"], None)
+            if future is not None and not future.done():
+                future.set_result(message)
+            return
+
+        params = message.get("params", {})
+        subscription_id = params.get("subscription")
+        notifications = self._subscriptions.get(subscription_id)
+        if notifications is not None:
+            notifications.put_nowait(params["result"])
+        else:
+            # the subscription response is still being awaited
+            self._early_notifications.setdefault(subscription_id, []).append(params["result"])
+
+    def _fail_all(self, exp: Exception):
+        """fail all pending requests and subscriptions"""
+        self._closed = True
+        for future in self._requests.values():
+            if not future.done():
+                future.set_exception(exp)
+        self._requests.clear()
+        for notifications in self._subscriptions.values():
+            notifications.put_nowait(exp)
+
+
+def _status_name(status):
+    """get the name of an extrinsic status, like ready or {"inBlock": hash}"""
+    if isinstance(status, dict):
+        return next(iter(status), None)
+    return status
+
+
+async def _submit(
+    substrate: AsyncSubstrate, identity: Identity, module: str, function: str, params: dict, exception_cls
+):
+    """submit a call and raise exception_cls if it fails"""
+    call_response = await substrate.sign_and_submit(identity, module, function, params)
+    if not call_response.is_success:
+        raise exception_cls(call_response.error_message)
+    return call_response
+
+
+async def _resolve(substrate: AsyncSubstrate, storage_function: str, key):
+    """get an ID from the memoized mappings of IdResolver or from the chain"""
+    cached_id = IdResolver.get(storage_function, key)
+    if cached_id is not None:
+        return cached_id
+
+    resolved = await substrate.query(LOOKUP_STORAGE[storage_function], storage_function, [key])
+    resolved_id = resolved.value or 0 if resolved is not None else 0
+    if resolved_id != 0:
+        IdResolver.set(storage_function, key, resolved_id)
+
+    return resolved_id
+
+
+def _last_event(call_response: ExtrinsicReceipt, event_field: str, exception_cls):
+    """get the last event of a type triggered by an extrinsic, raise exception_cls if there is none"""
+    events = getattr(EventRecords.decode(call_response.triggered_events), event_field)
+    if len(events) == 0:
+        raise exception_cls(f"extrinsic did not trigger {event_field}")
+    return events[-1]
+
+
+class Twin:
+    """async twin calls"""
+
+    @staticmethod
+    async def get_from_id(substrate: AsyncSubstrate, id: int):
+        """get the twin info using ID
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            id (int): the twin id
+
+        Raises:
+            ValueError: twin is not found
+
+        Returns:
+            TwinInfo: the info for a twin
+        """
+        twin = await substrate.query("TfgridModule", "Twins", [id])
+        if twin is None or twin.value is None:
+            raise ValueError(f"twin with id {id} is not found")
+
+        return SyncTwin.decode(twin)
+
+    @staticmethod
+    async def get_twin_id_from_public_key(substrate: AsyncSubstrate, public_key: bytes):
+        """get twin ID from a public key
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            public_key (bytes): identity public key
+
+        Raises:
+            ValueError: twin is not found
+
+        Returns:
+            int: twin ID
+        """
+        twin_id = await _resolve(substrate, "TwinIdByAccountID", public_key)
+        if twin_id == 0:
+            raise ValueError(f"twin with public key {public_key} is not found")
+
+        return twin_id
+
+    @staticmethod
+    async def create(substrate: AsyncSubstrate, identity: Identity, ip: str):
+        """creates a new twin for the identity
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): twin's owner identity
+            ip (str): the ip for the twin
+
+        Raises:
+            TwinCreationException: creating a new twin failed
+
+        Returns:
+            int: twin ID
+        """
+        ipaddress.IPv6Address(ip)
+
+        try:
+            return await Twin.get_twin_id_from_public_key(substrate, identity.public_key)
+        except ValueError:
+            pass
+
+        call_response = await _submit(
+            substrate, identity, "TfgridModule", "create_twin", {"ip": ip}, TwinCreationException
+        )
+        twin_id = _last_event(call_response, "TfgridModule_TwinStored", TwinCreationException).twin.id
+        IdResolver.set("TwinIdByAccountID", identity.public_key, twin_id)
+        return twin_id
+
+    @staticmethod
+    async def update(substrate: AsyncSubstrate, identity: Identity, ip: str):
+        """updates a twin with the ip
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): twin's owner identity
+            ip (str): the updated ip for the twin
+
+        Raises:
+            TwinUpdateException: updating the twin failed
+        """
+        ipaddress.IPv6Address(ip)
+
+        await _submit(substrate, identity, "TfgridModule", "update_twin", {"ip": ip}, TwinUpdateException)
+
+
+class Farm:
+    """async farm calls"""
+
+    @staticmethod
+    async def get(substrate: AsyncSubstrate, farm_id: int):
+        """get a farm by ID
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            farm_id (int): farm ID
+
+        Raises:
+            ValueError: farm is not found
+
+        Returns:
+            Farm: farm object
+        """
+        farm = await substrate.query("TfgridModule", "Farms", [farm_id])
+        if farm is None or farm.value is None:
+            raise ValueError(f"farm with id {farm_id} is not found")
+
+        return SyncFarm.decode(farm)
+
+    @staticmethod
+    async def get_farm_id_by_name(substrate: AsyncSubstrate, name: str):
+        """get farm ID by name
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            name (str): farm's name
+
+        Returns:
+            int: farm ID
+        """
+        return await _resolve(substrate, "FarmIdByName", name)
+
+    @staticmethod
+    async def create(substrate: AsyncSubstrate, identity: Identity, name: str, public_ips: list[PublicIPInput]):
+        """create a new farm
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): farm's owner identity
+            name (str): farm's name
+            public_ips (list[PublicIPInput]): farm's public ips
+
+        Raises:
+            FarmCreationException: farm creation failed
+
+        Returns:
+            int: farm ID
+        """
+        farm_id = await Farm.get_farm_id_by_name(substrate, name)
+        if farm_id != 0:
+            return farm_id
+
+        params = {"name": name, "public_ips": [i.__dict__ for i in public_ips]}
+        call_response = await _submit(substrate, identity, "TfgridModule", "create_farm", params, FarmCreationException)
+        farm_id = _last_event(call_response, "TfgridModule_FarmStored", FarmCreationException).farm.id
+        IdResolver.set("FarmIdByName", name, farm_id)
+        return farm_id
+
+
+class Node:
+    """async node calls"""
+
+    @staticmethod
+    async def get(substrate: AsyncSubstrate, node_id: int):
+        """get a node
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            node_id (int): node ID
+
+        Raises:
+            ValueError: node is not found
+
+        Returns:
+            Node: node object
+        """
+        node = await substrate.query("TfgridModule", "Nodes", [node_id])
+        if node is None or node.value is None:
+            raise ValueError(f"node with id {node_id} is not found")
+
+        return SyncNode.decode(node)
+
+    @staticmethod
+    async def get_id_by_twin_id(substrate: AsyncSubstrate, twin_id: int):
+        """get node id by its twin id
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            twin_id (int): node's twin ID
+
+        Returns:
+            int: node ID
+        """
+        return await _resolve(substrate, "NodeIdByTwinID", twin_id)
+
+    @staticmethod
+    async def create(
+        substrate: AsyncSubstrate,
+        identity: Identity,
+        farm_id: int,
+        resources: Resources,
+        location: Location,
+        interfaces: list[Interface],
+        secure_boot: bool,
+        virtualized: bool,
+        serial_number: OptionSerial,
+    ):
+        """create a new node
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): node's owner identity
+            farm_id (int): node farm's ID
+            resources (Resources): node resources
+            location (Location): node location
+            interfaces (list[Interface]): node interfaces
+            secure_boot (bool): node secure_boot
+            virtualized (bool): node virtualized
+            serial_number (OptionSerial): node serial_number
+
+        Raises:
+            NodeCreationException: Node creation failed
+
+        Returns:
+            int: node ID
+        """
+        twin_id = await Twin.get_twin_id_from_public_key(substrate, identity.address)
+
+        node_id = await Node.get_id_by_twin_id(substrate, twin_id)
+        if node_id != 0:
+            return node_id
+
+        params = {
+            "farm_id": farm_id,
+            "resources": resources.__dict__,
+            "location": location.__dict__,
+            "interfaces": [i.__dict__ for i in interfaces],
+            "secure_boot": secure_boot,
+            "virtualized": virtualized,
+            "serial_number": serial_number.as_value,
+        }
+        call_response = await _submit(substrate, identity, "TfgridModule", "create_node", params, NodeCreationException)
+        node_id = _last_event(call_response, "TfgridModule_NodeStored", NodeCreationException).node.id
+        IdResolver.set("NodeIdByTwinID", twin_id, node_id)
+        return node_id
+
+    @staticmethod
+    async def update(
+        substrate: AsyncSubstrate,
+        identity: Identity,
+        node_id: int,
+        farm_id: int,
+        resources: Resources,
+        location: Location,
+        interfaces: list[Interface],
+        secure_boot: bool,
+        virtualized: bool,
+        serial_number: OptionSerial,
+    ):
+        """update a node
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): node's owner identity
+            node_id (int): node's ID
+            farm_id (int): node farm's ID
+            resources (Resources): node resources
+            location (Location): node location
+            interfaces (list[Interface]): node interfaces
+            secure_boot (bool): node secure_boot
+            virtualized (bool): node virtualized
+            serial_number (OptionSerial): node serial_number
+
+        Raises:
+            NodeUpdateException: Node update failed
+        """
+        params = {
+            "node_id": node_id,
+            "farm_id": farm_id,
+            "resources": resources.__dict__,
+            "location": location.__dict__,
+            "interfaces": [i.__dict__ for i in interfaces],
+            "secure_boot": secure_boot,
+            "virtualized": virtualized,
+            "serial_number": serial_number.as_value,
+        }
+        await _submit(substrate, identity, "TfgridModule", "update_node", params, NodeUpdateException)
+
+
+class Contract:
+    """async contract calls"""
+
+    @staticmethod
+    async def get(substrate: AsyncSubstrate, contract_id: int):
+        """get a contract
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            contract_id (int): contract ID
+
+        Raises:
+            ValueError: contract is not found
+
+        Returns:
+            Contract: contract object
+        """
+        contract = await substrate.query("SmartContractModule", "Contracts", [contract_id])
+        if contract is None or contract.value is None:
+            raise ValueError(f"contract with id {contract_id} is not found")
+
+        return SyncContract.decode(contract)
+
+    @staticmethod
+    async def get_contract_id_with_hash_and_node_id(substrate: AsyncSubstrate, node_id: int, hash: bytes):
+        """get contract id with hash and node id
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            node_id (int): node ID
+            hash (bytes): deployment hash
+
+        Returns:
+            int: contract ID
+        """
+        contract_id = await substrate.query("SmartContractModule", "ContractIDByNodeIDAndHash", [node_id, hash])
+        return contract_id.value
+
+    @staticmethod
+    async def get_contract_id_by_name_registration(substrate: AsyncSubstrate, name: str):
+        """get contract ID from name
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            name (str): contract name
+
+        Returns:
+            int: contract ID
+        """
+        return await _resolve(substrate, "ContractIDByNameRegistration", name)
+
+    @staticmethod
+    async def create_node_contract(
+        substrate: AsyncSubstrate,
+        identity: Identity,
+        node_id: int,
+        data: str,
+        hash: str,
+        public_ips: int,
+        solution_provider_id: int = None,
+    ):
+        """create a new node contract
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): contract's owner identity
+            node_id (int): node ID for the contract
+            data (str): contract deployment data
+            hash (str): contract deployment hash
+            public_ips (int): number of public ips
+            solution_provider_id (int, optional): solution provider id
+
+        Raises:
+            NodeContractCreationException: creating a node contract failed
+
+        Returns:
+            int: contract ID
+        """
+        byte_hash_32 = pad_hash(hash)
+
+        contract_id = await Contract.get_contract_id_with_hash_and_node_id(substrate, node_id, byte_hash_32)
+        if contract_id != 0:
+            return contract_id
+
+        params = {
+            "node_id": node_id,
+            "deployment_data": data,
+            "deployment_hash": byte_hash_32,
+            "public_ips": public_ips,
+            "solution_provider_id": solution_provider_id,
+        }
+        call_response = await _submit(
+            substrate, identity, "SmartContractModule", "create_node_contract", params, NodeContractCreationException
+        )
+        contract_created = _last_event(
+            call_response, "SmartContractModule_ContractCreated", NodeContractCreationException
+        )
+        return contract_created.contract.contract_id
+
+    @staticmethod
+    async def update_node_contract(
+        substrate: AsyncSubstrate, identity: Identity, contract_id: int, data: str, hash: str
+    ):
+        """update a node contract
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): contract's owner identity
+            contract_id (int): contract ID
+            data (str): deployment data for contract
+            hash (str): deployment hash for contract
+
+        Raises:
+            NodeContractUpdateException: updating the node contract failed
+        """
+        params = {"contract_id": contract_id, "deployment_data": data, "deployment_hash": pad_hash(hash)}
+        await _submit(
+            substrate, identity, "SmartContractModule", "update_node_contract", params, NodeContractUpdateException
+        )
+
+    @staticmethod
+    async def create_name_contract(substrate: AsyncSubstrate, identity: Identity, name: str):
+        """create a new name contract
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): contract's owner identity
+            name (str): name for the contract
+
+        Raises:
+            NameContractCreationException: creating a name contract failed
+
+        Returns:
+            int: contract ID
+        """
+        contract_id = await Contract.get_contract_id_by_name_registration(substrate, name)
+        if contract_id != 0:
+            return contract_id
+
+        call_response = await _submit(
+            substrate,
+            identity,
+            "SmartContractModule",
+            "create_name_contract",
+            {"name": name},
+            NameContractCreationException,
+        )
+        contract_created = _last_event(
+            call_response, "SmartContractModule_ContractCreated", NameContractCreationException
+        )
+        IdResolver.set("ContractIDByNameRegistration", name, contract_created.contract.contract_id)
+        return contract_created.contract.contract_id
+
+    @staticmethod
+    async def create_rent_contract(
+        substrate: AsyncSubstrate, identity: Identity, node_id: int, solution_provider_id: int = None
+    ):
+        """create a new rent contract
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): contract's owner identity
+            node_id (int): node ID for the contract
+            solution_provider_id (int, optional): solution provider id
+
+        Raises:
+            RentContractCreationException: Rent contract creation failed
+
+        Returns:
+            int: contract ID
+        """
+        params = {"node_id": node_id, "solution_provider_id": solution_provider_id}
+        call_response = await _submit(
+            substrate, identity, "SmartContractModule", "create_rent_contract", params, RentContractCreationException
+        )
+        contract_created = _last_event(
+            call_response, "SmartContractModule_ContractCreated", RentContractCreationException
+        )
+        return contract_created.contract.contract_id
+
+    @staticmethod
+    async def cancel(substrate: AsyncSubstrate, identity: Identity, contract_id: int):
+        """cancel a contract
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): contract's owner identity
+            contract_id (int): contract ID
+
+        Raises:
+            ContractCancelException: canceling the contract failed
+        """
+        params = {"contract_id": contract_id}
+        await _submit(substrate, identity, "SmartContractModule", "cancel_contract", params, ContractCancelException)
+        IdResolver.invalidate("ContractIDByNameRegistration", value=contract_id)
+
+
+class Deployment:
+    """async deployment calls"""
+
+    @staticmethod
+    async def get(substrate: AsyncSubstrate, deployment_id: int):
+        """get a deployment
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            deployment_id (int): deployment ID
+
+        Raises:
+            ValueError: deployment is not found
+
+        Returns:
+            Deployment: deployment object
+        """
+        deployment = await substrate.query("SmartContractModule", "Deployments", [deployment_id])
+        if deployment is None or deployment.value is None:
+            raise ValueError(f"deployment with id {deployment_id} is not found")
+
+        return SyncDeployment.decode(deployment_id, deployment)
+
+    @staticmethod
+    async def create(
+        substrate: AsyncSubstrate,
+        identity: Identity,
+        capacity_reservation_contract_id: int,
+        hash: bytes,
+        data: str,
+        resources: Resources,
+        public_ips: int,
+    ):
+        """create a new deployment
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): deployment's owner identity
+            capacity_reservation_contract_id (int): capacity reservation ID for the contract
+            hash (bytes): deployment hash
+            data (str): deployment data
+            resources (Resources): deployment resources
+            public_ips (int): if it has public ips 0/1
+
+        Raises:
+            DeploymentCreationException: creating the deployment failed
+
+        Returns:
+            int: deployment ID
+        """
+        params = {
+            "capacity_reservation_contract_id": capacity_reservation_contract_id,
+            "hash": hash,
+            "data": data,
+            "resources": resources,
+            "public_ips": public_ips,
+        }
+        call_response = await _submit(
+            substrate, identity, "SmartContractModule", "deployment_create", params, DeploymentCreationException
+        )
+
+        deployment_ids = await substrate.run_sync(
+            Event.get_created_deployments_ids,
+            substrate.substrate,
+            CallResponse.from_receipt(call_response, identity),
+        )
+        if len(deployment_ids) == 0:
+            raise DeploymentCreationException("failed to get deployment id after creation")
+
+        return deployment_ids[-1]
+
+    @staticmethod
+    async def update(
+        substrate: AsyncSubstrate,
+        identity: Identity,
+        deployment_id: int,
+        hash: bytes,
+        data: str,
+        resources: Resources,
+    ):
+        """update a deployment
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): deployment's owner identity
+            deployment_id (int): deployment ID
+            hash (bytes): deployment hash
+            data (str): deployment data
+            resources (Resources): deployment resources
+
+        Raises:
+            DeploymentUpdateException: updating the deployment failed
+        """
+        params = {"id": deployment_id, "hash": hash, "data": data, "resources": resources}
+        await _submit(
+            substrate, identity, "SmartContractModule", "deployment_update", params, DeploymentUpdateException
+        )
+
+    @staticmethod
+    async def cancel(substrate: AsyncSubstrate, identity: Identity, deployment_id: int):
+        """cancel a deployment
+
+        Args:
+            substrate (AsyncSubstrate): async substrate instance
+            identity (Identity): deployment's owner identity
+            deployment_id (int): deployment ID
+
+        Raises:
+            DeploymentCancelException: canceling the deployment failed
+        """
+        params = {"id": deployment_id}
+        await _submit(
+            substrate, identity, "SmartContractModule", "deployment_cancel", params, DeploymentCancelException
+        )
@@ -0,0 +1,243 @@
+"""balance watcher module"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from substrateinterface import SubstrateInterface
+
+from substrate.account import AccountInfo
+from substrate.metadata import open_connection
+from substrate.pool import CONNECTION_ERRORS
+from substrate.storage import decode_storage_value, get_storage_function, get_storage_key, storage_key_from_metadata
+
+# maximum number of accounts per storage subscription
+DEFAULT_SUBSCRIPTION_CHUNK_SIZE = 1000
+
+
+@dataclass
+class BalanceChange:
+    """balance change class"""
+
+    public_key: bytes
+    block_hash: str
+    # None on the first value received
+    previous: AccountInfo
+    current: AccountInfo
+
+
+class BalanceWatcher:
+    """in memory table of the accounts of many public keys kept current by storage subscriptions
+
+        def on_low_balance(change: BalanceChange):
+            ...
+
+        with BalanceWatcher(pool, public_keys) as watcher:
+            watcher.add_threshold_callback(10 * TFT, on_low_balance)
+            watcher.start()
+            account_info = watcher.get(public_key)
+
+    The System Account keys are subscribed with `state_subscribeStorage` in chunks, every chunk on a dedicated
+    connection and thread. The chain pushes the current values once subscribed, then the values changed by
+    every new block, nothing is polled. A lost subscription is reconnected and its values are received again.
+    The System LastRuntimeUpgrade key is subscribed with the accounts, on a runtime upgrade the subscription
+    is started again with the new runtime.
+    """
+
+    def __init__(
+        self,
+        substrate: SubstrateInterface,
+        public_keys: list[bytes],
+        chunk_size: int = DEFAULT_SUBSCRIPTION_CHUNK_SIZE,
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk size {chunk_size} is not valid")
+
+        self.substrate = substrate
+        self.public_keys = list(dict.fromkeys(public_keys))
+        self.chunk_size = chunk_size
+
+        # guards the accounts
+        self._lock = threading.Lock()
+        self._accounts: dict[bytes, AccountInfo] = {}
+        self._callbacks: list[Callable[[BalanceChange], None]] = []
+
+        self._stopped = threading.Event()
+        self._connections: list[SubstrateInterface] = []
+        self._threads: list[threading.Thread] = []
+
+    def add_callback(self, callback: Callable[[BalanceChange], None]):
+        """register a callback called with every change of an account
+
+        Args:
+            callback (Callable[[BalanceChange], None]): callback, called from the subscription threads
+        """
+        self._callbacks.append(callback)
+
+    def add_threshold_callback(
+        self, threshold: int, callback: Callable[[BalanceChange], None], notify_initial: bool = False
+    ):
+        """register a callback called when the free balance of an account falls below a threshold
+
+        The first value received for an account is not a change, an account already below the threshold
+        when subscribed is only reported with `notify_initial`.
+
+        Args:
+            threshold (int): free balance threshold
+            callback (Callable[[BalanceChange], None]): callback, called from the subscription threads
+            notify_initial (bool, optional): also call the callback for the accounts below the threshold when subscribed
+        """
+
+        def on_change(change: BalanceChange):
+            if change.previous is None:
+                was_above = notify_initial
+            else:
+                was_above = change.previous.balance.free >= threshold
+            if was_above and change.current.balance.free < threshold:
+                callback(change)
+
+        self._callbacks.append(on_change)
+
+    def get(self, public_key: bytes):
+        """get the last received account info of a public key
+
+        Args:
+            public_key (bytes): watched public key
+
+        Returns:
+            AccountInfo: account information, None if it is not received yet
+        """
+        with self._lock:
+            return self._accounts.get(public_key)
+
+    def accounts(self):
+        """get the last received account info of all the watched public keys
+
+        Returns:
+            dict[bytes, AccountInfo]: account information by public key
+        """
+        with self._lock:
+            return dict(self._accounts)
+
+    def start(self):
+        """subscribe to the accounts, every chunk in a thread"""
+        if len(self._threads) > 0:
+            return
+
+        for start in range(0, len(self.public_keys), self.chunk_size):
+            conn = open_connection(self.substrate.url)
+            public_keys = self.public_keys[start : start + self.chunk_size]
+            thread = threading.Thread(target=self._watch, args=(conn, public_keys), name="balance-watcher", daemon=True)
+            self._connections.append(conn)
+            self._threads.append(thread)
+
+        for thread in self._threads:
+            thread.start()
+
+    def close(self):
+        """stop the subscriptions"""
+        self._stopped.set()
+        for conn in self._connections:
+            try:
+                # interrupts the subscription waiting for the next change
+                conn.close()
+            except CONNECTION_ERRORS:
+                pass
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _watch(self, conn: SubstrateInterface, public_keys: list[bytes]):
+        """receive the changes of a chunk of accounts until the watcher is closed
+
+        The runtime of the chain head is read before every subscription, a subscription ends on a runtime upgrade
+        or on a value it can not decode.
+        """
+        while not self._stopped.is_set():
+            try:
+                metadata_module, storage_item = get_storage_function(conn, "System", "Account")
+                keys = {
+                    storage_key_from_metadata(conn, metadata_module, storage_item, [public_key]): public_key
+                    for public_key in public_keys
+                }
+                upgrade_key = get_storage_key(conn, "System", "LastRuntimeUpgrade")
+
+                subscription_id, failed = conn.rpc_request(
+                    "state_subscribeStorage",
+                    [[*keys, upgrade_key]],
+                    partial(self._on_changes, conn, storage_item, keys, upgrade_key),
+                )
+                if self._stopped.is_set():
+                    return
+
+                conn.rpc_request("state_unsubscribeStorage", [subscription_id])
+                if not failed:
+                    continue
+            except CONNECTION_ERRORS:
+                if self._stopped.is_set():
+                    return
+                logging.exception("balance watcher lost the storage subscription, reconnecting")
+
+                self._stopped.wait(1)
+                try:
+                    conn.connect_websocket()
+                except CONNECTION_ERRORS:
+                    logging.exception("failed to reconnect the balance watcher")
+                continue
+
+            # subscribe again after the decoding failure, without flooding the node
+            self._stopped.wait(1)
+
+    def _on_changes(
+        self,
+        conn: SubstrateInterface,
+        storage_item,
+        keys: dict[str, bytes],
+        upgrade_key: str,
+        message: dict,
+        update_nr: int,
+        subscription_id: str,
+    ):
+        """handle a storage subscription message, to end the subscription return its ID and if decoding failed"""
+        if self._stopped.is_set():
+            return subscription_id, False
+
+        result = message["params"]["result"]
+        # the first message has the current values, including the last runtime upgrade
+        if update_nr > 0 and any(key == upgrade_key for key, _ in result["changes"]):
+            logging.info("runtime upgraded at block %s, subscribing to the balances again", result["block"])
+            return subscription_id, False
+
+        for key, data in result["changes"]:
+            public_key = keys.get(key)
+            if public_key is None:
+                continue
+            try:
+                account_info = AccountInfo.from_value(decode_storage_value(conn, storage_item, data).value)
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("failed to decode an account at block %s, reading the runtime again", result["block"])
+                return subscription_id, True
+            self._update(public_key, result["block"], account_info)
+        return None
+
+    def _update(self, public_key: bytes, block_hash: str, account_info: AccountInfo):
+        """store a received account info and notify the callbacks if it changed"""
+        with self._lock:
+            previous = self._accounts.get(public_key)
+            if previous == account_info:
+                return
+            self._accounts[public_key] = account_info
+
+        change = BalanceChange(public_key, block_hash, previous, account_info)
+        for callback in self._callbacks:
+            try:
+                callback(change)
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("balance watcher callback failed")
@@ -0,0 +1,178 @@
+"""batch module"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from substrate.identity import Identity
+from substrate.nonce import NonceManager
+
+if TYPE_CHECKING:
+    from scalecodec.types import GenericCall
+    from substrateinterface import ExtrinsicReceipt, SubstrateInterface
+
+# Utility pallet functions and whether a failed call is reported per call instead of failing the extrinsic
+BATCH_MODES = {"batch_all": False, "force_batch": True, "batch": True}
+
+# events emitted by the transaction payment before the first call of an extrinsic is dispatched
+PRE_DISPATCH_EVENTS = {("Balances", "Withdraw")}
+
+
+@dataclass
+class BatchCallResult:
+    """result of a call of a batch"""
+
+    index: int
+    call: GenericCall
+    is_success: bool
+    error_message: dict = None
+    events: list = field(default_factory=list)
+
+
+class Batch:
+    """submit many calls composed by Contract, Deployment, Node... in a single Utility extrinsic
+
+        call_results = Batch.submit(substrate, identity, [Contract.cancel_call(substrate, id) for id in contract_ids])
+
+    With `batch_all` the calls are reverted together if any of them fails, with `force_batch`
+    every call succeeds or fails on its own, with `batch` the calls after the first failure are not dispatched.
+    """
+
+    @staticmethod
+    def call(substrate: SubstrateInterface, calls: list[GenericCall], mode: str = "batch_all"):
+        """compose a Utility batch call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            calls (list[GenericCall]): composed calls
+            mode (str, optional): Utility function, one of batch_all, force_batch or batch
+
+        Raises:
+            ValueError: batch mode is not valid
+
+        Returns:
+            GenericCall: composed call
+        """
+        if mode not in BATCH_MODES:
+            raise ValueError(f"batch mode {mode} is not valid, expected one of {list(BATCH_MODES)}")
+
+        return substrate.compose_call("Utility", mode, {"calls": calls})
+
+    @staticmethod
+    def submit(
+        substrate: SubstrateInterface,
+        identity: Identity,
+        calls: list[GenericCall],
+        mode: str = "batch_all",
+        wait_for_finalization: bool = True,
+    ):
+        """submit calls in a single Utility batch extrinsic
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            identity (Identity): signer identity
+            calls (list[GenericCall]): composed calls
+            mode (str, optional): Utility function, one of batch_all, force_batch or batch
+            wait_for_finalization (bool, optional): wait for the extrinsic block to be finalized
+
+        Returns:
+            list[BatchCallResult]: result and events of every call in the order of calls
+        """
+        if len(calls) == 0:
+            return []
+
+        call = Batch.call(substrate, calls, mode)
+        receipt = NonceManager.for_identity(identity).submit(substrate, call, True, wait_for_finalization)
+
+        return Batch.call_results(receipt, calls)
+
+    @staticmethod
+    def call_results(receipt: ExtrinsicReceipt, calls: list[GenericCall]):
+        """split the events of a batch extrinsic between its calls
+
+        The events of a call are the ones emitted after the `Utility` item event of the previous call, the fee
+        withdrawal emitted before the first call is dispatched is not part of any call.
+
+        Args:
+            receipt (ExtrinsicReceipt): batch extrinsic receipt
+            calls (list[GenericCall]): calls of the batch
+
+        Returns:
+            list[BatchCallResult]: result and events of every call in the order of calls
+        """
+        # pylint: disable=import-outside-toplevel
+        from substrate.pool import connection
+
+        # the receipt events and the module errors are read on the same connection, with the runtime of its block
+        with connection(receipt.substrate) as conn:
+            if not receipt.is_success:
+                # the batch is reverted, or the extrinsic failed before dispatching any call
+                return [
+                    BatchCallResult(idx, call, False, error_message=receipt.error_message)
+                    for idx, call in enumerate(calls)
+                ]
+
+            triggered_events = receipt.triggered_events
+            conn.init_runtime(block_hash=receipt.block_hash)
+
+            call_results = []
+            events = []
+            for event in triggered_events:
+                module_id = event.value["module_id"]
+                event_id = event.value["event_id"]
+
+                if module_id != "Utility":
+                    if len(call_results) > 0 or len(events) > 0 or (module_id, event_id) not in PRE_DISPATCH_EVENTS:
+                        events.append(event)
+                    continue
+
+                idx = len(call_results)
+                if event_id == "ItemCompleted":
+                    call_results.append(BatchCallResult(idx, calls[idx], True, events=events))
+                    events = []
+                elif event_id == "ItemFailed":
+                    error_message = dispatch_error_message(conn, event.value["attributes"]["error"])
+                    call_results.append(BatchCallResult(idx, calls[idx], False, error_message, events))
+                    events = []
+                elif event_id == "BatchInterrupted":
+                    error_message = dispatch_error_message(conn, event.value["attributes"]["error"])
+                    call_results.append(BatchCallResult(idx, calls[idx], False, error_message))
+                    events = []
+                    break
+
+        # calls after an interruption are not dispatched
+        for idx in range(len(call_results), len(calls)):
+            call_results.append(
+                BatchCallResult(idx, calls[idx], False, {"type": "Utility", "name": "NotDispatched", "docs": ""})
+            )
+
+        return call_results
+
+
+def dispatch_error_message(substrate: SubstrateInterface, dispatch_error: dict):
+    """describe a dispatch error the same way `ExtrinsicReceipt.error_message` does
+
+    Args:
+        substrate (SubstrateInterface): substrate instance
+        dispatch_error (dict): decoded DispatchError
+
+    Returns:
+        dict: error type, name and docs
+    """
+    if isinstance(dispatch_error, dict) and "Module" in dispatch_error:
+        if isinstance(dispatch_error["Module"], tuple):
+            module_index, error_index = dispatch_error["Module"]
+        else:
+            module_index = dispatch_error["Module"]["index"]
+            error_index = dispatch_error["Module"]["error"]
+
+        if isinstance(error_index, str):
+            # the error index is the first u8 of the [u8; 4] format
+            error_index = int(error_index[2:4], 16)
+
+        module_error = substrate.metadata.get_module_error(module_index=module_index, error_index=error_index)
+        return {"type": "Module", "name": module_error.name, "docs": module_error.docs}
+
+    name = next(iter(dispatch_error)) if isinstance(dispatch_error, dict) else str(dispatch_error)
+    return {"type": "System", "name": name, "docs": ""}
@@ -1,13 +1,51 @@
 """Bridge module"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from substrateinterface import SubstrateInterface
+from substrateinterface.utils.ss58 import ss58_decode
+from substrate.batch import Batch, BatchCallResult
 from substrate.exceptions import (
     ProposeOrVoteMintTransactionException,
     RefundTransactionCreationOrAddingSigException,
     SetRefundTransactionExecutedException,
 )
 from substrate.identity import Identity
+from substrate.nonce import NonceManager
+from substrate.pool import connection
+from substrate.storage import (
+    DEFAULT_CHUNK_SIZE,
+    decode_storage_value,
+    get_storage_function,
+    query_storage_at,
+    storage_key_from_metadata,
+)
+
+# status of a bridge transaction
+BRIDGE_TX_NEW = "new"
+BRIDGE_TX_PENDING = "pending"
+BRIDGE_TX_EXECUTED = "executed"
+
+# maximum number of calls per batch extrinsic
+DEFAULT_MAX_BATCH_SIZE = 100
+
+
+def pad_tx_hash(tx_hash: str):
+    """pad a stellar transaction hash to 32 bytes
+
+    Args:
+        tx_hash (str): transaction hash
+
+    Raises:
+        ValueError: hash is longer than 32 bytes
+
+    Returns:
+        bytes: 32 bytes hash
+    """
+    byte_hash = str.encode(tx_hash)
+    if len(byte_hash) > 32:
+        raise ValueError(f"hash length {len(byte_hash)} is not valid")
+
+    return byte_hash + bytearray(32 - len(byte_hash))
 
 
 @dataclass
@@ -55,7 +93,40 @@ class RefundTransaction:
         Raises:
             RefundTransactionCreationOrAddingSigException: Creation failed
         """
-        call = substrate.compose_call(
+        call = RefundTransaction.create_refund_transaction_or_add_sig_call(
+            substrate, tx_hash, target, amount, signature, stellar_address, sequence_number
+        )
+
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
+
+        if not call_response.is_success:
+            raise RefundTransactionCreationOrAddingSigException(call_response.error_message)
+
+    @staticmethod
+    def create_refund_transaction_or_add_sig_call(
+        substrate: SubstrateInterface,
+        tx_hash: str,
+        target: str,
+        amount: int,
+        signature: str,
+        stellar_address: str,
+        sequence_number: int,
+    ):
+        """compose a create refund transaction or add signature call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            tx_hash (str): transaction hash
+            target (str): target address for refund
+            amount (int): refund amount
+            signature (str): signature
+            stellar_address (str): stellar address
+            sequence_number (int): sequence number
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
             "TFTBridgeModule",
             "create_refund_transaction_or_add_sig",
             {
@@ -68,12 +139,6 @@ class RefundTransaction:
             },
         )
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
-
-        if not call_response.is_success:
-            raise RefundTransactionCreationOrAddingSigException(call_response.error_message)
-
     @staticmethod
     def set_refund_transaction_executed(substrate: SubstrateInterface, identity: Identity, tx_hash: str):
         """set refund transaction executed
@@ -92,8 +157,7 @@ class RefundTransaction:
             {"tx_hash": tx_hash},
         )
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise SetRefundTransactionExecutedException(call_response.error_message)
@@ -109,11 +173,7 @@ class RefundTransaction:
         Raises:
             ValueError: getting failed
         """
-        byte_hash = str.encode(tx_hash)
-        if len(byte_hash) <= 32:
-            byte_hash_32 = byte_hash + bytearray(32 - len(byte_hash))
-        else:
-            raise ValueError(f"hash length {len(byte_hash)} is not valid")
+        byte_hash_32 = pad_tx_hash(tx_hash)
 
         refunded_transaction = substrate.query("TFTBridgeModule", "ExecutedRefundTransactions", [byte_hash_32])
         if refunded_transaction["tx_hash"] == tx_hash:
@@ -131,11 +191,7 @@ class RefundTransaction:
         Raises:
             ValueError: getting failed
         """
-        byte_hash = str.encode(tx_hash)
-        if len(byte_hash) <= 32:
-            byte_hash_32 = byte_hash + bytearray(32 - len(byte_hash))
-        else:
-            raise ValueError(f"hash length {len(byte_hash)} is not valid")
+        byte_hash_32 = pad_tx_hash(tx_hash)
 
         refunded_transaction = substrate.query("TFTBridgeModule", "RefundTransactions", [byte_hash_32])
 
@@ -183,18 +239,32 @@ class MintTransaction:
         Raises:
             ProposeOrVoteMintTransactionException: Creation failed
         """
-        call = substrate.compose_call(
-            "TFTBridgeModule",
-            "propose_or_vote_mint_transaction",
-            {"transaction": tx_id, "target": target, "amount": amount},
-        )
+        call = MintTransaction.propose_or_vote_mint_transaction_call(substrate, tx_id, target, amount)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise ProposeOrVoteMintTransactionException(call_response.error_message)
 
+    @staticmethod
+    def propose_or_vote_mint_transaction_call(substrate: SubstrateInterface, tx_id: str, target: str, amount: int):
+        """compose a propose or vote mint transaction call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            tx_id (str): transaction ID
+            target (str): target address for mint
+            amount (int): mint amount
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "TFTBridgeModule",
+            "propose_or_vote_mint_transaction",
+            {"transaction": tx_id, "target": target, "amount": amount},
+        )
+
     @staticmethod
     def is_minted_already(substrate: SubstrateInterface, tx_id: str):
         """check if is minted
@@ -210,3 +280,239 @@ class MintTransaction:
         if refunded_transaction.value is not None:
             return True
         return False
+
+
+@dataclass
+class MintRequest:
+    "Mint request class, a stellar deposit to mint on chain"
+
+    tx_id: str
+    target: str
+    amount: int
+
+
+@dataclass
+class RefundRequest:
+    "Refund request class, a signed stellar refund of a deposit"
+
+    tx_hash: str
+    target: str
+    amount: int
+    signature: str
+    stellar_address: str
+    sequence_number: int
+
+
+@dataclass
+class BridgeBatchResult:
+    "Bridge batch result class"
+
+    # status of every transaction of the window before submitting
+    statuses: dict[str, str]
+    # result of the submitted calls by transaction, the executed transactions and the pending ones the validator
+    # already signed are not submitted, the call index is the position of the call among the submitted ones
+    call_results: dict[str, BatchCallResult] = field(default_factory=dict)
+
+
+class BridgeBatchProcessor:
+    """process windows of stellar transactions of a bridge validator
+
+        processor = BridgeBatchProcessor(pool, identity)
+        result = processor.process_mints([MintRequest(tx_id, target, amount) for tx_id, target, amount in deposits])
+
+    The executed and pending entries of all the transactions of a window are read in the same requests at a single
+    block, then a vote or signature of every transaction not executed yet is submitted in `force_batch` extrinsics,
+    so a call rejected by the chain does not revert the others.
+
+    A pending refund already signed with the stellar address of the request is skipped, like a pending mint whose
+    stored votes include the validator account. Runtimes storing the mint votes as a count do not record the voters,
+    their pending mints are submitted again, callers must filter the mints they already voted for.
+    """
+
+    def __init__(
+        self,
+        substrate: SubstrateInterface,
+        identity: Identity,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        mode: str = "force_batch",
+    ):
+        if max_batch_size <= 0:
+            raise ValueError(f"max batch size {max_batch_size} is not valid")
+        if chunk_size <= 0:
+            raise ValueError(f"chunk size {chunk_size} is not valid")
+
+        self.substrate = substrate
+        self.identity = identity
+        self.max_batch_size = max_batch_size
+        self.chunk_size = chunk_size
+        self.mode = mode
+
+    def mint_statuses(self, tx_ids: list[str], block_hash: str = None):
+        """get the status of mint transactions
+
+        Args:
+            tx_ids (list[str]): transaction IDs
+            block_hash (str, optional): block hash to query at, the chain head is used if not set
+
+        Returns:
+            dict[str, str]: status by transaction ID
+        """
+        tx_ids = list(dict.fromkeys(tx_ids))
+        statuses, _ = self._read("ExecutedMintTransactions", "MintTransactions", tx_ids, tx_ids, block_hash)
+        return statuses
+
+    def refund_statuses(self, tx_hashes: list[str], block_hash: str = None):
+        """get the status of refund transactions
+
+        Args:
+            tx_hashes (list[str]): transaction hashes
+            block_hash (str, optional): block hash to query at, the chain head is used if not set
+
+        Raises:
+            ValueError: a hash is longer than 32 bytes
+
+        Returns:
+            dict[str, str]: status by transaction hash
+        """
+        tx_hashes = list(dict.fromkeys(tx_hashes))
+        padded_hashes = [pad_tx_hash(tx_hash) for tx_hash in tx_hashes]
+        statuses, _ = self._read(
+            "ExecutedRefundTransactions", "RefundTransactions", tx_hashes, padded_hashes, block_hash
+        )
+        return statuses
+
+    def process_mints(self, mints: list[MintRequest]):
+        """propose or vote the mint transactions not executed nor voted by the validator yet
+
+        Args:
+            mints (list[MintRequest]): mint requests
+
+        Returns:
+            BridgeBatchResult: statuses and call results by transaction ID
+        """
+        tx_ids = list(dict.fromkeys(mint.tx_id for mint in mints))
+        statuses, pending = self._read("ExecutedMintTransactions", "MintTransactions", tx_ids, tx_ids, None)
+        calls = {
+            mint.tx_id: MintTransaction.propose_or_vote_mint_transaction_call(
+                self.substrate, mint.tx_id, mint.target, mint.amount
+            )
+            for mint in mints
+            if statuses[mint.tx_id] != BRIDGE_TX_EXECUTED and not self._voted(pending.get(mint.tx_id))
+        }
+        return BridgeBatchResult(statuses, self._submit(calls))
+
+    def process_refunds(self, refunds: list[RefundRequest]):
+        """create or sign the refund transactions not executed nor signed with the request stellar address yet
+
+        Args:
+            refunds (list[RefundRequest]): refund requests
+
+        Raises:
+            ValueError: a hash is longer than 32 bytes
+
+        Returns:
+            BridgeBatchResult: statuses and call results by transaction hash
+        """
+        tx_hashes = list(dict.fromkeys(refund.tx_hash for refund in refunds))
+        padded_hashes = [pad_tx_hash(tx_hash) for tx_hash in tx_hashes]
+        statuses, pending = self._read(
+            "ExecutedRefundTransactions", "RefundTransactions", tx_hashes, padded_hashes, None
+        )
+        calls = {
+            refund.tx_hash: RefundTransaction.create_refund_transaction_or_add_sig_call(
+                self.substrate,
+                refund.tx_hash,
+                refund.target,
+                refund.amount,
+                refund.signature,
+                refund.stellar_address,
+                refund.sequence_number,
+            )
+            for refund in refunds
+            if statuses[refund.tx_hash] != BRIDGE_TX_EXECUTED
+            and not _signed(pending.get(refund.tx_hash), refund.stellar_address)
+        }
+        return BridgeBatchResult(statuses, self._submit(calls))
+
+    def _read(self, executed_function: str, pending_function: str, tx_ids: list[str], params: list, block_hash: str):
+        """read the executed and pending entries of transactions together
+
+        Only the presence of the executed entries is checked, the pending entries are decoded.
+        Returns the statuses and the values of the pending entries by transaction.
+        """
+        if len(tx_ids) == 0:
+            return {}, {}
+
+        with connection(self.substrate) as substrate:
+            if block_hash is None:
+                block_hash = substrate.get_chain_head()
+
+            keys = []
+            storage_items = []
+            for storage_function in (executed_function, pending_function):
+                metadata_module, storage_item = get_storage_function(
+                    substrate, "TFTBridgeModule", storage_function, block_hash
+                )
+                keys.append(
+                    [storage_key_from_metadata(substrate, metadata_module, storage_item, [param]) for param in params]
+                )
+                storage_items.append(storage_item)
+            executed_keys, pending_keys = keys
+            _, pending_item = storage_items
+
+            changes = {}
+            window = executed_keys + pending_keys
+            for start in range(0, len(window), self.chunk_size):
+                changes.update(query_storage_at(substrate, window[start : start + self.chunk_size], block_hash))
+
+            statuses = {}
+            pending = {}
+            for tx_id, executed_key, pending_key in zip(tx_ids, executed_keys, pending_keys):
+                if changes.get(executed_key) is not None:
+                    statuses[tx_id] = BRIDGE_TX_EXECUTED
+                elif changes.get(pending_key) is not None:
+                    statuses[tx_id] = BRIDGE_TX_PENDING
+                    pending[tx_id] = decode_storage_value(substrate, pending_item, changes[pending_key]).value
+                else:
+                    statuses[tx_id] = BRIDGE_TX_NEW
+        return statuses, pending
+
+    def _voted(self, mint_transaction: dict):
+        """check if the stored votes of a pending mint include the validator, votes stored as a count are unknown"""
+        if mint_transaction is None or not isinstance(mint_transaction.get("votes"), list):
+            return False
+        public_key = self.identity.public_key.hex()
+        return any(ss58_decode(voter).removeprefix("0x") == public_key for voter in mint_transaction["votes"])
+
+    def _submit(self, calls: dict[str, object]):
+        """submit calls by transaction in batches of at most max_batch_size calls"""
+        tx_ids = list(calls)
+        call_results = {}
+        for start in range(0, len(tx_ids), self.max_batch_size):
+            window = tx_ids[start : start + self.max_batch_size]
+            results = Batch.submit(self.substrate, self.identity, [calls[tx_id] for tx_id in window], self.mode)
+            for result in results:
+                # the index is relative to the batch, not to the submitted calls
+                result.index += start
+            call_results.update(zip(window, results))
+        return call_results
+
+
+def _signed(refund_transaction: dict, stellar_address: str):
+    """check if a pending refund is signed with a stellar address"""
+    if refund_transaction is None:
+        return False
+    return any(
+        _as_bytes(signature["stellar_pub_key"]) == _as_bytes(stellar_address)
+        for signature in refund_transaction["signatures"]
+    )
+
+
+def _as_bytes(value):
+    """get the bytes of a stored or given byte string, stored values may be decoded as hex"""
+    if isinstance(value, bytes):
+        return value
+    if value.startswith("0x"):
+        return bytes.fromhex(value[2:])
+    return value.encode()
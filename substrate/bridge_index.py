@@ -0,0 +1,258 @@
+"""bridge index module"""
+
+import json
+import logging
+import os
+import threading
+
+from substrateinterface import SubstrateInterface
+
+from substrate.event_records import EventRecords
+from substrate.events import Event
+from substrate.pool import connection
+from substrate.storage import decode_map_key, get_storage_function, iter_map_pages
+from substrate.subscription import EventSubscription
+
+BRIDGE_INDEX_VERSION = 1
+
+# number of executed transactions read per request
+DEFAULT_PAGE_SIZE = 500
+
+# events of the executed mint and refund transactions
+BRIDGE_INDEX_EVENTS = [
+    ("TFTBridgeModule", "MintCompleted"),
+    ("TFTBridgeModule", "RefundTransactionProcessed"),
+]
+
+
+class BridgeIndex:
+    """in memory index of the executed mint transaction IDs and refund transaction hashes
+
+        index = BridgeIndex(pool)
+        index.bootstrap()
+        with index.follow():
+            if not index.is_minted(tx_id):
+                MintTransaction.propose_or_vote_mint_transaction(pool, identity, tx_id, target, amount)
+
+    The executed transactions are read once at a finalized block, then added from the MintCompleted and
+    RefundTransactionProcessed events of the next blocks. Lookups never query the chain, a transaction executed
+    in a block not applied yet is not indexed, submitting it again is rejected by the chain.
+
+    Older runtimes emit MintCompleted without the transaction ID. For a block with such an event, the executed
+    mint transaction IDs are read again from the chain at that block, which costs a read of the whole map.
+
+    An index saved with `save` is restarted from the file, only the blocks since it was saved are read:
+
+        index = BridgeIndex.load(pool, path)
+        index.sync()
+    """
+
+    def __init__(self, substrate: SubstrateInterface):
+        self.substrate = substrate
+        self.block_number: int = None
+        self.block_hash: str = None
+
+        self.minted: set[str] = set()
+        self.refunded: set[str] = set()
+
+        # serializes the updates from sync and follow
+        self._lock = threading.Lock()
+
+    def bootstrap(self, page_size: int = DEFAULT_PAGE_SIZE):
+        """read all the executed mint and refund transactions at the finalized head
+
+        Args:
+            page_size (int, optional): number of entries per request
+        """
+        with connection(self.substrate) as conn:
+            block_hash = conn.get_chain_finalised_head()
+            block_number = conn.get_block_number(block_hash)
+            minted = self._read_minted(conn, block_hash, page_size)
+
+            refunded = set()
+            for page in iter_map_pages(
+                conn, "TFTBridgeModule", "ExecutedRefundTransactions", page_size=page_size, block_hash=block_hash
+            ):
+                for _, refund_transaction in page:
+                    refunded.add(refund_transaction.value["tx_hash"])
+
+        with self._lock:
+            self.minted = minted
+            self.refunded = refunded
+            self.block_number = block_number
+            self.block_hash = block_hash
+
+    def is_minted(self, tx_id: str):
+        """check if a mint transaction is executed, without querying the chain
+
+        Args:
+            tx_id (str): mint transaction ID
+
+        Returns:
+            bool: True if the transaction is executed at the indexed block
+        """
+        return tx_id in self.minted
+
+    def is_refunded(self, tx_hash: str):
+        """check if a refund transaction is executed, without querying the chain
+
+        Args:
+            tx_hash (str): refund transaction hash
+
+        Returns:
+            bool: True if the transaction is executed at the indexed block
+        """
+        return tx_hash in self.refunded
+
+    def apply(self, block_number: int, block_hash: str, records: EventRecords):
+        """add the transactions executed in a block, blocks up to the indexed one are ignored
+
+        Args:
+            block_number (int): block number
+            block_hash (str): block hash
+            records (EventRecords): event records of the block
+        """
+        with self._lock:
+            if self.block_number is None:
+                raise ValueError("bridge index is not bootstrapped")
+            if block_number <= self.block_number:
+                return
+
+        # read outside the lock, the events of older runtimes do not carry the mint transaction ID
+        minted = set()
+        if any(event.tx_id is None for event in records.TFTBridgeModule_MintCompleted):
+            logging.warning(
+                "mint completed without transaction ID in block %s, reading the executed mints", block_number
+            )
+            with connection(self.substrate) as conn:
+                minted = self._read_minted(conn, block_hash, DEFAULT_PAGE_SIZE)
+
+        with self._lock:
+            if block_number <= self.block_number:
+                return
+
+            self.minted.update(minted)
+            for event in records.TFTBridgeModule_MintCompleted:
+                if event.tx_id is not None:
+                    self.minted.add(event.tx_id)
+            for event in records.TFTBridgeModule_RefundTransactionProcessed:
+                self.refunded.add(event.tx_hash)
+
+            self.block_number = block_number
+            self.block_hash = block_hash
+
+    def sync(self, workers: int = 8):
+        """add the transactions executed in the blocks up to the finalized head
+
+        Args:
+            workers (int, optional): number of concurrent fetchers, with a connection pool
+        """
+        if self.block_number is None:
+            raise ValueError("bridge index is not bootstrapped")
+
+        with connection(self.substrate) as conn:
+            head_hash = conn.get_chain_finalised_head()
+            head_number = conn.get_block_number(head_hash)
+
+        if head_number <= self.block_number:
+            return
+
+        for block_number, block_hash, records in Event.scan(
+            self.substrate, self.block_number + 1, head_number, BRIDGE_INDEX_EVENTS, workers
+        ):
+            self.apply(block_number, block_hash, records)
+
+        with self._lock:
+            if head_number > self.block_number:
+                self.block_number = head_number
+                self.block_hash = head_hash
+
+    def follow(self):
+        """add the transactions executed in every new finalized block, from the block after the indexed one
+
+        Returns:
+            EventSubscription: started subscription, close it to stop following
+        """
+        if self.block_number is None:
+            raise ValueError("bridge index is not bootstrapped")
+
+        subscription = EventSubscription(self.substrate, BRIDGE_INDEX_EVENTS, start_block=self.block_number + 1)
+        subscription.add_callback(self.apply)
+        subscription.start()
+        return subscription
+
+    def save(self, path: str):
+        """write the indexed transactions and block to a file, replaced atomically
+
+        Args:
+            path (str): index file path
+        """
+        if self.block_number is None:
+            raise ValueError("bridge index is not bootstrapped")
+
+        with connection(self.substrate) as conn:
+            genesis_hash = conn.get_block_hash(0)
+
+        with self._lock:
+            data = {
+                "version": BRIDGE_INDEX_VERSION,
+                "genesis_hash": genesis_hash,
+                "block_number": self.block_number,
+                "block_hash": self.block_hash,
+                "minted": sorted(self.minted),
+                "refunded": sorted(self.refunded),
+            }
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(substrate: SubstrateInterface, path: str):
+        """restart an index from a file written by `save`
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            path (str): index file path
+
+        Raises:
+            ValueError: index file is not valid or is from another chain
+
+        Returns:
+            BridgeIndex: index at the block of the file, to catch up with `sync` or `follow`
+        """
+        with open(path, encoding="utf-8") as file:
+            try:
+                data = json.load(file)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path} is not a bridge index") from exc
+        if not isinstance(data, dict) or data.get("version") != BRIDGE_INDEX_VERSION:
+            raise ValueError(f"{path} is not a bridge index of version {BRIDGE_INDEX_VERSION}")
+
+        with connection(substrate) as conn:
+            genesis_hash = conn.get_block_hash(0)
+        if data["genesis_hash"] != genesis_hash:
+            raise ValueError(f"bridge index {path} is from chain {data['genesis_hash']}, not {genesis_hash}")
+
+        index = BridgeIndex(substrate)
+        index.minted = set(data["minted"])
+        index.refunded = set(data["refunded"])
+        index.block_number = data["block_number"]
+        index.block_hash = data["block_hash"]
+        return index
+
+    def _read_minted(self, conn: SubstrateInterface, block_hash: str, page_size: int):
+        """read the executed mint transaction IDs at a block"""
+        _, mints_item = get_storage_function(conn, "TFTBridgeModule", "ExecutedMintTransactions", block_hash)
+
+        # the mint transaction IDs are only kept in the storage keys
+        minted = set()
+        for page in iter_map_pages(
+            conn, "TFTBridgeModule", "ExecutedMintTransactions", page_size=page_size, block_hash=block_hash
+        ):
+            for key, _ in page:
+                minted.add(decode_map_key(conn, mints_item, key).value)
+        return minted
@@ -0,0 +1,284 @@
+"""storage cache module"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from substrateinterface import SubstrateInterface
+from substrateinterface.exceptions import SubstrateRequestException
+
+from substrate.metadata import open_connection
+from substrate.pool import CONNECTION_ERRORS, connection
+from substrate.storage import (
+    DEFAULT_CHUNK_SIZE,
+    decode_storage_value,
+    get_storage_function,
+    query_storage_at,
+    storage_key_from_metadata,
+)
+
+# storage maps read over and over by the getters of Twin, Farm, Node and Contract
+DEFAULT_CACHED_STORAGE = {
+    ("TfgridModule", "Twins"),
+    ("TfgridModule", "Farms"),
+    ("TfgridModule", "Nodes"),
+    ("SmartContractModule", "Contracts"),
+}
+
+
+class StorageCache:
+    """read-through cache of storage entries pinned to the last finalized block
+
+    The cache can be passed wherever a SubstrateInterface is expected, `query` calls for the cached
+    storage functions are served from memory, everything else goes to the wrapped substrate instance:
+
+        cache = StorageCache(pool)
+        cache.watch()
+        farm = Farm.get(cache, farm_id)
+
+    Entries are keyed by storage key and evicted least recently used first once the size of the cached
+    keys and SCALE values exceeds max_bytes. On every new finalized head, from `watch` or `advance`, the cache
+    is cleared, or with selective invalidation only the entries whose value changed in that block are dropped.
+    """
+
+    def __init__(
+        self,
+        substrate: SubstrateInterface,
+        max_bytes: int = 16 * 1024 * 1024,
+        storage_functions: set[tuple[str, str]] = None,
+        selective: bool = True,
+    ):
+        if max_bytes <= 0:
+            raise ValueError(f"max bytes {max_bytes} is not valid")
+
+        self.substrate = substrate
+        self.max_bytes = max_bytes
+        self.storage_functions = set(storage_functions or DEFAULT_CACHED_STORAGE)
+        self.selective = selective
+        self.hits = 0
+        self.misses = 0
+
+        # guards the entries and the pinned block hash
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[str, tuple[str, object, int]] = OrderedDict()
+        self._bytes = 0
+        self._block_hash: str = None
+        self._metadata: dict[tuple[int, str, str], tuple] = {}
+
+        self._stopped = threading.Event()
+        self._head_connection: SubstrateInterface = None
+        self._watcher: threading.Thread = None
+
+    @property
+    def block_hash(self):
+        """str: hash of the block the cached entries are read at"""
+        return self._block_hash
+
+    def query(self, module: str, storage_function: str, params: list = None, block_hash: str = None, **kwargs):
+        """query a storage entry, from the cache if it is a cached storage function
+
+        Args:
+            module (str): storage module name
+            storage_function (str): storage function name
+            params (list, optional): storage function params
+            block_hash (str, optional): block hash to query at, only entries of the pinned block are cached
+
+        Returns:
+            ScaleType: decoded entry
+        """
+        if (module, storage_function) not in self.storage_functions or len(kwargs) > 0:
+            return self.substrate.query(module, storage_function, params, block_hash=block_hash, **kwargs)
+        if block_hash is not None and block_hash != self._block_hash:
+            return self.substrate.query(module, storage_function, params, block_hash=block_hash)
+
+        with connection(self.substrate) as conn:
+            metadata_module, storage_item = self._storage_function(conn, module, storage_function)
+            key = storage_key_from_metadata(conn, metadata_module, storage_item, list(params or []))
+
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+
+                if self._block_hash is None:
+                    self._block_hash = conn.get_chain_finalised_head()
+                pinned_hash = self._block_hash
+
+            response = conn.rpc_request("state_getStorage", [key, pinned_hash])
+            if "error" in response:
+                raise SubstrateRequestException(response["error"]["message"])
+
+            data = response["result"]
+            value = decode_storage_value(conn, storage_item, data, missing_as_option=True)
+
+        with self._lock:
+            # the cache moved to another block while reading
+            if pinned_hash == self._block_hash:
+                self._put(key, data, value)
+
+        return value
+
+    def invalidate(self, module: str, storage_function: str, params: list = None):
+        """drop a cached entry, or all the entries of a storage map if params are not set
+
+        Args:
+            module (str): storage module name
+            storage_function (str): storage function name
+            params (list, optional): storage function params, a prefix of the map keys is allowed
+        """
+        with connection(self.substrate) as conn:
+            metadata_module, storage_item = self._storage_function(conn, module, storage_function)
+            prefix = storage_key_from_metadata(conn, metadata_module, storage_item, list(params or []))
+
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._drop(key)
+
+    def clear(self):
+        """drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def advance(self, block_hash: str):
+        """move the cache to a new finalized block
+
+        Args:
+            block_hash (str): finalized block hash
+        """
+        with self._lock:
+            if block_hash == self._block_hash:
+                return
+
+            previous_hash = self._block_hash
+            if not self.selective or previous_hash is None:
+                self.clear()
+                self._block_hash = block_hash
+                return
+
+            keys = list(self._entries)
+
+        # read without holding the lock, the cache keeps serving the previous block meanwhile
+        values = {}
+        with connection(self.substrate) as conn:
+            for start in range(0, len(keys), DEFAULT_CHUNK_SIZE):
+                values.update(query_storage_at(conn, keys[start : start + DEFAULT_CHUNK_SIZE], block_hash))
+
+        with self._lock:
+            if self._block_hash != previous_hash:
+                # reset or advanced by another thread while reading
+                return
+
+            checked = set(keys)
+            for key in list(self._entries):
+                # entries added while reading were not checked
+                if key not in checked or values.get(key) != self._entries[key][0]:
+                    self._drop(key)
+
+            self._block_hash = block_hash
+
+    def watch(self):
+        """advance the cache on every new finalized head, received in a thread on a dedicated connection"""
+        if self._watcher is not None:
+            return
+
+        self._head_connection = open_connection(self.substrate.url)
+        self._watcher = threading.Thread(target=self._watch, name="storage-cache", daemon=True)
+        self._watcher.start()
+
+    def close(self):
+        """stop watching the finalized heads"""
+        self._stopped.set()
+        if self._head_connection is not None:
+            try:
+                # interrupts the subscription waiting for the next head
+                self._head_connection.close()
+            except CONNECTION_ERRORS:
+                pass
+        if self._watcher is not None:
+            self._watcher.join()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.substrate, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _watch(self):
+        """receive the finalized heads until the cache is closed"""
+
+        def on_head(message: dict, update_nr: int, subscription_id: str):
+            if self._stopped.is_set():
+                return True
+
+            head_number = int(message["params"]["result"]["number"], 16)
+            try:
+                self.advance(self.substrate.get_block_hash(head_number))
+            except (SubstrateRequestException, *CONNECTION_ERRORS):
+                logging.exception("failed to advance the storage cache")
+                self._reset()
+            return None
+
+        while not self._stopped.is_set():
+            try:
+                self._head_connection.rpc_request("chain_subscribeFinalizedHeads", [], on_head)
+            except CONNECTION_ERRORS:
+                if self._stopped.is_set():
+                    return
+                logging.exception("storage cache lost the finalized heads subscription, reconnecting")
+
+            # the heads received while disconnected are missed, the entries can not be checked anymore
+            self._reset()
+            self._stopped.wait(1)
+            try:
+                self._head_connection.connect_websocket()
+            except CONNECTION_ERRORS:
+                logging.exception("failed to reconnect the storage cache")
+
+    def _reset(self):
+        """drop all cached entries, the next read is pinned to the current finalized head"""
+        with self._lock:
+            self.clear()
+            self._block_hash = None
+
+    def _storage_function(self, substrate: SubstrateInterface, module: str, storage_function: str):
+        """get the metadata of a storage function, resolved once per runtime
+
+        The keys are encoded and the values decoded on the given connection, its runtime is initialized first.
+        """
+        if substrate.metadata is None:
+            substrate.init_runtime()
+
+        cache_key = (substrate.runtime_version, module, storage_function)
+        metadata = self._metadata.get(cache_key)
+        if metadata is None:
+            metadata = get_storage_function(substrate, module, storage_function, substrate.block_hash)
+            self._metadata[cache_key] = metadata
+        return metadata
+
+    def _put(self, key: str, data: str, value):
+        """add an entry and evict the least recently used ones over the byte budget"""
+        if key in self._entries:
+            self._drop(key)
+
+        size = len(key) // 2 + len(data or "") // 2
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (data, value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        """remove an entry"""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -1,7 +1,9 @@
 """Contract module"""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from substrateinterface import SubstrateInterface
+from typing import TYPE_CHECKING
 from substrate.exceptions import (
     ContractCancelException,
     NameContractCreationException,
@@ -13,7 +15,33 @@ from substrate.exceptions import (
 from substrate.farm import PublicIP
 
 from substrate.node import NodeFeatures, Resources
+from .batch import Batch
+from .event_records import EventRecords
 from .identity import Identity
+from .nonce import NonceManager
+from .resolver import IdResolver
+
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
+
+def pad_hash(hash: str):
+    """pad a deployment hash to 32 bytes
+
+    Args:
+        hash (str): deployment hash
+
+    Raises:
+        ValueError: hash is longer than 32 bytes
+
+    Returns:
+        bytes: 32 bytes hash
+    """
+    byte_hash = str.encode(hash)
+    if len(byte_hash) > 32:
+        raise ValueError(f"hash length {len(byte_hash)} is not valid")
+
+    return byte_hash + bytearray(32 - len(byte_hash))
 
 
 @dataclass
@@ -126,36 +154,59 @@ class Contract:
             int: contract ID
         """
 
-        byte_hash = str.encode(hash)
-        if len(byte_hash) <= 32:
-            byte_hash_32 = byte_hash + bytearray(32 - len(byte_hash))
-        else:
-            raise ValueError(f"hash length {len(byte_hash)} is not valid")
+        byte_hash_32 = pad_hash(hash)
 
         contract_id = Contract.get_contract_id_with_hash_and_node_id(substrate, node_id, byte_hash_32)
         if contract_id != 0:
             return contract_id
 
-        call = substrate.compose_call(
+        call = Contract.create_node_contract_call(substrate, node_id, data, hash, public_ips, solution_provider_id)
+
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
+
+        if not call_response.is_success:
+            raise NodeContractCreationException(call_response.error_message)
+
+        contracts_created = EventRecords.decode(call_response.triggered_events).SmartContractModule_ContractCreated
+        if len(contracts_created) == 0:
+            raise NodeContractCreationException("failed to get contract id after creation")
+
+        return contracts_created[-1].contract.contract_id
+
+    @staticmethod
+    def create_node_contract_call(
+        substrate: SubstrateInterface,
+        node_id: int,
+        data: str,
+        hash: str,
+        public_ips: int,
+        solution_provider_id: int = None,
+    ):
+        """compose a create node contract call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            node_id (int): node ID for the contract
+            data (str): contract deployment data
+            hash (str): contract deployment hash
+            public_ips (int): number of public ips
+            solution_provider_id (int, optional): solution provider id
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
             "SmartContractModule",
             "create_node_contract",
             {
                 "node_id": node_id,
                 "deployment_data": data,
-                "deployment_hash": byte_hash_32,
+                "deployment_hash": pad_hash(hash),
                 "public_ips": public_ips,
                 "solution_provider_id": solution_provider_id,
             },
         )
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
-
-        if not call_response.is_success:
-            raise NodeContractCreationException(call_response.error_message)
-
-        return Contract.get_contract_id_with_hash_and_node_id(substrate, node_id, byte_hash_32)
-
     @staticmethod
     def update_node_contract(substrate: SubstrateInterface, identity: Identity, contract_id: int, data: str, hash: str):
         """update a node contract
@@ -168,24 +219,32 @@ class Contract:
             hash (bytes): deployment hash for contract
         """
 
-        byte_hash = str.encode(hash)
-        if len(byte_hash) <= 32:
-            byte_hash_32 = byte_hash + bytearray(32 - len(byte_hash))
-        else:
-            raise ValueError(f"hash length {len(byte_hash)} is not valid")
+        call = Contract.update_node_contract_call(substrate, contract_id, data, hash)
 
-        call = substrate.compose_call(
-            "SmartContractModule",
-            "update_node_contract",
-            {"contract_id": contract_id, "deployment_data": data, "deployment_hash": byte_hash_32},
-        )
-
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise NodeContractUpdateException(call_response.error_message)
 
+    @staticmethod
+    def update_node_contract_call(substrate: SubstrateInterface, contract_id: int, data: str, hash: str):
+        """compose an update node contract call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            contract_id (int): contract ID
+            data (str): deployment data for contract
+            hash (str): deployment hash for contract
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "SmartContractModule",
+            "update_node_contract",
+            {"contract_id": contract_id, "deployment_data": data, "deployment_hash": pad_hash(hash)},
+        )
+
     @staticmethod
     def get_node_contracts(substrate: SubstrateInterface, node_id: int):
         """get contracts' IDs using node id
@@ -242,19 +301,33 @@ class Contract:
         if contract_id != 0:
             return contract_id
 
-        call = substrate.compose_call(
-            "SmartContractModule",
-            "create_name_contract",
-            {"name": name},
-        )
+        call = Contract.create_name_contract_call(substrate, name)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise NameContractCreationException(call_response.error_message)
 
-        return Contract.get_contract_id_by_name_registration(substrate, name)
+        contracts_created = EventRecords.decode(call_response.triggered_events).SmartContractModule_ContractCreated
+        if len(contracts_created) == 0:
+            raise NameContractCreationException("failed to get contract id after creation")
+
+        contract_id = contracts_created[-1].contract.contract_id
+        IdResolver.set("ContractIDByNameRegistration", name, contract_id)
+        return contract_id
+
+    @staticmethod
+    def create_name_contract_call(substrate: SubstrateInterface, name: str):
+        """compose a create name contract call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            name (str): name for the contract
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call("SmartContractModule", "create_name_contract", {"name": name})
 
     @staticmethod
     def get_contract_id_by_name_registration(substrate: SubstrateInterface, name: str):
@@ -268,7 +341,7 @@ class Contract:
             int: contract ID
         """
 
-        return substrate.query("SmartContractModule", "ContractIDByNameRegistration", [name])
+        return IdResolver.resolve(substrate, "ContractIDByNameRegistration", name)
 
     @staticmethod
     def create_rent_contract(
@@ -289,19 +362,36 @@ class Contract:
             int: contract ID
         """
 
-        call = substrate.compose_call(
-            "SmartContractModule",
-            "create_rent_contract",
-            {"node_id": node_id, "solution_provider_id": solution_provider_id},
-        )
+        call = Contract.create_rent_contract_call(substrate, node_id, solution_provider_id)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise RentContractCreationException(call_response.error_message)
 
-        return Contract.get_node_rent_contract_id(substrate, node_id)
+        contracts_created = EventRecords.decode(call_response.triggered_events).SmartContractModule_ContractCreated
+        if len(contracts_created) == 0:
+            raise RentContractCreationException("failed to get contract id after creation")
+
+        return contracts_created[-1].contract.contract_id
+
+    @staticmethod
+    def create_rent_contract_call(substrate: SubstrateInterface, node_id: int, solution_provider_id: int = None):
+        """compose a create rent contract call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            node_id (int): node ID for the contract
+            solution_provider_id (int, optional): solution provider id
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "SmartContractModule",
+            "create_rent_contract",
+            {"node_id": node_id, "solution_provider_id": solution_provider_id},
+        )
 
     def get_node_rent_contract_id(substrate: SubstrateInterface, node_id: int):
         """get contract ID from name
@@ -341,18 +431,31 @@ class Contract:
         Returns:
             _type_: _description_
         """
-        call = substrate.compose_call(
-            "SmartContractModule",
-            "report_contract_resources",
-            {"contract_id": contract_id, "resources": resources.__dict__},
-        )
+        call = Contract.set_contract_consumption_call(substrate, contract_id, resources)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise ContractConsumptionException(call_response.error_message)
 
+    @staticmethod
+    def set_contract_consumption_call(substrate: SubstrateInterface, contract_id: int, resources: Resources):
+        """compose a set contract consumption call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            contract_id (int): contract ID
+            resources (Resources): consumption resources
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "SmartContractModule",
+            "report_contract_resources",
+            {"contract_id": contract_id, "resources": resources.__dict__},
+        )
+
     @staticmethod
     def cancel(substrate: SubstrateInterface, identity: Identity, contract_id: int):
         """cancel a deployment
@@ -363,14 +466,61 @@ class Contract:
             contract_id (int): contract ID
         """
 
-        call = substrate.compose_call("SmartContractModule", "cancel_contract", {"contract_id": contract_id})
+        call = Contract.cancel_call(substrate, contract_id)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise ContractCancelException(call_response.error_message)
 
+        IdResolver.invalidate("ContractIDByNameRegistration", value=contract_id)
+
+    @staticmethod
+    def cancel_call(substrate: SubstrateInterface, contract_id: int):
+        """compose a cancel contract call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            contract_id (int): contract ID
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call("SmartContractModule", "cancel_contract", {"contract_id": contract_id})
+
+    @staticmethod
+    def cancel_batch(
+        substrate: SubstrateInterface, identity: Identity, contract_ids: list[int], mode: str = "force_batch"
+    ):
+        """cancel many contracts in a single batch extrinsic
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            identity (Identity): contracts' owner identity
+            contract_ids (list[int]): contract IDs
+            mode (str, optional): Utility batch function, with batch_all no contract is canceled if one fails
+
+        Raises:
+            ContractCancelException: canceling the contracts failed with batch_all
+
+        Returns:
+            list[BatchCallResult]: result and events of every cancellation in the order of contract_ids,
+                check is_success of every result with force_batch and batch
+        """
+        calls = [Contract.cancel_call(substrate, contract_id) for contract_id in contract_ids]
+        call_results = Batch.submit(substrate, identity, calls, mode)
+
+        for res in call_results:
+            if res.is_success:
+                IdResolver.invalidate("ContractIDByNameRegistration", value=contract_ids[res.index])
+
+        if mode == "batch_all":
+            failed = {contract_ids[res.index]: res.error_message for res in call_results if not res.is_success}
+            if len(failed) > 0:
+                raise ContractCancelException(f"failed to cancel contracts: {failed}")
+
+        return call_results
+
     @staticmethod
     def get(substrate: SubstrateInterface, contract_id: int):
         """get a contract
@@ -384,61 +534,88 @@ class Contract:
         if contract.value is None:
             raise ValueError(f"contract with id {contract_id} is not found")
 
+        return Contract.decode(contract)
+
+    @staticmethod
+    def decode(contract):
+        """decode a contract storage entry
+
+        Args:
+            contract (ScaleType): contract storage entry
+
+        Returns:
+            Contract: contract object
+        """
+        return Contract.from_value(contract.value)
+
+    @staticmethod
+    def from_value(contract: dict):
+        """build a contract from the plain value of a contract storage entry, without indexing the ScaleType
+
+        Args:
+            contract (dict): contract storage entry value
+
+        Returns:
+            Contract: contract object
+        """
+        state, state_value = _enum_variant(contract["state"])
+
         as_deleted_state = DeletedState(False, False)
-        if contract["state"] == "Deleted":
+        if state == "Deleted":
             as_deleted_state = DeletedState(
-                is_canceled_by_user=contract["state"]["is_canceled_by_user"].value,
-                is_out_of_funds=contract["state"]["is_out_of_funds"].value,
+                is_canceled_by_user=state_value == "CanceledByUser", is_out_of_funds=state_value == "OutOfFunds"
             )
 
-        grace_period_block_number = 0
-        if contract["state"] == "GracePeriod":
-            grace_period_block_number = contract["state"]["grace_period_block_number"].value
-
         contract_state = ContractState(
-            is_created=contract["state"] == "Created",
-            is_deleted=contract["state"] == "Deleted",
+            is_created=state == "Created",
+            is_deleted=state == "Deleted",
             as_deleted=as_deleted_state,
-            is_grace_period=contract["state"] == "GracePeriod",
-            as_grace_period_block_number=grace_period_block_number,
+            is_grace_period=state == "GracePeriod",
+            as_grace_period_block_number=state_value if state == "GracePeriod" else 0,
         )
 
-        node_contract = NodeContract(0, None, "", 0, [])
-        if "NodeContract" in contract["contract_type"]:
-            public_ips: list[PublicIP] = []
-            for public_ip in contract["contract_type"].value["NodeContract"]["public_ips_list"]:
-                public_ips.append(PublicIP(public_ip["ip"], public_ip["gw"], public_ip["contract_id"]))
+        contract_type, contract_type_value = _enum_variant(contract["contract_type"])
 
+        node_contract = NodeContract(0, None, "", 0, [])
+        if contract_type == "NodeContract":
             node_contract = NodeContract(
-                node_id=contract["contract_type"].value["NodeContract"]["node_id"],
-                deployment_hash=contract["contract_type"].value["NodeContract"]["deployment_hash"],
-                deployment_data=contract["contract_type"].value["NodeContract"]["deployment_data"],
-                public_ips_count=contract["contract_type"].value["NodeContract"]["public_ips"],
-                public_ips=public_ips,
+                node_id=contract_type_value["node_id"],
+                deployment_hash=contract_type_value["deployment_hash"],
+                deployment_data=contract_type_value["deployment_data"],
+                public_ips_count=contract_type_value["public_ips"],
+                public_ips=[
+                    PublicIP(public_ip["ip"], public_ip["gw"], public_ip["contract_id"])
+                    for public_ip in contract_type_value["public_ips_list"]
+                ],
             )
 
         name_contract = NameContract("")
-        if "NameContract" in contract["contract_type"]:
-            name_contract = NameContract(contract["contract_type"].value["NameContract"]["name"])
+        if contract_type == "NameContract":
+            name_contract = NameContract(contract_type_value["name"])
 
         rent_contract = RentContract(0)
-        if "RentContract" in contract["contract_type"]:
-            node_contract = RentContract(contract["contract_type"].value["RentContract"]["node_id"])
-
-        contract_type = ContractType(
-            is_name_contract="NameContract" in contract["contract_type"],
-            name_contract=name_contract,
-            is_node_contract="NodeContract" in contract["contract_type"],
-            node_contract=node_contract,
-            is_rent_contract="RentContract" in contract["contract_type"],
-            rent_contract=rent_contract,
-        )
+        if contract_type == "RentContract":
+            rent_contract = RentContract(contract_type_value["node_id"])
 
         return Contract(
-            version=contract["version"].value,
+            version=contract["version"],
             state=contract_state,
-            twin_id=contract["twin_id"].value,
-            contract_id=contract["contract_id"].value,
-            contract_type=contract_type,
-            solution_provider_id=contract["solution_provider_id"].value,
+            twin_id=contract["twin_id"],
+            contract_id=contract["contract_id"],
+            contract_type=ContractType(
+                is_name_contract=contract_type == "NameContract",
+                name_contract=name_contract,
+                is_node_contract=contract_type == "NodeContract",
+                node_contract=node_contract,
+                is_rent_contract=contract_type == "RentContract",
+                rent_contract=rent_contract,
+            ),
+            solution_provider_id=contract["solution_provider_id"],
         )
+
+
+def _enum_variant(value):
+    """get the variant name and data of a decoded enum, the data is None for a variant without data"""
+    if isinstance(value, dict):
+        return next(iter(value.items()))
+    return value, None
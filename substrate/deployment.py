@@ -1,19 +1,25 @@
 """Deployment module"""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from substrateinterface import SubstrateInterface
+from typing import TYPE_CHECKING
 
 
 from substrate.node import Resources
 from substrate.identity import Identity
+from substrate.nonce import NonceManager
 from substrate.farm import PublicIP
-from substrate.events import Event
+from substrate.events import CallResponse, Event
 from substrate.exceptions import (
     DeploymentCancelException,
     DeploymentCreationException,
     DeploymentUpdateException,
 )
 
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
 # TODO ?? power management??
 @dataclass
 class Deployment:
@@ -50,31 +56,56 @@ class Deployment:
             public_ips (int): if it has public ips 0/1
         """
 
-        call = substrate.compose_call(
-            "SmartContractModule",
-            "deployment_create",
-            {
-                "capacity_reservation_contract_id": capacity_reservation_contract_id,
-                "hash": hash,
-                "data": data,
-                "resources": resources,
-                "public_ips": public_ips,
-            },
-        )
+        call = Deployment.create_call(substrate, capacity_reservation_contract_id, hash, data, resources, public_ips)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise DeploymentCreationException(call_response.error_message)
 
-        deployment_ids = Event.get_created_deployments_ids(substrate, call_response)
+        deployment_ids = Event.get_created_deployments_ids(
+            substrate, CallResponse.from_receipt(call_response, identity)
+        )
 
         if len(deployment_ids) == 0:
             raise DeploymentCreationException("failed to get deployment id after creation")
 
         return deployment_ids[len(deployment_ids) - 1]
 
+    @staticmethod
+    def create_call(
+        substrate: SubstrateInterface,
+        capacity_reservation_contract_id: int,
+        hash: bytes,
+        data: str,
+        resources: Resources,
+        public_ips: int,
+    ):
+        """compose a create deployment call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            capacity_reservation_contract_id (int): capacity reservation ID for the contract
+            hash (bytes): deployment hash
+            data (str): deployment data
+            resources (Resources): deployment resources
+            public_ips (int): if it has public ips 0/1
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "SmartContractModule",
+            "deployment_create",
+            {
+                "capacity_reservation_contract_id": capacity_reservation_contract_id,
+                "hash": hash,
+                "data": data,
+                "resources": resources,
+                "public_ips": public_ips,
+            },
+        )
+
     @staticmethod
     def update(
         substrate: SubstrateInterface,
@@ -96,30 +127,45 @@ class Deployment:
             public_ips (int): if it has public ips 0/1
         """
 
-        call = substrate.compose_call(
-            "SmartContractModule",
-            "deployment_update",
-            {
-                "id": deployment_id,
-                "hash": hash,
-                "data": data,
-                "resources": resources,
-            },
-        )
+        call = Deployment.update_call(substrate, deployment_id, hash, data, resources)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise DeploymentUpdateException(call_response.error_message)
 
-        deployment_ids = Event.get_updated_deployments_ids(substrate, call_response)
+        deployment_ids = Event.get_updated_deployments(substrate, CallResponse.from_receipt(call_response, identity))
 
         if len(deployment_ids) == 0:
-            raise DeploymentUpdateException("failed to get deployment id after creation")
+            raise DeploymentUpdateException("failed to get deployment id after update")
 
         return deployment_ids[len(deployment_ids) - 1]
 
+    @staticmethod
+    def update_call(substrate: SubstrateInterface, deployment_id: int, hash: bytes, data: str, resources: Resources):
+        """compose an update deployment call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            deployment_id (int): deployment ID
+            hash (bytes): deployment hash
+            data (str): deployment data
+            resources (Resources): deployment resources
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "SmartContractModule",
+            "deployment_update",
+            {
+                "id": deployment_id,
+                "hash": hash,
+                "data": data,
+                "resources": resources,
+            },
+        )
+
     @staticmethod
     def cancel(substrate: SubstrateInterface, identity: Identity, deployment_id: int):
         """cancel a deployment
@@ -130,14 +176,26 @@ class Deployment:
             deployment_id (int): deployment ID
         """
 
-        call = substrate.compose_call("SmartContractModule", "deployment_cancel", {"id": deployment_id})
+        call = Deployment.cancel_call(substrate, deployment_id)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise DeploymentCancelException(call_response.error_message)
 
+    @staticmethod
+    def cancel_call(substrate: SubstrateInterface, deployment_id: int):
+        """compose a cancel deployment call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            deployment_id (int): deployment ID
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call("SmartContractModule", "deployment_cancel", {"id": deployment_id})
+
     @staticmethod
     def get(substrate: SubstrateInterface, deployment_id: int):
         """get a deployment
@@ -151,26 +209,52 @@ class Deployment:
         if deployment.value is None:
             raise ValueError(f"deployment with id {id} is not found")
 
+        return Deployment.decode(deployment_id, deployment)
+
+    @staticmethod
+    def decode(deployment_id: int, deployment):
+        """decode a deployment storage entry
+
+        Args:
+            deployment_id (int): deployment ID
+            deployment (ScaleType): deployment storage entry
+
+        Returns:
+            Deployment: deployment object
+        """
+        return Deployment.from_value(deployment_id, deployment.value)
+
+    @staticmethod
+    def from_value(deployment_id: int, deployment: dict):
+        """build a deployment from the plain value of a deployment storage entry or event
+
+        Args:
+            deployment_id (int): deployment ID
+            deployment (dict): deployment storage entry value
+
+        Returns:
+            Deployment: deployment object
+        """
         public_ips: list[PublicIP] = []
-        for public_ip in deployment["public_ips"].value:
+        for public_ip in deployment["public_ips"]:
             public_ips.append(
-                PublicIP(ip=public_ip["ip"], gateway=public_ip["gateway"], contract_id=public_ip["contract_id"])
+                PublicIP(ip=public_ip["ip"], gw=public_ip["gateway"], contract_id=public_ip["contract_id"])
             )
 
         resources = Resources(
-            hru=deployment["resources"]["hru"].value,
-            sru=deployment["resources"]["sru"].value,
-            cru=deployment["resources"]["cru"].value,
-            mru=deployment["resources"]["mru"].value,
+            hru=deployment["resources"]["hru"],
+            sru=deployment["resources"]["sru"],
+            cru=deployment["resources"]["cru"],
+            mru=deployment["resources"]["mru"],
         )
 
         return Deployment(
             id=deployment_id,
-            twin_id=deployment["twin_id"].value,
-            capacity_reservation_id=deployment["capacity_reservation_id"].value,
-            deployment_hash=deployment["deployment_hash"].value,
-            deployment_data=deployment["deployment_data"].value,
-            public_ips_count=deployment["public_ips_count"].value,
+            twin_id=deployment["twin_id"],
+            capacity_reservation_id=deployment["capacity_reservation_id"],
+            deployment_hash=deployment["deployment_hash"],
+            deployment_data=deployment["deployment_data"],
+            public_ips_count=deployment["public_ips_count"],
             public_ips=public_ips,
             resources=resources,
         )
@@ -1,9 +1,17 @@
 """events records module"""
 
-from dataclasses import dataclass
+from __future__ import annotations
 
-from substrate.contract import Contract
-from substrate.deployment import Deployment
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Callable, ClassVar
+
+if TYPE_CHECKING:
+    # the entity modules import this module, their decoders are imported when an event is decoded
+    from substrate.contract import Contract
+    from substrate.deployment import Deployment
+    from substrate.farm import Farm
+    from substrate.node import Node
+    from substrate.twin import TwinInfo
 
 
 @dataclass
@@ -54,6 +62,60 @@ class NameContractCanceled:
     topics: list[bytes]
 
 
+@dataclass
+class RentContractCanceled:
+    """Rent contract canceled event class"""
+
+    phase: Phase
+    contract_id: int
+    node_id: int
+    twin_id: int
+    topics: list[bytes]
+
+
+@dataclass
+class ContractGracePeriodStarted:
+    """Contract grace period started event class"""
+
+    phase: Phase
+    contract_id: int
+    node_id: int
+    twin_id: int
+    block_number: int
+    topics: list[bytes]
+
+
+@dataclass
+class ContractGracePeriodEnded:
+    """Contract grace period ended event class"""
+
+    phase: Phase
+    contract_id: int
+    node_id: int
+    twin_id: int
+    topics: list[bytes]
+
+
+@dataclass
+class IPsReserved:
+    """IPs reserved event class"""
+
+    phase: Phase
+    contract_id: int
+    public_ips: list
+    topics: list[bytes]
+
+
+@dataclass
+class IPsFreed:
+    """IPs freed event class"""
+
+    phase: Phase
+    contract_id: int
+    public_ips: list
+    topics: list[bytes]
+
+
 @dataclass
 class ContractDeployed:
     """Contract deployed event class"""
@@ -64,6 +126,18 @@ class ContractDeployed:
     topics: list[bytes]
 
 
+@dataclass
+class ContractBilled:
+    """Contract billed event class"""
+
+    phase: Phase
+    contract_id: int
+    timestamp: int
+    discount_level: str
+    amount_billed: int
+    topics: list[bytes]
+
+
 @dataclass
 class DeploymentCreated:
     """Deployment created event class"""
@@ -94,6 +168,112 @@ class DeploymentCanceled:
     topics: list[bytes]
 
 
+@dataclass
+class TwinStored:
+    """Twin stored event class"""
+
+    phase: Phase
+    twin: TwinInfo
+    topics: list[bytes]
+
+
+@dataclass
+class FarmStored:
+    """Farm stored event class"""
+
+    phase: Phase
+    farm: Farm
+    topics: list[bytes]
+
+
+@dataclass
+class NodeStored:
+    """Node stored event class"""
+
+    phase: Phase
+    node: Node
+    topics: list[bytes]
+
+
+@dataclass
+class NodeDeleted:
+    """Node deleted event class"""
+
+    phase: Phase
+    node_id: int
+    topics: list[bytes]
+
+
+@dataclass
+class FarmDeleted:
+    """Farm deleted event class"""
+
+    phase: Phase
+    farm_id: int
+    topics: list[bytes]
+
+
+@dataclass
+class TwinDeleted:
+    """Twin deleted event class"""
+
+    phase: Phase
+    twin_id: int
+    topics: list[bytes]
+
+
+@dataclass
+class NodePublicConfigStored:
+    """Node public config stored event class"""
+
+    phase: Phase
+    node_id: int
+    public_config: dict
+    topics: list[bytes]
+
+
+@dataclass
+class NodeCertificationSet:
+    """Node certification set event class"""
+
+    phase: Phase
+    node_id: int
+    certification: str
+    topics: list[bytes]
+
+
+@dataclass
+class FarmCertificationSet:
+    """Farm certification set event class"""
+
+    phase: Phase
+    farm_id: int
+    certification: str
+    topics: list[bytes]
+
+
+@dataclass
+class MintCompleted:
+    """Mint completed event class"""
+
+    phase: Phase
+    tx_id: str
+    amount: int
+    target: str
+    topics: list[bytes]
+
+
+@dataclass
+class RefundTransactionProcessed:
+    """Refund transaction processed event class"""
+
+    phase: Phase
+    tx_hash: str
+    amount: int
+    target: str
+    topics: list[bytes]
+
+
 @dataclass
 class EventRecords:
     """event records class"""
@@ -104,21 +284,22 @@ class EventRecords:
     # Smart contract module #
     #########################
 
-    SmartContractModule_ContractCreated: list[ContractCreated]
-    SmartContractModule_ContractUpdated: list[ContractUpdated]
-    SmartContractModule_NameContractCanceled: list[NameContractCanceled]
+    SmartContractModule_ContractCreated: list[ContractCreated] = field(default_factory=list)
+    SmartContractModule_ContractUpdated: list[ContractUpdated] = field(default_factory=list)
+    SmartContractModule_NodeContractCanceled: list[NodeContractCanceled] = field(default_factory=list)
+    SmartContractModule_NameContractCanceled: list[NameContractCanceled] = field(default_factory=list)
+    SmartContractModule_ContractDeployed: list[ContractDeployed] = field(default_factory=list)
+    SmartContractModule_ContractBilled: list[ContractBilled] = field(default_factory=list)
+    SmartContractModule_RentContractCanceled: list[RentContractCanceled] = field(default_factory=list)
+    SmartContractModule_IPsReserved: list[IPsReserved] = field(default_factory=list)
+    SmartContractModule_IPsFreed: list[IPsFreed] = field(default_factory=list)
+    SmartContractModule_ContractGracePeriodStarted: list[ContractGracePeriodStarted] = field(default_factory=list)
+    SmartContractModule_ContractGracePeriodEnded: list[ContractGracePeriodEnded] = field(default_factory=list)
     """
-    SmartContractModule_IPsReserved: list[IPsReserved]
-    SmartContractModule_IPsFreed: list[IPsFreed]
-    SmartContractModule_ContractDeployed: list[ContractDeployed]
     SmartContractModule_ConsumptionReportReceived: list[ConsumptionReportReceived]
-    SmartContractModule_ContractBilled: list[ContractBilled]
     SmartContractModule_TokensBurned: list[TokensBurned]
     SmartContractModule_UpdatedUsedResources: list[UpdatedUsedResources]
     SmartContractModule_NruConsumptionReportReceived: list[NruConsumptionReportReceived]
-    SmartContractModule_RentContractCanceled: list[RentContractCanceled]
-    SmartContractModule_ContractGracePeriodStarted: list[ContractGracePeriodStarted]
-    SmartContractModule_ContractGracePeriodEnded: list[ContractGracePeriodEnded]
     SmartContractModule_NodeMarkedAsDedicated: list[NodeMarkAsDedicated]
     SmartContractModule_SolutionProviderCreated: list[SolutionProviderCreated]
     SmartContractModule_SolutionProviderApproved: list[SolutionProviderApproved]
@@ -126,25 +307,35 @@ class EventRecords:
     SmartContractModule_GroupDeleted: list[GroupDeleted]
     SmartContractModule_CapacityReservationContractCanceled: list[CapacityReservationContractCanceled]
     """
-    SmartContractModule_DeploymentCreated: list[DeploymentCreated]
-    SmartContractModule_DeploymentUpdated: list[DeploymentUpdated]
-    SmartContractModule_DeploymentCanceled: list[DeploymentCanceled]
+    SmartContractModule_DeploymentCreated: list[DeploymentCreated] = field(default_factory=list)
+    SmartContractModule_DeploymentUpdated: list[DeploymentUpdated] = field(default_factory=list)
+    SmartContractModule_DeploymentCanceled: list[DeploymentCanceled] = field(default_factory=list)
 
     ###################
     # TF grid module #
     ###################
-    """
+
     # farm events
-    TfgridModule_FarmStored: list[FarmStored]
-    TfgridModule_FarmUpdated: list[FarmStored]
-    TfgridModule_FarmDeleted: list[FarmDeleted]
+    TfgridModule_FarmStored: list[FarmStored] = field(default_factory=list)
+    TfgridModule_FarmUpdated: list[FarmStored] = field(default_factory=list)
+    TfgridModule_FarmDeleted: list[FarmDeleted] = field(default_factory=list)
 
     # node events
-    TfgridModule_NodeStored: list[NodeStored]
-    TfgridModule_NodeUpdated: list[NodeStored]
-    TfgridModule_NodeDeleted: list[NodeDeleted]
+    TfgridModule_NodeStored: list[NodeStored] = field(default_factory=list)
+    TfgridModule_NodeUpdated: list[NodeStored] = field(default_factory=list)
+    TfgridModule_NodeDeleted: list[NodeDeleted] = field(default_factory=list)
+
+    # twin events
+    TfgridModule_TwinStored: list[TwinStored] = field(default_factory=list)
+    TfgridModule_TwinUpdated: list[TwinStored] = field(default_factory=list)
+    TfgridModule_TwinDeleted: list[TwinDeleted] = field(default_factory=list)
+
+    # certification and public config events
+    TfgridModule_NodePublicConfigStored: list[NodePublicConfigStored] = field(default_factory=list)
+    TfgridModule_NodeCertificationSet: list[NodeCertificationSet] = field(default_factory=list)
+    TfgridModule_FarmCertificationSet: list[FarmCertificationSet] = field(default_factory=list)
+    """
     TfgridModule_NodeUptimeReported: list[NodeUptimeReported]
-    TfgridModule_NodePublicConfigStored: list[NodePublicConfig]
     TfgridModule_PowerTargetChanged: list[PowerTargetChanged]
     TfgridModule_PowerStateChanged: list[PowerStateChanged]
 
@@ -153,10 +344,6 @@ class EventRecords:
     TfgridModule_EntityUpdated: list[EntityStored]
     TfgridModule_EntityDeleted: list[EntityDeleted]
 
-    # twin events
-    TfgridModule_TwinStored: list[TwinStored]
-    TfgridModule_TwinUpdated: list[TwinStored]
-    TfgridModule_TwinDeleted: list[TwinDeleted]
     TfgridModule_TwinEntityStored: list[TwinEntityStored]
     TfgridModule_TwinEntityRemoved: list[TwinEntityRemoved]
 
@@ -168,12 +355,10 @@ class EventRecords:
     TfgridModule_FarmPayoutV2AddressRegistered: list[FarmPayoutV2AddressRegistered]
     TfgridModule_FarmMarkedAsDedicated: list[FarmMarkedAsDedicated]
     TfgridModule_ConnectionPriceSet: list[ConnectionPriceSet]
-    TfgridModule_NodeCertificationSet: list[NodeCertificationSet]
     TfgridModule_NodeCertifierAdded: list[NodeCertifierAdded]
     TfgridModule_NodeCertifierRemoved: list[NodeCertifierRemoved]
     TfgridModule_FarmingPolicyUpdated: list[FarmingPolicyUpdated]
     TfgridModule_FarmingPolicySet: list[FarmingPolicySet]
-    TfgridModule_FarmCertificationSet: list[FarmCertificationSet]
     TfgridModule_ZosVersionUpdated: list[ZosVersionUpdated]
 
     ##################
@@ -181,15 +366,18 @@ class EventRecords:
     ##################
 
     BurningModule_BurnTransactionCreated: list[BurnTransactionCreated]
+    """
 
     #####################
     # TFT bridge module #
     #####################
 
+    TFTBridgeModule_MintCompleted: list[MintCompleted] = field(default_factory=list)
+    TFTBridgeModule_RefundTransactionProcessed: list[RefundTransactionProcessed] = field(default_factory=list)
+    """
     # mints
     TFTBridgeModule_MintTransactionProposed: list[MintTransactionProposed]
     TFTBridgeModule_MintTransactionVoted: list[MintTransactionVoted]
-    TFTBridgeModule_MintCompleted: list[MintCompleted]
     TFTBridgeModule_MintTransactionExpired: list[MintTransactionExpired]
 
     # burns
@@ -204,7 +392,6 @@ class EventRecords:
     TFTBridgeModule_RefundTransactionCreated: list[RefundTransactionCreated]
     TFTBridgeModule_RefundTransactionsignatureAdded: list[RefundTransactionSignatureAdded]
     TFTBridgeModule_RefundTransactionReady: list[RefundTransactionReady]
-    TFTBridgeModule_RefundTransactionProcessed: list[RefundTransactionProcessed]
     TFTBridgeModule_RefundTransactionExpired: list[RefundTransactionCreated]
 
     ###################
@@ -264,3 +451,230 @@ class EventRecords:
     Dao_ClosedByCouncil: list[ClosedByCouncil]
     Dao_CouncilMemberVeto: list[CouncilMemberVeto]
     """
+
+    # raw events of the fields not decoded yet, by field name
+    _pending: ClassVar[dict[str, list]] = {}
+
+    def __getattribute__(self, name: str):
+        pending = object.__getattribute__(self, "_pending")
+        if name in pending:
+            events = pending.pop(name)
+            decoder = EVENT_DECODERS[(events[0].value["module_id"], events[0].value["event_id"])]
+            object.__setattr__(self, name, [decode_event(decoder, event) for event in events])
+        return object.__getattribute__(self, name)
+
+    @staticmethod
+    def decode(events: list):
+        """group events by type, every field is decoded on its first access
+
+        Args:
+            events (list[GenericEventRecord]): events, like the triggered events of an extrinsic receipt
+
+        Returns:
+            EventRecords: event records, events without a decoder are skipped
+        """
+        pending: dict[str, list] = {}
+        for event in events:
+            key = (event.value["module_id"], event.value["event_id"])
+            if key in EVENT_DECODERS:
+                pending.setdefault(f"{key[0]}_{key[1]}", []).append(event)
+
+        records = EventRecords()
+        records._pending = pending
+        return records
+
+    def filter_twins(self, twin_ids: set[int]):
+        """keep the events of some twins, events without a twin are dropped
+
+        Args:
+            twin_ids (set[int]): twin IDs
+
+        Returns:
+            EventRecords: filtered event records
+        """
+        records = EventRecords()
+        for records_field in fields(self):
+            events = [event for event in getattr(self, records_field.name) if event_twin_id(event) in twin_ids]
+            setattr(records, records_field.name, events)
+        return records
+
+    def __len__(self):
+        return sum(len(getattr(self, records_field.name)) for records_field in fields(self))
+
+
+def event_twin_id(event):
+    """get the twin an event belongs to
+
+    Args:
+        event (any): decoded event
+
+    Returns:
+        int: twin ID, None if the event is not related to a twin
+    """
+    for attribute in ("contract", "deployment", "node", "farm"):
+        entity = getattr(event, attribute, None)
+        if entity is not None:
+            return entity.twin_id
+
+    if isinstance(event, TwinStored):
+        return event.twin.id
+
+    return getattr(event, "twin_id", None)
+
+
+def decode_phase(event):
+    """decode the phase of an event
+
+    Args:
+        event (GenericEventRecord): event
+
+    Returns:
+        Phase: event phase
+    """
+    phase = event.value["phase"]
+    return Phase(
+        is_apply_extrinsic=phase == "ApplyExtrinsic",
+        as_apply_extrinsic=event.value["extrinsic_idx"] or 0,
+        is_finalization=phase == "Finalization",
+        is_initialization=phase == "Initialization",
+    )
+
+
+def decode_event(decoder: Callable, event):
+    """decode an event with its decoder
+
+    Args:
+        decoder (Callable): decoder of the event type, called with the phase, attributes and topics
+        event (GenericEventRecord): event
+
+    Returns:
+        any: decoded event
+    """
+    return decoder(decode_phase(event), event.value["attributes"], event.value["topics"])
+
+
+def _single(attributes):
+    """get the value of an event with a single unnamed attribute"""
+    if isinstance(attributes, (list, tuple)):
+        return attributes[0]
+    return attributes
+
+
+def _decode_mint_completed(phase: Phase, attributes, topics: list):
+    # the transaction ID follows the mint transaction, older runtimes do not emit it
+    if isinstance(attributes, (list, tuple)):
+        mint_transaction = attributes[0]
+        tx_id = attributes[1] if len(attributes) > 1 else None
+    else:
+        mint_transaction = attributes
+        tx_id = None
+    return MintCompleted(phase, tx_id, mint_transaction["amount"], mint_transaction["target"], topics)
+
+
+def _decode_refund_processed(phase: Phase, attributes, topics: list):
+    refund_transaction = _single(attributes)
+    return RefundTransactionProcessed(
+        phase, refund_transaction["tx_hash"], refund_transaction["amount"], refund_transaction["target"], topics
+    )
+
+
+def _decode_contract(attributes):
+    # pylint: disable=import-outside-toplevel
+    from substrate.contract import Contract
+
+    return Contract.from_value(attributes)
+
+
+def _decode_deployment(attributes):
+    # pylint: disable=import-outside-toplevel
+    from substrate.deployment import Deployment
+
+    return Deployment.from_value(attributes["id"], attributes)
+
+
+def _decode_farm(attributes):
+    # pylint: disable=import-outside-toplevel
+    from substrate.farm import Farm
+
+    return Farm.from_value(attributes)
+
+
+def _decode_node(attributes):
+    # pylint: disable=import-outside-toplevel
+    from substrate.node import Node
+
+    return Node.from_value(attributes)
+
+
+def _decode_twin(attributes):
+    # pylint: disable=import-outside-toplevel
+    from substrate.twin import Twin
+
+    return Twin.from_value(attributes)
+
+
+# decoders by (module, event), called with the event phase, attributes and topics
+EVENT_DECODERS: dict[tuple[str, str], Callable] = {
+    ("SmartContractModule", "ContractCreated"): lambda phase, attrs, topics: ContractCreated(
+        phase, _decode_contract(attrs), topics
+    ),
+    ("SmartContractModule", "ContractUpdated"): lambda phase, attrs, topics: ContractUpdated(
+        phase, _decode_contract(attrs), topics
+    ),
+    ("SmartContractModule", "NodeContractCanceled"): lambda phase, attrs, topics: NodeContractCanceled(
+        phase, attrs["contract_id"], attrs["node_id"], attrs["twin_id"], topics
+    ),
+    ("SmartContractModule", "NameContractCanceled"): lambda phase, attrs, topics: NameContractCanceled(
+        phase, attrs["contract_id"], topics
+    ),
+    ("SmartContractModule", "RentContractCanceled"): lambda phase, attrs, topics: RentContractCanceled(
+        phase, attrs["contract_id"], attrs["node_id"], attrs["twin_id"], topics
+    ),
+    ("SmartContractModule", "IPsReserved"): lambda phase, attrs, topics: IPsReserved(
+        phase, attrs["contract_id"], attrs["public_ips"], topics
+    ),
+    ("SmartContractModule", "IPsFreed"): lambda phase, attrs, topics: IPsFreed(
+        phase, attrs["contract_id"], attrs["public_ips"], topics
+    ),
+    ("SmartContractModule", "ContractGracePeriodStarted"): lambda phase, attrs, topics: ContractGracePeriodStarted(
+        phase, attrs["contract_id"], attrs["node_id"], attrs["twin_id"], attrs["block_number"], topics
+    ),
+    ("SmartContractModule", "ContractGracePeriodEnded"): lambda phase, attrs, topics: ContractGracePeriodEnded(
+        phase, attrs["contract_id"], attrs["node_id"], attrs["twin_id"], topics
+    ),
+    ("SmartContractModule", "ContractDeployed"): lambda phase, attrs, topics: ContractDeployed(
+        phase, attrs[0], attrs[1], topics
+    ),
+    ("SmartContractModule", "ContractBilled"): lambda phase, attrs, topics: ContractBilled(
+        phase, attrs["contract_id"], attrs["timestamp"], attrs["discount_level"], attrs["amount_billed"], topics
+    ),
+    ("SmartContractModule", "DeploymentCreated"): lambda phase, attrs, topics: DeploymentCreated(
+        phase, _decode_deployment(attrs), topics
+    ),
+    ("SmartContractModule", "DeploymentUpdated"): lambda phase, attrs, topics: DeploymentUpdated(
+        phase, _decode_deployment(attrs), topics
+    ),
+    ("SmartContractModule", "DeploymentCanceled"): lambda phase, attrs, topics: DeploymentCanceled(
+        phase, attrs["deployment_id"], attrs["twin_id"], attrs["node_id"], attrs["capacity_reservation_id"], topics
+    ),
+    ("TfgridModule", "FarmStored"): lambda phase, attrs, topics: FarmStored(phase, _decode_farm(attrs), topics),
+    ("TfgridModule", "FarmUpdated"): lambda phase, attrs, topics: FarmStored(phase, _decode_farm(attrs), topics),
+    ("TfgridModule", "FarmDeleted"): lambda phase, attrs, topics: FarmDeleted(phase, _single(attrs), topics),
+    ("TfgridModule", "NodeStored"): lambda phase, attrs, topics: NodeStored(phase, _decode_node(attrs), topics),
+    ("TfgridModule", "NodeUpdated"): lambda phase, attrs, topics: NodeStored(phase, _decode_node(attrs), topics),
+    ("TfgridModule", "NodeDeleted"): lambda phase, attrs, topics: NodeDeleted(phase, _single(attrs), topics),
+    ("TfgridModule", "TwinStored"): lambda phase, attrs, topics: TwinStored(phase, _decode_twin(attrs), topics),
+    ("TfgridModule", "TwinUpdated"): lambda phase, attrs, topics: TwinStored(phase, _decode_twin(attrs), topics),
+    ("TfgridModule", "TwinDeleted"): lambda phase, attrs, topics: TwinDeleted(phase, _single(attrs), topics),
+    ("TfgridModule", "NodePublicConfigStored"): lambda phase, attrs, topics: NodePublicConfigStored(
+        phase, attrs[0], attrs[1], topics
+    ),
+    ("TfgridModule", "NodeCertificationSet"): lambda phase, attrs, topics: NodeCertificationSet(
+        phase, attrs[0], attrs[1], topics
+    ),
+    ("TfgridModule", "FarmCertificationSet"): lambda phase, attrs, topics: FarmCertificationSet(
+        phase, attrs[0], attrs[1], topics
+    ),
+    ("TFTBridgeModule", "MintCompleted"): _decode_mint_completed,
+    ("TFTBridgeModule", "RefundTransactionProcessed"): _decode_refund_processed,
+}
@@ -1,12 +1,21 @@
 """events class"""
 
-from substrateinterface import SubstrateInterface
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING
 
 from dataclasses import dataclass
-from substrate.event_records import EventRecords
+from substrate.event_records import EVENT_DECODERS, EventRecords
 from substrate.identity import Identity
+from substrate.storage import DEFAULT_CHUNK_SIZE, decode_storage_value, get_storage_function, get_storage_key
 from substrate.twin import Twin
 
+if TYPE_CHECKING:
+    from substrateinterface import ExtrinsicReceipt, SubstrateInterface
+
 
 @dataclass
 class Block:
@@ -33,6 +42,24 @@ class CallResponse:
     block: SignedBlock
     identity: Identity
 
+    @staticmethod
+    def from_receipt(receipt: ExtrinsicReceipt, identity: Identity):
+        """build a call response from the triggered events of an extrinsic receipt
+
+        Args:
+            receipt (ExtrinsicReceipt): extrinsic receipt
+            identity (Identity): extrinsic signer identity
+
+        Returns:
+            CallResponse: call response, the block is not fetched
+        """
+        return CallResponse(
+            hash=receipt.extrinsic_hash,
+            events=EventRecords.decode(receipt.triggered_events),
+            block=None,
+            identity=identity,
+        )
+
 
 class Event:
     """event class"""
@@ -144,3 +171,158 @@ class Event:
                 deployment_ids.append(e.deployment.id)
 
         return deployment_ids
+
+    @staticmethod
+    def scan(
+        substrate: SubstrateInterface,
+        start_block: int,
+        end_block: int,
+        filters: list[tuple[str, str]] = None,
+        workers: int = 8,
+    ):
+        """stream the events of a range of blocks in block order
+
+        The events of the next blocks are fetched concurrently while the current block is consumed,
+        every block is decoded with its own runtime, so ranges can span runtime upgrades.
+
+        Args:
+            substrate (SubstrateInterface): substrate instance, a ConnectionPool is needed to fetch concurrently
+            start_block (int): first block number
+            end_block (int): last block number, included
+            filters (list[tuple[str, str]], optional): (module, event) names to keep, all decodable events if not set
+            workers (int, optional): number of concurrent fetchers
+
+        Raises:
+            ValueError: block range, filters or workers are not valid
+            SubstrateRequestException: fetching a block failed
+
+        Yields:
+            tuple[int, str, EventRecords]: block number, block hash and event records of the blocks with matching events
+        """
+        # pylint: disable=import-outside-toplevel
+        from substrate.pool import ConnectionPool, connection
+
+        if start_block < 0 or end_block < start_block:
+            raise ValueError(f"block range {start_block}..{end_block} is not valid")
+        if workers <= 0:
+            raise ValueError(f"workers {workers} is not valid")
+
+        wanted = Event.wanted_events(filters)
+        _, events_key = Event.events_storage(substrate)
+
+        def fetch(block_number: int, block_hash: str):
+            with connection(substrate) as conn:
+                # the checked out connection may be at another runtime, or not initialized yet
+                _, storage_item = get_storage_function(conn, "System", "Events", block_hash)
+                events = Event.get_block_events(conn, (storage_item, events_key), block_hash, wanted)
+            return block_number, block_hash, events
+
+        blocks = Event._iter_block_hashes(substrate, start_block, end_block)
+
+        if not isinstance(substrate, ConnectionPool):
+            # a single connection can not be shared between fetchers
+            for block in blocks:
+                block_number, block_hash, events = fetch(*block)
+                if len(events) > 0:
+                    yield block_number, block_hash, EventRecords.decode(events)
+            return
+
+        executor = ThreadPoolExecutor(workers, thread_name_prefix="event-scan")
+        try:
+            # keep a bounded window of blocks being fetched ahead of the consumer
+            pending = deque(executor.submit(fetch, *block) for block in islice(blocks, workers * 4))
+            while len(pending) > 0:
+                block_number, block_hash, events = pending.popleft().result()
+
+                next_block = next(blocks, None)
+                if next_block is not None:
+                    pending.append(executor.submit(fetch, *next_block))
+
+                if len(events) > 0:
+                    yield block_number, block_hash, EventRecords.decode(events)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def wanted_events(filters: list[tuple[str, str]] = None):
+        """check event filters
+
+        Args:
+            filters (list[tuple[str, str]], optional): (module, event) names, all decodable events if not set
+
+        Raises:
+            ValueError: some events can not be decoded
+
+        Returns:
+            set[tuple[str, str]]: (module, event) names
+        """
+        wanted = set(filters) if filters is not None else set(EVENT_DECODERS)
+        unknown = wanted - EVENT_DECODERS.keys()
+        if len(unknown) > 0:
+            raise ValueError(f"events {sorted(unknown)} can not be decoded")
+        return wanted
+
+    @staticmethod
+    def events_storage(substrate: SubstrateInterface):
+        """get the metadata and key of the System.Events storage
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+
+        Returns:
+            tuple: storage function metadata, hex storage key
+        """
+        # pylint: disable=import-outside-toplevel
+        from substrate.pool import connection
+
+        with connection(substrate) as conn:
+            _, storage_item = get_storage_function(conn, "System", "Events")
+            return storage_item, get_storage_key(conn, "System", "Events")
+
+    @staticmethod
+    def get_block_events(
+        substrate: SubstrateInterface, events_storage: tuple, block_hash: str, wanted: set[tuple[str, str]]
+    ):
+        """get the raw events of a block
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            events_storage (tuple): System.Events storage metadata and key from `Event.events_storage`
+            block_hash (str): block hash
+            wanted (set[tuple[str, str]]): (module, event) names to keep
+
+        Raises:
+            SubstrateRequestException: fetching the events failed
+
+        Returns:
+            list[GenericEventRecord]: matching events, to be decoded with `EventRecords.decode`
+        """
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface.exceptions import SubstrateRequestException
+
+        storage_item, events_key = events_storage
+
+        response = substrate.rpc_request("state_getStorage", [events_key, block_hash])
+        if "error" in response:
+            raise SubstrateRequestException(response["error"]["message"])
+
+        events = decode_storage_value(substrate, storage_item, response["result"])
+        return [event for event in events.value_object if (event.value["module_id"], event.value["event_id"]) in wanted]
+
+    @staticmethod
+    def _iter_block_hashes(substrate: SubstrateInterface, start_block: int, end_block: int):
+        """iterate over the hashes of a range of blocks, fetched a chunk of blocks per request"""
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface.exceptions import SubstrateRequestException
+
+        for chunk_start in range(start_block, end_block + 1, DEFAULT_CHUNK_SIZE):
+            block_numbers = list(range(chunk_start, min(chunk_start + DEFAULT_CHUNK_SIZE, end_block + 1)))
+
+            response = substrate.rpc_request("chain_getBlockHash", [block_numbers])
+            if "error" in response:
+                raise SubstrateRequestException(response["error"]["message"])
+
+            for block_number, block_hash in zip(block_numbers, response["result"]):
+                if block_hash is None:
+                    raise ValueError(f"block {block_number} is not found")
+                yield block_number, block_hash
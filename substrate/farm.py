@@ -1,10 +1,18 @@
 """Farm module"""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from substrateinterface import SubstrateInterface
+from typing import TYPE_CHECKING
 
+from substrate.event_records import EventRecords
 from substrate.exceptions import FarmCreationException
 from substrate.identity import Identity
+from substrate.nonce import NonceManager
+from substrate.resolver import IdResolver
+
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
 
 
 @dataclass
@@ -79,19 +87,38 @@ class Farm:
         if farm_id != 0:
             return farm_id
 
-        call = substrate.compose_call(
-            "TfgridModule",
-            "create_farm",
-            {"name": name, "public_ips": [i.__dict__ for i in public_ips]},
-        )
+        call = Farm.create_call(substrate, name, public_ips)
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise FarmCreationException(call_response.error_message)
 
-        return Farm.get_farm_id_by_name(substrate, name)
+        farms_stored = EventRecords.decode(call_response.triggered_events).TfgridModule_FarmStored
+        if len(farms_stored) == 0:
+            raise FarmCreationException("failed to get farm id after creation")
+
+        farm_id = farms_stored[-1].farm.id
+        IdResolver.set("FarmIdByName", name, farm_id)
+        return farm_id
+
+    @staticmethod
+    def create_call(substrate: SubstrateInterface, name: str, public_ips: list[PublicIPInput]):
+        """compose a create farm call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            name (str): farm's name
+            public_ips (list[PublicIPInput]): farm's public ips
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "TfgridModule",
+            "create_farm",
+            {"name": name, "public_ips": [i.__dict__ for i in public_ips]},
+        )
 
     @staticmethod
     def get(substrate: SubstrateInterface, farm_id: int):
@@ -112,37 +139,59 @@ class Farm:
         if farm.value is None:
             raise ValueError(f"farm with id {farm_id} is not found")
 
-        certification = FarmCertification(
-            is_gold=farm["certification"] == "Gold", is_not_certified=farm["certification"] == "NotCertified"
-        )
+        return Farm.decode(farm)
 
-        public_ips: list[PublicIP] = []
-        for public_ip in farm["public_ips"]:
-            public_ips.append(PublicIP(ip=public_ip["ip"], gw=public_ip["gw"], contract_id=public_ip["contract_id"]))
+    @staticmethod
+    def decode(farm):
+        """decode a farm storage entry
+
+        Args:
+            farm (ScaleType): farm storage entry
 
+        Returns:
+            Farm: farm object
+        """
+        return Farm.from_value(farm.value)
+
+    @staticmethod
+    def from_value(farm: dict):
+        """build a farm from the plain value of a farm storage entry, read once instead of indexing the ScaleType
+
+        Args:
+            farm (dict): farm storage entry value
+
+        Returns:
+            Farm: farm object
+        """
         farming_policies_limit = OptionFarmingPolicyLimit(False, None)
-        if farm["farming_policy_limits"].value is not None:
+        limits = farm["farming_policy_limits"]
+        if limits is not None:
             farming_policies_limit = OptionFarmingPolicyLimit(
                 has_value=True,
                 as_value=FarmingPolicyLimit(
-                    farming_policy_id=farm["farming_policy_limits"]["farming_policy_id"],
-                    cu=farm["farming_policy_limits"]["cu"],
-                    su=farm["farming_policy_limits"]["su"],
-                    end=farm["farming_policy_limits"]["end"],
-                    node_count=farm["farming_policy_limits"]["node_count"],
-                    node_certification=farm["farming_policy_limits"]["node_certification"],
+                    farming_policy_id=limits["farming_policy_id"],
+                    cu=limits["cu"],
+                    su=limits["su"],
+                    end=limits["end"],
+                    node_count=limits["node_count"],
+                    node_certification=limits["node_certification"],
                 ),
             )
 
         return Farm(
-            version=farm["version"].value,
-            id=farm["id"].value,
-            name=farm["name"].value,
-            twin_id=farm["twin_id"].value,
-            pricing_policy_id=farm["pricing_policy_id"].value,
-            certification=certification,
-            public_ips=public_ips,
-            dedicated_farm=farm["dedicated_farm"].value,
+            version=farm["version"],
+            id=farm["id"],
+            name=farm["name"],
+            twin_id=farm["twin_id"],
+            pricing_policy_id=farm["pricing_policy_id"],
+            certification=FarmCertification(
+                is_gold=farm["certification"] == "Gold", is_not_certified=farm["certification"] == "NotCertified"
+            ),
+            public_ips=[
+                PublicIP(ip=public_ip["ip"], gw=public_ip["gw"], contract_id=public_ip["contract_id"])
+                for public_ip in farm["public_ips"]
+            ],
+            dedicated_farm=farm["dedicated_farm"],
             farming_policies_limit=farming_policies_limit,
         )
 
@@ -160,4 +209,4 @@ class Farm:
         Returns:
             int: farm ID
         """
-        return substrate.query("TfgridModule", "FarmIdByName", [name])
+        return IdResolver.resolve(substrate, "FarmIdByName", name)
@@ -0,0 +1,266 @@
+"""geo index module"""
+
+import heapq
+import math
+from typing import Callable
+
+from substrate.event_records import EventRecords
+from substrate.node_table import NodeTable
+
+EARTH_RADIUS_KM = 6371.0088
+
+# edge of the buckets on the unit sphere, about 200 km
+DEFAULT_BUCKET_SIZE = 200 / EARTH_RADIUS_KM
+
+# events that move or remove the indexed nodes
+GEO_INDEX_EVENTS = [
+    ("TfgridModule", "NodeStored"),
+    ("TfgridModule", "NodeUpdated"),
+    ("TfgridModule", "NodeDeleted"),
+]
+
+
+def unit_vector(latitude: float, longitude: float):
+    """get the point of a location on the unit sphere
+
+    Args:
+        latitude (float): latitude in degrees
+        longitude (float): longitude in degrees
+
+    Returns:
+        tuple[float, float, float]: x, y, z
+    """
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord: float):
+    """convert the straight distance of two points on the unit sphere to a great circle distance
+
+    Args:
+        chord (float): distance on the unit sphere
+
+    Returns:
+        float: distance in km
+    """
+    return EARTH_RADIUS_KM * 2 * math.asin(min(1.0, chord / 2))
+
+
+def km_to_chord(distance: float):
+    """convert a great circle distance to the straight distance of two points on the unit sphere
+
+    Args:
+        distance (float): distance in km
+
+    Returns:
+        float: distance on the unit sphere
+    """
+    return 2 * math.sin(min(math.pi, distance / EARTH_RADIUS_KM) / 2)
+
+
+class GeoIndex:
+    """spatial index of the nodes locations
+
+        index = GeoIndex.from_table(table)
+        nearest = index.nearest(50.85, 4.35, k=5)
+
+    The index is kept current by applying the records of the `GEO_INDEX_EVENTS`:
+
+        subscription = EventSubscription(pool, GEO_INDEX_EVENTS)
+        subscription.add_callback(lambda block_number, block_hash, records: index.apply(records))
+
+    The nodes are placed on the unit sphere and bucketed in a grid of cubes, a query visits the buckets
+    from the closest one and stops once the next bucket is further than the results.
+    Nodes without a valid location are not indexed.
+    """
+
+    def __init__(self, bucket_size: float = DEFAULT_BUCKET_SIZE):
+        if bucket_size <= 0:
+            raise ValueError(f"bucket size {bucket_size} is not valid")
+
+        self.bucket_size = bucket_size
+        self._points: dict[int, tuple[float, float, float]] = {}
+        self._buckets: dict[tuple[int, int, int], set[int]] = {}
+
+    @staticmethod
+    def from_table(table: NodeTable, bucket_size: float = DEFAULT_BUCKET_SIZE):
+        """build the index of the nodes of a node table
+
+        Args:
+            table (NodeTable): node table
+            bucket_size (float, optional): edge of the buckets on the unit sphere
+
+        Returns:
+            GeoIndex: geo index
+        """
+        index = GeoIndex(bucket_size)
+        columns = table.columns
+        for node_id, latitude, longitude in zip(columns["id"], columns["latitude"], columns["longitude"]):
+            index.update(node_id, latitude, longitude)
+        return index
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, node_id: int):
+        return node_id in self._points
+
+    def update(self, node_id: int, latitude, longitude):
+        """add or move a node, a node without a valid location is removed
+
+        Args:
+            node_id (int): node ID
+            latitude (float | str): latitude in degrees
+            longitude (float | str): longitude in degrees
+        """
+        self.remove(node_id)
+
+        try:
+            latitude = float(latitude)
+            longitude = float(longitude)
+        except (TypeError, ValueError):
+            return
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return
+
+        point = unit_vector(latitude, longitude)
+        self._points[node_id] = point
+        self._buckets.setdefault(self._bucket(point), set()).add(node_id)
+
+    def remove(self, node_id: int):
+        """remove a node
+
+        Args:
+            node_id (int): node ID
+        """
+        point = self._points.pop(node_id, None)
+        if point is None:
+            return
+
+        bucket = self._bucket(point)
+        self._buckets[bucket].discard(node_id)
+        if len(self._buckets[bucket]) == 0:
+            del self._buckets[bucket]
+
+    def apply(self, records: EventRecords):
+        """move the nodes stored or updated in a block and remove the deleted ones
+
+        Args:
+            records (EventRecords): event records of a block
+        """
+        for event in records.TfgridModule_NodeStored + records.TfgridModule_NodeUpdated:
+            self.update(event.node.id, event.node.location.latitude, event.node.location.longitude)
+        # deletions last, the events of a block are grouped by type
+        for event in records.TfgridModule_NodeDeleted:
+            self.remove(event.node_id)
+
+    def nearest(self, latitude: float, longitude: float, k: int = 10, filters: Callable[[int], bool] = None):
+        """get the nodes closest to a location
+
+        Args:
+            latitude (float): latitude in degrees
+            longitude (float): longitude in degrees
+            k (int, optional): maximum number of nodes
+            filters (Callable[[int], bool], optional): node ID predicate, the nodes it rejects are skipped
+
+        Returns:
+            list[tuple[int, float]]: node IDs and distances in km, closest first
+        """
+        if k <= 0:
+            return []
+
+        point = unit_vector(latitude, longitude)
+        # max heap of the k closest nodes
+        closest: list[tuple[float, int]] = []
+        for bound, node_ids in self._buckets_by_distance(point):
+            if len(closest) == k and bound > -closest[0][0]:
+                break
+            for node_id in node_ids:
+                if filters is not None and not filters(node_id):
+                    continue
+                distance = math.dist(point, self._points[node_id])
+                if len(closest) < k:
+                    heapq.heappush(closest, (-distance, node_id))
+                elif distance < -closest[0][0]:
+                    heapq.heapreplace(closest, (-distance, node_id))
+
+        return [(node_id, chord_to_km(-distance)) for distance, node_id in sorted(closest, reverse=True)]
+
+    def within_radius(self, latitude: float, longitude: float, radius: float, filters: Callable[[int], bool] = None):
+        """get the nodes within a distance of a location
+
+        Args:
+            latitude (float): latitude in degrees
+            longitude (float): longitude in degrees
+            radius (float): distance in km
+            filters (Callable[[int], bool], optional): node ID predicate, the nodes it rejects are skipped
+
+        Returns:
+            list[tuple[int, float]]: node IDs and distances in km, closest first
+        """
+        point = unit_vector(latitude, longitude)
+        max_chord = km_to_chord(radius)
+
+        nodes: list[tuple[float, int]] = []
+        for bound, node_ids in self._buckets_by_distance(point):
+            if bound > max_chord:
+                break
+            for node_id in node_ids:
+                if filters is not None and not filters(node_id):
+                    continue
+                distance = math.dist(point, self._points[node_id])
+                if distance <= max_chord:
+                    nodes.append((distance, node_id))
+
+        return [(node_id, chord_to_km(distance)) for distance, node_id in sorted(nodes)]
+
+    def _bucket(self, point: tuple[float, float, float]):
+        """get the bucket of a point"""
+        return tuple(math.floor(coordinate / self.bucket_size) for coordinate in point)
+
+    def _buckets_by_distance(self, point: tuple[float, float, float]):
+        """iterate over the non empty buckets with a lower bound of their distance to a point, never decreasing
+
+        The buckets are visited in rings of cubes around the bucket of the point, a ring at r buckets away is
+        at least r - 1 bucket sizes away. Once a ring has more cubes than there are non empty buckets, the
+        remaining buckets are sorted by their exact distance instead.
+        """
+        center = self._bucket(point)
+        ring = 0
+        while _ring_size(ring) <= len(self._buckets):
+            bound = max(ring - 1, 0) * self.bucket_size
+            for bucket in _ring(center, ring):
+                node_ids = self._buckets.get(bucket)
+                if node_ids is not None:
+                    yield bound, node_ids
+            ring += 1
+
+        remaining = []
+        for bucket, node_ids in self._buckets.items():
+            if max(abs(cell - center_cell) for cell, center_cell in zip(bucket, center)) >= ring:
+                gaps = []
+                for coordinate, cell in zip(point, bucket):
+                    low = cell * self.bucket_size
+                    gaps.append(max(low - coordinate, 0.0, coordinate - low - self.bucket_size))
+                remaining.append((math.hypot(*gaps), node_ids))
+        remaining.sort(key=lambda bucket: bucket[0])
+        yield from remaining
+
+
+def _ring_size(ring: int):
+    """number of cubes at a distance of ring cubes"""
+    return (2 * ring + 1) ** 3 - (2 * ring - 1) ** 3 if ring > 0 else 1
+
+
+def _ring(center: tuple[int, int, int], ring: int):
+    """iterate over the cubes at a distance of ring cubes from a center cube"""
+    x, y, z = center
+    for dx in range(-ring, ring + 1):
+        for dy in range(-ring, ring + 1):
+            if abs(dx) == ring or abs(dy) == ring:
+                dzs = range(-ring, ring + 1)
+            else:
+                dzs = (-ring, ring) if ring > 0 else (0,)
+            for dz in dzs:
+                yield (x + dx, y + dy, z + dz)
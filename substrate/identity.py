@@ -1,7 +1,12 @@
 """Identity module"""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from substrateinterface import Keypair, KeypairType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from substrateinterface import Keypair
 
 SS58_FORMAT = 42
 
@@ -28,6 +33,9 @@ class Identity:
         Returns:
             Identity: user identity
         """
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface import Keypair, KeypairType
+
         crypto_type = KeypairType.ED25519
         key_pair = Keypair.create_from_private_key(private_key, ss58_format=SS58_FORMAT, crypto_type=crypto_type)
         return Identity(key_pair)
@@ -42,6 +50,9 @@ class Identity:
         Returns:
             Identity: user identity
         """
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface import Keypair
+
         key_pair = Keypair.create_from_uri(phrase)
         return Identity(key_pair)
 
@@ -55,6 +66,9 @@ class Identity:
         Returns:
             Identity: user identity
         """
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface import Keypair
+
         key_pair = Keypair.create_from_mnemonic(phrase)
         return Identity(key_pair)
 
@@ -68,4 +82,7 @@ def generate_key_pair_from_phrase(phrase: str):
     Returns:
         Keypair: key pair for the phrase/mnemonic
     """
+    # pylint: disable=import-outside-toplevel
+    from substrateinterface import Keypair
+
     return Keypair.create_from_mnemonic(phrase)
@@ -0,0 +1,162 @@
+"""keyring module"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from substrateinterface import Keypair, KeypairType
+
+from substrate.identity import SS58_FORMAT, Identity
+
+# number of derivations below which a process pool is not worth starting
+MIN_PARALLEL_DERIVATIONS = 64
+
+
+class Keyring:
+    """cache of identities by a digest of their seed
+
+        keyring = Keyring()
+        identity = keyring.from_phrase(mnemonic)
+        tenants = keyring.derive_many(mnemonic, 1000)
+
+    The seeds are not kept, the identities are keyed by a BLAKE2b digest keyed with a random secret of the
+    keyring, so the keys of the cache can not be checked against guessed seeds outside of the process.
+    The least recently used identities are evicted once there are more than max_size.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        if max_size <= 0:
+            raise ValueError(f"max size {max_size} is not valid")
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._secret = os.urandom(32)
+        self._lock = threading.Lock()
+        self._identities: OrderedDict[bytes, Identity] = OrderedDict()
+
+    def __len__(self):
+        return len(self._identities)
+
+    def from_phrase(self, phrase: str):
+        """get the identity of a phrase/mnemonic, like `Identity.generate_from_phrase`
+
+        Args:
+            phrase (str): given mnemonics/phrase to generate a key pair
+
+        Returns:
+            Identity: user identity
+        """
+        return self._get(b"mnemonic", phrase.encode(), lambda: Identity.generate_from_phrase(phrase))
+
+    def from_sr25519_phrase(self, phrase: str):
+        """get the identity of a phrase or URI with derivation paths, like `Identity.generate_from_sr25519_phrase`
+
+        Args:
+            phrase (str): given phrase to generate a key pair
+
+        Returns:
+            Identity: user identity
+        """
+        return self._get(b"uri", phrase.encode(), lambda: Identity.generate_from_sr25519_phrase(phrase))
+
+    def from_ed25519_key(self, private_key: bytes):
+        """get the identity of an ed25519 private key, like `Identity.generate_from_ed25519_key`
+
+        Args:
+            private_key (bytes): ed25519 private key
+
+        Returns:
+            Identity: user identity
+        """
+        return self._get(b"ed25519", bytes(private_key), lambda: Identity.generate_from_ed25519_key(private_key))
+
+    def derive_many(self, phrase: str, count: int, start: int = 0, processes: int = None):
+        """get the identities of the `phrase//start` to `phrase//start + count - 1` URIs
+
+        The identities missing from the keyring are derived in a process pool, or in this process for a few of them.
+        The pool processes are spawned, not forked, so the threads of the connections and subscriptions running in
+        this process are not copied in a broken state.
+
+        Args:
+            phrase (str): mnemonic or URI to derive from
+            count (int): number of identities
+            start (int, optional): first derivation index
+            processes (int, optional): number of processes, the number of CPUs if not set
+
+        Returns:
+            list[Identity]: identities in the order of the indexes
+        """
+        uris = [f"{phrase}//{index}" for index in range(start, start + count)]
+        digests = [self._digest(b"uri", uri.encode()) for uri in uris]
+
+        identities: list[Identity] = [None] * count
+        missing = []
+        with self._lock:
+            for position, digest in enumerate(digests):
+                identity = self._identities.get(digest)
+                if identity is None:
+                    missing.append(position)
+                else:
+                    self._identities.move_to_end(digest)
+                    identities[position] = identity
+            self.hits += count - len(missing)
+            self.misses += len(missing)
+
+        missing_uris = [uris[position] for position in missing]
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or len(missing_uris) < MIN_PARALLEL_DERIVATIONS:
+            key_pairs = map(_key_pair_from_uri, missing_uris)
+        else:
+            with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+                chunk_size = max(1, len(missing_uris) // (processes * 4))
+                key_pairs = list(executor.map(_key_pair_from_uri, missing_uris, chunksize=chunk_size))
+
+        for position, key_pair in zip(missing, key_pairs):
+            identity = Identity(key_pair)
+            identities[position] = identity
+            self._put(digests[position], identity)
+
+        return identities
+
+    def clear(self):
+        """drop all the cached identities"""
+        with self._lock:
+            self._identities.clear()
+
+    def _digest(self, kind: bytes, seed: bytes):
+        """keyed digest of a seed, the kind separates the seeds derived differently"""
+        return hashlib.blake2b(kind + b"\0" + seed, key=self._secret, digest_size=32).digest()
+
+    def _get(self, kind: bytes, seed: bytes, derive):
+        """get a cached identity or derive and cache it"""
+        digest = self._digest(kind, seed)
+        with self._lock:
+            identity = self._identities.get(digest)
+            if identity is not None:
+                self._identities.move_to_end(digest)
+                self.hits += 1
+                return identity
+            self.misses += 1
+
+        # derived without holding the lock, an identity derived twice concurrently is the same
+        identity = derive()
+        self._put(digest, identity)
+        return identity
+
+    def _put(self, digest: bytes, identity: Identity):
+        """cache an identity, evicting the least recently used ones"""
+        with self._lock:
+            self._identities[digest] = identity
+            self._identities.move_to_end(digest)
+            while len(self._identities) > self.max_size:
+                self._identities.popitem(last=False)
+
+
+def _key_pair_from_uri(uri: str):
+    """derive the sr25519 key pair of a URI, run in the worker processes"""
+    return Keypair.create_from_uri(uri, ss58_format=SS58_FORMAT, crypto_type=KeypairType.SR25519)
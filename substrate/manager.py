@@ -1,22 +1,32 @@
 """substrate client"""
 
-from substrateinterface import SubstrateInterface
+from __future__ import annotations
 
-from substrate.account import Account
-from substrate.bridge import RefundTransaction, MintTransaction
-from substrate.contract import Contract
-from substrate.farm import Farm
-from substrate.twin import Twin
-from substrate.node import Node
-from .identity import Identity
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from substrate.identity import Identity
+    from substrate.pool import ConnectionPool
+
+# manager attributes, their modules are only imported on first access
+MANAGER_ENTITIES = {
+    "account": ("substrate.account", "Account"),
+    "twin": ("substrate.twin", "Twin"),
+    "farm": ("substrate.farm", "Farm"),
+    "node": ("substrate.node", "Node"),
+    "contract": ("substrate.contract", "Contract"),
+    "refund_transaction": ("substrate.bridge", "RefundTransaction"),
+    "mint_transaction": ("substrate.bridge", "MintTransaction"),
+}
 
 
 class Client:
     """substrate client class"""
 
-    def __init__(self, url: str, network=None):
-        self.substrate = SubstrateInterface(url)
-        self.manager = Manager(self)
+    def __init__(self, url: str | list[str], network=None, pool_size: int = 1, pool: ConnectionPool = None):
+        self.substrate = pool or _new_pool(url, pool_size)
+        self.manager = Manager(None, url, pool=self.substrate)
         # self.deployer = Deployer(self)
         # self.deployment_builder = DeploymentBuilder()
 
@@ -24,13 +34,24 @@ class Client:
 class Manager:
     """substrate manager class"""
 
-    def __init__(self, identity: Identity, substrate_url: str):
-        self.substrate = SubstrateInterface(substrate_url)
+    def __init__(
+        self, identity: Identity, substrate_url: str | list[str], pool_size: int = 1, pool: ConnectionPool = None
+    ):
+        self.substrate = pool or _new_pool(substrate_url, pool_size)
+
+    def __getattr__(self, name: str):
+        if name not in MANAGER_ENTITIES:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        module, attribute = MANAGER_ENTITIES[name]
+        entity = getattr(importlib.import_module(module), attribute)
+        setattr(self, name, entity)
+        return entity
+
+
+def _new_pool(url: str | list[str], pool_size: int):
+    """open a connection pool, substrateinterface is imported with the first one"""
+    # pylint: disable=import-outside-toplevel
+    from substrate.pool import ConnectionPool
 
-        self.account = Account
-        self.twin = Twin
-        self.farm = Farm
-        self.node = Node
-        self.contract = Contract
-        self.refund_transaction = RefundTransaction
-        self.mint_transaction = MintTransaction
+    return ConnectionPool(url, pool_size)
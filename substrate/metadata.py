@@ -0,0 +1,125 @@
+"""metadata cache module"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
+DEFAULT_METADATA_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "grid3_py", "metadata")
+
+
+class MetadataCache:
+    """runtime metadata cache by genesis hash and spec version, shared by the connections of a process and on disk
+
+    It implements the cache region interface of SubstrateInterface, the metadata of a runtime is read from the
+    chain once, new connections and processes decode it from the cache file instead of downloading it.
+    A runtime upgrade changes the spec version, its metadata is read from the chain and cached in turn.
+    """
+
+    # decoded metadata by (genesis hash, spec version), shared by the connections of the process
+    _decoded: dict[tuple[str, int], object] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, substrate: SubstrateInterface, genesis_hash: str, directory: str = None):
+        self.substrate = substrate
+        self.genesis_hash = genesis_hash
+        self.directory = os.path.join(directory or DEFAULT_METADATA_CACHE_DIR, genesis_hash)
+
+    def get(self, key: str):
+        """get the cached metadata of a runtime
+
+        Args:
+            key (str): cache key, METADATA_<spec version>
+
+        Returns:
+            ScaleType: decoded metadata, None if it is not cached
+        """
+        # pylint: disable=import-outside-toplevel
+        from scalecodec.base import ScaleBytes
+
+        spec_version = _spec_version(key)
+        if spec_version is None:
+            return None
+
+        with MetadataCache._lock:
+            metadata = MetadataCache._decoded.get((self.genesis_hash, spec_version))
+        if metadata is not None:
+            return metadata
+
+        try:
+            with open(self._path(spec_version), "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            metadata = self.substrate.runtime_config.create_scale_object(
+                "MetadataVersioned", data=ScaleBytes(bytearray(data))
+            )
+            metadata.decode()
+        except Exception:  # pylint: disable=broad-except
+            logging.exception("failed to decode the cached metadata of spec version %s", spec_version)
+            return None
+
+        with MetadataCache._lock:
+            MetadataCache._decoded[(self.genesis_hash, spec_version)] = metadata
+        return metadata
+
+    def set(self, key: str, metadata):
+        """cache the metadata of a runtime
+
+        Args:
+            key (str): cache key, METADATA_<spec version>
+            metadata (ScaleType): decoded metadata
+        """
+        spec_version = _spec_version(key)
+        if spec_version is None:
+            return
+
+        with MetadataCache._lock:
+            MetadataCache._decoded[(self.genesis_hash, spec_version)] = metadata
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # written to a temporary file first, so other processes never read a partial file
+            with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as file:
+                file.write(bytes(metadata.data.data))
+            os.replace(file.name, self._path(spec_version))
+        except OSError:
+            logging.exception("failed to write the metadata cache of spec version %s", spec_version)
+
+    def _path(self, spec_version: int):
+        """get the cache file of a spec version"""
+        return os.path.join(self.directory, f"{spec_version}.scale")
+
+
+def open_connection(url: str, cache_directory: str = None):
+    """open a substrate connection using the metadata cache
+
+    Args:
+        url (str): substrate url
+        cache_directory (str, optional): metadata cache directory, DEFAULT_METADATA_CACHE_DIR if not set
+
+    Returns:
+        SubstrateInterface: substrate instance
+    """
+    # pylint: disable=import-outside-toplevel
+    from substrateinterface import SubstrateInterface
+
+    substrate = SubstrateInterface(url)
+    substrate.cache_region = MetadataCache(substrate, substrate.get_block_hash(0), cache_directory)
+    return substrate
+
+
+def _spec_version(key: str):
+    """get the spec version of a metadata cache key"""
+    prefix, _, spec_version = key.partition("_")
+    if prefix != "METADATA" or not spec_version.isdigit():
+        return None
+    return int(spec_version)
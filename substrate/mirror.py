@@ -0,0 +1,364 @@
+"""grid mirror module"""
+
+import threading
+
+from substrateinterface import SubstrateInterface
+
+from substrate.contract import Contract
+from substrate.event_records import EventRecords
+from substrate.events import Event
+from substrate.farm import Farm
+from substrate.node import Node
+from substrate.pool import connection
+from substrate.snapshot import Snapshot, write_snapshot
+from substrate.storage import iter_map_pages, query_multi
+from substrate.subscription import EventSubscription
+from substrate.twin import Twin, TwinInfo
+
+# events that change the mirrored farms, nodes, twins and contracts
+MIRROR_EVENTS = [
+    ("TfgridModule", "FarmStored"),
+    ("TfgridModule", "FarmUpdated"),
+    ("TfgridModule", "FarmDeleted"),
+    ("TfgridModule", "NodeStored"),
+    ("TfgridModule", "NodeUpdated"),
+    ("TfgridModule", "NodeDeleted"),
+    ("TfgridModule", "TwinStored"),
+    ("TfgridModule", "TwinUpdated"),
+    ("TfgridModule", "TwinDeleted"),
+    ("SmartContractModule", "ContractCreated"),
+    ("SmartContractModule", "ContractUpdated"),
+    ("SmartContractModule", "NodeContractCanceled"),
+    ("SmartContractModule", "NameContractCanceled"),
+    ("SmartContractModule", "RentContractCanceled"),
+    # the events below do not carry the changed entity, it is read again at the block
+    ("SmartContractModule", "ContractGracePeriodStarted"),
+    ("SmartContractModule", "ContractGracePeriodEnded"),
+    ("SmartContractModule", "IPsReserved"),
+    ("SmartContractModule", "IPsFreed"),
+    ("TfgridModule", "NodePublicConfigStored"),
+    ("TfgridModule", "NodeCertificationSet"),
+    ("TfgridModule", "FarmCertificationSet"),
+]
+
+# dataclass of the entities of every snapshot section
+SNAPSHOT_SECTIONS = {"farms": Farm, "nodes": Node, "twins": TwinInfo, "contracts": Contract}
+
+
+class GridMirror:
+    """in memory copy of the farms, nodes, twins and contracts kept current from the chain events
+
+        mirror = GridMirror(pool)
+        mirror.bootstrap()
+        with mirror.follow():
+            node = mirror.get_node(node_id)
+
+    The maps are read once at a finalized block, the events of the next blocks are then applied in block
+    order, with `sync` to catch up to the finalized head or `follow` to apply every new finalized block.
+
+    A mirror saved with `save` is restarted from the file instead of the maps, only the blocks since the
+    snapshot are read:
+
+        mirror = GridMirror.load(pool, path)
+        mirror.sync()
+    """
+
+    def __init__(self, substrate: SubstrateInterface):
+        self.substrate = substrate
+        self.block_number: int = None
+        self.block_hash: str = None
+
+        self.farms: dict[int, Farm] = {}
+        self.nodes: dict[int, Node] = {}
+        self.twins: dict[int, TwinInfo] = {}
+        self.contracts: dict[int, Contract] = {}
+
+        # serializes the updates from sync and follow
+        self._lock = threading.Lock()
+        self._snapshot: Snapshot = None
+
+    def bootstrap(self, page_size: int = 500):
+        """read all the farms, nodes, twins and contracts at the finalized head
+
+        Args:
+            page_size (int, optional): number of entries per request
+        """
+        with connection(self.substrate) as conn:
+            block_hash = conn.get_chain_finalised_head()
+            block_number = conn.get_block_number(block_hash)
+
+        farms = self._read_map("TfgridModule", "Farms", Farm.decode, page_size, block_hash)
+        nodes = self._read_map("TfgridModule", "Nodes", Node.decode, page_size, block_hash)
+        twins = self._read_map("TfgridModule", "Twins", Twin.decode, page_size, block_hash)
+        contracts = self._read_map("SmartContractModule", "Contracts", Contract.decode, page_size, block_hash)
+
+        with self._lock:
+            self.farms = {farm.id: farm for farm in farms}
+            self.nodes = {node.id: node for node in nodes}
+            self.twins = {twin.id: twin for twin in twins}
+            self.contracts = {contract.contract_id: contract for contract in contracts}
+            self.block_number = block_number
+            self.block_hash = block_hash
+
+    def save(self, path: str):
+        """write the mirrored entities and block to a snapshot file
+
+        Args:
+            path (str): snapshot file path
+        """
+        if self.block_number is None:
+            raise ValueError("grid mirror is not bootstrapped")
+
+        with connection(self.substrate) as conn:
+            genesis_hash = conn.get_block_hash(0)
+
+        with self._lock:
+            sections = {"farms": self.farms, "nodes": self.nodes, "twins": self.twins, "contracts": self.contracts}
+            write_snapshot(path, self.block_number, self.block_hash, genesis_hash, sections)
+
+    @staticmethod
+    def load(substrate: SubstrateInterface, path: str):
+        """restart a mirror from a snapshot file, the entities are read from the mapped file on access
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            path (str): snapshot file path
+
+        Raises:
+            ValueError: snapshot is not valid or is from another chain
+
+        Returns:
+            GridMirror: mirror at the block of the snapshot, to catch up with `sync` or `follow`
+        """
+        snapshot = Snapshot(path, SNAPSHOT_SECTIONS)
+        with connection(substrate) as conn:
+            genesis_hash = conn.get_block_hash(0)
+        if snapshot.genesis_hash != genesis_hash:
+            snapshot.close()
+            raise ValueError(f"snapshot {path} is from chain {snapshot.genesis_hash}, not {genesis_hash}")
+
+        mirror = GridMirror(substrate)
+        mirror.farms = snapshot.sections["farms"]
+        mirror.nodes = snapshot.sections["nodes"]
+        mirror.twins = snapshot.sections["twins"]
+        mirror.contracts = snapshot.sections["contracts"]
+        mirror.block_number = snapshot.block_number
+        mirror.block_hash = snapshot.block_hash
+        mirror._snapshot = snapshot
+        return mirror
+
+    def apply(self, block_number: int, block_hash: str, records: EventRecords):
+        """apply the events of a block, blocks up to the mirrored one are ignored
+
+        Args:
+            block_number (int): block number
+            block_hash (str): block hash
+            records (EventRecords): event records of the block
+        """
+        with self._lock:
+            if self.block_number is None:
+                raise ValueError("grid mirror is not bootstrapped")
+            if block_number <= self.block_number:
+                return
+
+        # read outside the lock, the entities changed by events without their value
+        farms, nodes, contracts = self._read_changed(block_hash, records)
+
+        with self._lock:
+            if block_number <= self.block_number:
+                return
+
+            for event in records.TfgridModule_FarmStored + records.TfgridModule_FarmUpdated:
+                self.farms[event.farm.id] = event.farm
+            for event in records.TfgridModule_NodeStored + records.TfgridModule_NodeUpdated:
+                self.nodes[event.node.id] = event.node
+            for event in records.TfgridModule_TwinStored + records.TfgridModule_TwinUpdated:
+                self.twins[event.twin.id] = event.twin
+            for event in records.SmartContractModule_ContractCreated + records.SmartContractModule_ContractUpdated:
+                self.contracts[event.contract.contract_id] = event.contract
+
+            # the values read at the block are the latest of the block
+            for farm in farms:
+                self.farms[farm.id] = farm
+            for node in nodes:
+                self.nodes[node.id] = node
+            for contract in contracts:
+                self.contracts[contract.contract_id] = contract
+
+            # deletions last, the events of a block are grouped by type
+            for event in records.TfgridModule_FarmDeleted:
+                self.farms.pop(event.farm_id, None)
+            for event in records.TfgridModule_NodeDeleted:
+                self.nodes.pop(event.node_id, None)
+            for event in records.TfgridModule_TwinDeleted:
+                self.twins.pop(event.twin_id, None)
+            for event in (
+                records.SmartContractModule_NodeContractCanceled
+                + records.SmartContractModule_NameContractCanceled
+                + records.SmartContractModule_RentContractCanceled
+            ):
+                self.contracts.pop(event.contract_id, None)
+
+            self.block_number = block_number
+            self.block_hash = block_hash
+
+    def sync(self, workers: int = 8):
+        """apply the events of the blocks up to the finalized head
+
+        Args:
+            workers (int, optional): number of concurrent fetchers, with a connection pool
+        """
+        if self.block_number is None:
+            raise ValueError("grid mirror is not bootstrapped")
+
+        with connection(self.substrate) as conn:
+            head_hash = conn.get_chain_finalised_head()
+            head_number = conn.get_block_number(head_hash)
+
+        if head_number <= self.block_number:
+            return
+
+        for block_number, block_hash, records in Event.scan(
+            self.substrate, self.block_number + 1, head_number, MIRROR_EVENTS, workers
+        ):
+            self.apply(block_number, block_hash, records)
+
+        with self._lock:
+            if head_number > self.block_number:
+                self.block_number = head_number
+                self.block_hash = head_hash
+
+    def follow(self):
+        """apply the events of every new finalized block, from the block after the mirrored one
+
+        Returns:
+            EventSubscription: started subscription, close it to stop following
+        """
+        if self.block_number is None:
+            raise ValueError("grid mirror is not bootstrapped")
+
+        subscription = EventSubscription(self.substrate, MIRROR_EVENTS, start_block=self.block_number + 1)
+        subscription.add_callback(self.apply)
+        subscription.start()
+        return subscription
+
+    def get_farm(self, farm_id: int):
+        """get a farm
+
+        Args:
+            farm_id (int): farm ID
+
+        Raises:
+            ValueError: farm is not found
+
+        Returns:
+            Farm: farm object
+        """
+        farm = self.farms.get(farm_id)
+        if farm is None:
+            raise ValueError(f"farm with id {farm_id} is not found")
+        return farm
+
+    def get_node(self, node_id: int):
+        """get a node
+
+        Args:
+            node_id (int): node ID
+
+        Raises:
+            ValueError: node is not found
+
+        Returns:
+            Node: node object
+        """
+        node = self.nodes.get(node_id)
+        if node is None:
+            raise ValueError(f"node with id {node_id} is not found")
+        return node
+
+    def get_twin(self, twin_id: int):
+        """get a twin
+
+        Args:
+            twin_id (int): twin ID
+
+        Raises:
+            ValueError: twin is not found
+
+        Returns:
+            TwinInfo: the info for a twin
+        """
+        twin = self.twins.get(twin_id)
+        if twin is None:
+            raise ValueError(f"twin with id {twin_id} is not found")
+        return twin
+
+    def get_contract(self, contract_id: int):
+        """get a contract
+
+        Args:
+            contract_id (int): contract ID
+
+        Raises:
+            ValueError: contract is not found
+
+        Returns:
+            Contract: contract object
+        """
+        contract = self.contracts.get(contract_id)
+        if contract is None:
+            raise ValueError(f"contract with id {contract_id} is not found")
+        return contract
+
+    def _read_changed(self, block_hash: str, records: EventRecords):
+        """read at a block the farms, nodes and contracts changed by events that do not carry them"""
+        contract_ids = {
+            event.contract_id
+            for event in records.SmartContractModule_ContractGracePeriodStarted
+            + records.SmartContractModule_ContractGracePeriodEnded
+            + records.SmartContractModule_IPsReserved
+            + records.SmartContractModule_IPsFreed
+        }
+        node_ids = {
+            event.node_id
+            for event in records.TfgridModule_NodePublicConfigStored + records.TfgridModule_NodeCertificationSet
+        }
+        farm_ids = {event.farm_id for event in records.TfgridModule_FarmCertificationSet}
+
+        # the reserved and freed IPs are also changed in the farm of the contract node
+        created = {
+            event.contract.contract_id: event.contract
+            for event in records.SmartContractModule_ContractCreated + records.SmartContractModule_ContractUpdated
+        }
+        for event in records.SmartContractModule_IPsReserved + records.SmartContractModule_IPsFreed:
+            contract = created.get(event.contract_id) or self.contracts.get(event.contract_id)
+            if contract is None or not contract.contract_type.is_node_contract:
+                continue
+            node = self.nodes.get(contract.contract_type.node_contract.node_id)
+            if node is not None:
+                farm_ids.add(node.farm_id)
+
+        farms = self._read_entries("TfgridModule", "Farms", Farm.decode, farm_ids, block_hash)
+        nodes = self._read_entries("TfgridModule", "Nodes", Node.decode, node_ids, block_hash)
+        contracts = self._read_entries("SmartContractModule", "Contracts", Contract.decode, contract_ids, block_hash)
+        return farms, nodes, contracts
+
+    def _read_entries(self, module: str, storage_function: str, decode, ids: set[int], block_hash: str):
+        """decode some entries of a storage map, the missing ones are skipped"""
+        if len(ids) == 0:
+            return []
+        entries = query_multi(
+            self.substrate, module, storage_function, [[entity_id] for entity_id in sorted(ids)], block_hash
+        )
+        return [decode(entry) for entry in entries if entry is not None and entry.value is not None]
+
+    def _read_map(self, module: str, storage_function: str, decode, page_size: int, block_hash: str):
+        """decode all the entries of a storage map"""
+        entities = []
+        for page in iter_map_pages(
+            self.substrate, module, storage_function, page_size=page_size, block_hash=block_hash
+        ):
+            for _, entry in page:
+                if entry is not None and entry.value is not None:
+                    entities.append(decode(entry))
+        return entities
@@ -1,12 +1,21 @@
 """node module"""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from substrateinterface import SubstrateInterface
+from typing import TYPE_CHECKING
+from substrate.event_records import EventRecords
 from substrate.exceptions import NodeCreationException, NodeUpdateException, NodeUpdateUptimeException
 
 from substrate.identity import Identity
+from substrate.nonce import NonceManager
+from substrate.resolver import IdResolver
+from substrate.storage import DEFAULT_CHUNK_SIZE, iter_map_pages, query_multi
 from substrate.twin import Twin
 
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
 
 @dataclass
 class Resources:
@@ -210,7 +219,50 @@ class Node:
         if node_id != 0:
             return node_id
 
-        call = substrate.compose_call(
+        call = Node.create_call(
+            substrate, farm_id, resources, location, interfaces, secure_boot, virtualized, serial_number
+        )
+
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
+
+        if not call_response.is_success:
+            raise NodeCreationException(call_response.error_message)
+
+        nodes_stored = EventRecords.decode(call_response.triggered_events).TfgridModule_NodeStored
+        if len(nodes_stored) == 0:
+            raise NodeCreationException("failed to get node id after creation")
+
+        node_id = nodes_stored[-1].node.id
+        IdResolver.set("NodeIdByTwinID", twin_id, node_id)
+        return node_id
+
+    @staticmethod
+    def create_call(
+        substrate: SubstrateInterface,
+        farm_id: int,
+        resources: Resources,
+        location: Location,
+        interfaces: list[Interface],
+        secure_boot: bool,
+        virtualized: bool,
+        serial_number: OptionSerial,
+    ):
+        """compose a create node call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            farm_id (int): node farm's ID
+            resources (Resources): node resources
+            location (Location): node location
+            interfaces (list[Interface]): node interfaces
+            secure_boot (bool): node secure_boot
+            virtualized (bool): node virtualized
+            serial_number (OptionSerial): node serial_number
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
             "TfgridModule",
             "create_node",
             {
@@ -224,14 +276,6 @@ class Node:
             },
         )
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
-
-        if not call_response.is_success:
-            raise NodeCreationException(call_response.error_message)
-
-        return Node.get_id_by_twin_id(substrate, twin_id)
-
     @staticmethod
     def update(
         substrate: SubstrateInterface,
@@ -263,7 +307,50 @@ class Node:
             NodeUpdateException: Node update failed
         """
 
-        call = substrate.compose_call(
+        call = Node.update_call(
+            substrate, node_id, farm_id, resources, location, interfaces, secure_boot, virtualized, serial_number
+        )
+
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
+
+        if not call_response.is_success:
+            raise NodeUpdateException(call_response.error_message)
+
+        nodes_updated = EventRecords.decode(call_response.triggered_events).TfgridModule_NodeUpdated
+        if len(nodes_updated) == 0:
+            raise NodeUpdateException("failed to get node id after update")
+
+        return nodes_updated[-1].node.id
+
+    @staticmethod
+    def update_call(
+        substrate: SubstrateInterface,
+        node_id: int,
+        farm_id: int,
+        resources: Resources,
+        location: Location,
+        interfaces: list[Interface],
+        secure_boot: bool,
+        virtualized: bool,
+        serial_number: OptionSerial,
+    ):
+        """compose an update node call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            node_id (int): node's ID
+            farm_id (int): node farm's ID
+            resources (Resources): node resources
+            location (Location): node location
+            interfaces (list[Interface]): node interfaces
+            secure_boot (bool): node secure_boot
+            virtualized (bool): node virtualized
+            serial_number (OptionSerial): node serial_number
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
             "TfgridModule",
             "update_node",
             {
@@ -278,15 +365,6 @@ class Node:
             },
         )
 
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
-
-        if not call_response.is_success:
-            raise NodeUpdateException(call_response.error_message)
-
-        twin_id = Twin.get_twin_id_from_public_key(substrate, identity.address)
-        return Node.get_id_by_twin_id(substrate, twin_id)
-
     @staticmethod
     def update_uptime(substrate: SubstrateInterface, identity: Identity, uptime: int):
         """update a node's uptime
@@ -297,13 +375,25 @@ class Node:
             uptime (int): node's uptime
         """
 
-        call = substrate.compose_call("TfgridModule", "report_uptime", {"uptime": uptime})
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call = Node.update_uptime_call(substrate, uptime)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise NodeUpdateUptimeException(call_response.error_message)
 
+    @staticmethod
+    def update_uptime_call(substrate: SubstrateInterface, uptime: int):
+        """compose an update uptime call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            uptime (int): node's uptime
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call("TfgridModule", "report_uptime", {"uptime": uptime})
+
     @staticmethod
     def set_node_certificate(substrate: SubstrateInterface, identity: Identity, node_id: int, cert: NodeCertification):
         """set node certificate using its ID
@@ -317,15 +407,28 @@ class Node:
         Raises:
             NodeUpdateException: failed setting certification
         """
-        call = substrate.compose_call(
-            "TfgridModule", "set_node_certification", {"node_id": node_id, "node_certification": str(cert)}
-        )
-        extrinsic = substrate.create_signed_extrinsic(call, identity.key_pair)
-        call_response = substrate.submit_extrinsic(extrinsic, True, True)
+        call = Node.set_node_certificate_call(substrate, node_id, cert)
+        call_response = NonceManager.for_identity(identity).submit(substrate, call)
 
         if not call_response.is_success:
             raise NodeUpdateException(call_response.error_message)
 
+    @staticmethod
+    def set_node_certificate_call(substrate: SubstrateInterface, node_id: int, cert: NodeCertification):
+        """compose a set node certificate call
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            node_id (int): node's ID
+            cert (NodeCertification): certification
+
+        Returns:
+            GenericCall: composed call
+        """
+        return substrate.compose_call(
+            "TfgridModule", "set_node_certification", {"node_id": node_id, "node_certification": str(cert)}
+        )
+
     @staticmethod
     def get_id_by_twin_id(substrate: SubstrateInterface, twin_id: int):
         """get node id by its twin id
@@ -337,7 +440,7 @@ class Node:
         Returns:
             int: node ID
         """
-        return substrate.query("TfgridModule", "NodeIdByTwinID", [twin_id])
+        return IdResolver.resolve(substrate, "NodeIdByTwinID", twin_id)
 
     @staticmethod
     def get_nodes_by_farm_id(substrate: SubstrateInterface, farm_id: int):
@@ -397,83 +500,123 @@ class Node:
         if node.value is None:
             raise ValueError(f"node with id {node_id} is not found")
 
-        resources = Resources(
-            hru=node["resources"]["hru"].value,
-            sru=node["resources"]["sru"].value,
-            cru=node["resources"]["cru"].value,
-            mru=node["resources"]["mru"].value,
-        )
+        return Node.decode(node)
 
-        location = Location(
-            city=node["location"]["city"].value,
-            country=node["location"]["country"].value,
-            latitude=node["location"]["latitude"].value,
-            longitude=node["location"]["longitude"].value,
-        )
+    @staticmethod
+    def get_many(substrate: SubstrateInterface, node_ids: list[int], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """get many nodes with a storage request per chunk of IDs
 
-        """TODO: power
-        power = Power(
-            target=PowerTarget(
-                is_up=node["power"]["target"]["is_up"].value, is_down=node["power"]["target"]["is_down"].value
-            ),
-            state=PowerState(
-                is_up=node["power"]["state"]["is_up"].value,
-                is_down=node["power"]["state"]["is_down"].value,
-                as_down=node["power"]["state"]["as_down"].value,
-            ),
-            last_uptime=node["power"]["last_uptime"].value,
-        )
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            node_ids (list[int]): nodes IDs
+            chunk_size (int, optional): maximum number of nodes per request
+
+        Returns:
+            tuple[list[Node], list[int]]: nodes in the order of node_ids (None for missing nodes), missing nodes IDs
         """
+        results = query_multi(substrate, "TfgridModule", "Nodes", [[node_id] for node_id in node_ids], None, chunk_size)
 
-        public_config = None
-        if node["public_config"].value is not None:
-            ip4 = IP(
-                ip=node["public_config"]["ip4"]["ip"].value,
-                gw=node["public_config"]["ip4"]["gw"].value,
-            )
+        nodes: list[Node] = []
+        missing_ids: list[int] = []
+        for node_id, node in zip(node_ids, results):
+            if node is None or node.value is None:
+                nodes.append(None)
+                missing_ids.append(node_id)
+            else:
+                nodes.append(Node.decode(node))
 
-            ip6 = OptionIP(
-                has_value=node["public_config"]["ip6"].value is not None,
-                as_value=IP(
-                    ip=node["public_config"]["ip6"]["ip"].value,
-                    gw=node["public_config"]["ip6"]["gw"].value,
-                ),
-            )
+        return nodes, missing_ids
 
-            domain = OptionDomain(
-                has_value=node["public_config"]["domain"].value is not None,
-                as_value=node["public_config"]["domain"].value,
-            )
+    @staticmethod
+    def iter_all(substrate: SubstrateInterface, page_size: int = 100, start_key: str = None, pin_head: bool = True):
+        """iterate over all nodes, fetching one page of the nodes map at a time
 
-            public_config = PublicConfig(ip4=ip4, ip6=ip6, domain=domain)
+        The nodes are read at the chain head of the first page, see `iter_map_pages`.
 
-        interfaces: list[Interface] = []
-        for interface in node["interfaces"]:
-            interfaces.append(Interface(name=interface["name"], mac=interface["mac"], ips=interface["ips"]))
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            page_size (int, optional): number of nodes per page
+            start_key (str, optional): cursor key to resume after
+            pin_head (bool, optional): read every page at the chain head of the first one instead of its own
 
-        certification = NodeCertification(
-            is_diy=node["certification"] == "Diy", is_certified=node["certification"] == "Certified"
-        )
+        Yields:
+            tuple[str, Node]: cursor key to resume after this node, node object
+        """
+        for page in iter_map_pages(
+            substrate, "TfgridModule", "Nodes", page_size=page_size, start_key=start_key, pin_head=pin_head
+        ):
+            for key, node in page:
+                if node is not None and node.value is not None:
+                    yield key, Node.decode(node)
 
-        serial_number = OptionSerial(
-            has_value=node["serial_number"].value is not None, as_value=node["serial_number"].value
-        )
+    @staticmethod
+    def decode(node):
+        """decode a node storage entry
+
+        Args:
+            node (ScaleType): node storage entry
+
+        Returns:
+            Node: node object
+        """
+        return Node.from_value(node.value)
+
+    @staticmethod
+    def from_value(node: dict):
+        """build a node from the plain value of a node storage entry, read once instead of indexing the ScaleType
+
+        Args:
+            node (dict): node storage entry value
+
+        Returns:
+            Node: node object
+        """
+        resources = node["resources"]
+        location = node["location"]
+
+        # TODO: power
+
+        public_config = OptionPublicConfig(has_value=False, as_value=None)
+        if node["public_config"] is not None:
+            ip4 = node["public_config"]["ip4"]
+            ip6 = node["public_config"]["ip6"]
+            domain = node["public_config"]["domain"]
+            public_config = OptionPublicConfig(
+                has_value=True,
+                as_value=PublicConfig(
+                    ip4=IP(ip=ip4["ip"], gw=ip4["gw"]),
+                    ip6=OptionIP(has_value=ip6 is not None, as_value=IP(ip=ip6["ip"], gw=ip6["gw"]) if ip6 else None),
+                    domain=OptionDomain(has_value=domain is not None, as_value=domain),
+                ),
+            )
+
+        interfaces = [
+            Interface(name=interface["name"], mac=interface["mac"], ips=interface["ips"])
+            for interface in node["interfaces"]
+        ]
 
         return Node(
-            version=node["version"].value,
-            id=node["id"].value,
-            farm_id=node["farm_id"].value,
-            twin_id=node["twin_id"].value,
-            resources=resources,
-            location=location,
-            power=None,  # TODO: power
+            version=node["version"],
+            id=node["id"],
+            farm_id=node["farm_id"],
+            twin_id=node["twin_id"],
+            resources=Resources(hru=resources["hru"], sru=resources["sru"], cru=resources["cru"], mru=resources["mru"]),
+            location=Location(
+                city=location["city"],
+                country=location["country"],
+                latitude=location["latitude"],
+                longitude=location["longitude"],
+            ),
+            power=None,
             public_config=public_config,
-            created=node["created"].value,
-            farming_policy=node["farming_policy_id"].value,
+            created=node["created"],
+            farming_policy=node["farming_policy_id"],
             interfaces=interfaces,
-            certification=certification,
-            secure_boot=node["secure_boot"].value,
-            virtualized=node["virtualized"].value,
-            serial_number=serial_number,
-            connection_price=node["connection_price"].value,
+            certification=NodeCertification(
+                is_diy=node["certification"] == DIY, is_certified=node["certification"] == CERTIFIED
+            ),
+            secure_boot=node["secure_boot"],
+            virtualized=node["virtualized"],
+            serial_number=OptionSerial(has_value=node["serial_number"] is not None, as_value=node["serial_number"]),
+            connection_price=node["connection_price"],
         )
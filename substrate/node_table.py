@@ -0,0 +1,239 @@
+"""node table module"""
+
+import math
+from array import array
+
+from substrateinterface import SubstrateInterface
+
+from substrate.node import Node
+from substrate.pool import connection
+from substrate.storage import decode_storage_value, get_storage_function, iter_map_pages
+
+# columns of a NodeTable with their array type codes
+NODE_COLUMNS = {
+    "id": "I",
+    "farm_id": "I",
+    "twin_id": "I",
+    "hru": "Q",
+    "sru": "Q",
+    "cru": "Q",
+    "mru": "Q",
+    "latitude": "d",
+    "longitude": "d",
+    "country": "H",
+    "certified": "B",
+    "secure_boot": "B",
+    "virtualized": "B",
+    "has_public_config": "B",
+    "used_hru": "Q",
+    "used_sru": "Q",
+    "used_cru": "Q",
+    "used_mru": "Q",
+}
+
+
+class NodeTable:
+    """columnar table of the grid nodes, loaded at a single block and kept up to date with `upsert`
+
+    The fields used to select nodes are kept in typed array columns, one row per node:
+
+        table = NodeTable.from_chain(substrate)
+        rows = [row for row in range(len(table)) if table.columns["cru"][row] >= 4]
+        nodes = [table.node_at(row) for row in rows]
+
+    The full Node objects are only materialized on access, every row keeps the SCALE encoded node
+    from the chain, or the decoded value for nodes updated from events.
+    The used columns hold the resources reported by the node contracts, they are set with `set_used`.
+    """
+
+    def __init__(self, substrate: SubstrateInterface = None):
+        self.substrate = substrate
+        self.columns: dict[str, array] = {name: array(type_code) for name, type_code in NODE_COLUMNS.items()}
+        self.countries: list[str] = []
+        # incremented on every change of the rows, to invalidate what is computed from the columns
+        self.version = 0
+
+        self._country_codes: dict[str, int] = {}
+        self._rows: dict[int, int] = {}
+        self._entries: list[bytes | dict] = []
+        self._storage_item = None
+
+    @staticmethod
+    def from_chain(substrate: SubstrateInterface, page_size: int = 500, block_hash: str = None):
+        """load all nodes of the chain at a single block
+
+        Args:
+            substrate (SubstrateInterface): substrate instance, kept to materialize the nodes
+            page_size (int, optional): number of nodes per request
+            block_hash (str, optional): block hash to read at, the chain head of the first page is used if not set
+
+        Returns:
+            NodeTable: node table
+        """
+        table = NodeTable(substrate)
+        for page in iter_map_pages(substrate, "TfgridModule", "Nodes", page_size=page_size, block_hash=block_hash):
+            for _, node in page:
+                table.upsert(node.value, bytes(node.data.data))
+        return table
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, node_id: int):
+        return node_id in self._rows
+
+    def __getitem__(self, node_id: int):
+        return self.node_at(self.row_of(node_id))
+
+    def row_of(self, node_id: int):
+        """get the row of a node
+
+        Args:
+            node_id (int): node ID
+
+        Raises:
+            KeyError: node is not in the table
+
+        Returns:
+            int: row
+        """
+        return self._rows[node_id]
+
+    def node_at(self, row: int):
+        """materialize the node of a row
+
+        Args:
+            row (int): row
+
+        Returns:
+            Node: node object
+        """
+        entry = self._entries[row]
+        if isinstance(entry, dict):
+            return Node.from_value(entry)
+
+        with connection(self.substrate) as conn:
+            if self._storage_item is None:
+                _, self._storage_item = get_storage_function(conn, "TfgridModule", "Nodes")
+            node = decode_storage_value(conn, self._storage_item, f"0x{entry.hex()}")
+        return Node.decode(node)
+
+    def upsert(self, node: dict, data: bytes = None):
+        """add or update a node
+
+        Args:
+            node (dict): decoded node value, like the value of a Nodes storage entry or a NodeStored event
+            data (bytes, optional): SCALE encoded node, the decoded value is kept if not set
+
+        Returns:
+            int: row of the node
+        """
+        row = self._rows.get(node["id"])
+        if row is None:
+            row = len(self._entries)
+            self._rows[node["id"]] = row
+            self._entries.append(None)
+            for column in self.columns.values():
+                column.append(0)
+
+        self._entries[row] = data if data is not None else node
+
+        resources = node["resources"]
+        location = node["location"]
+        values = {
+            "id": node["id"],
+            "farm_id": node["farm_id"],
+            "twin_id": node["twin_id"],
+            "hru": resources["hru"],
+            "sru": resources["sru"],
+            "cru": resources["cru"],
+            "mru": resources["mru"],
+            "latitude": _parse_coordinate(location["latitude"]),
+            "longitude": _parse_coordinate(location["longitude"]),
+            "country": self._country_code(location["country"]),
+            "certified": node["certification"] == "Certified",
+            "secure_boot": bool(node["secure_boot"]),
+            "virtualized": bool(node["virtualized"]),
+            "has_public_config": node["public_config"] is not None,
+        }
+        for name, value in values.items():
+            self.columns[name][row] = value
+
+        self.version += 1
+        return row
+
+    def set_used(self, node_id: int, used: dict):
+        """set the resources used on a node
+
+        Args:
+            node_id (int): node ID
+            used (dict): used hru, sru, cru and mru
+
+        Raises:
+            KeyError: node is not in the table
+        """
+        row = self._rows[node_id]
+        for resource in ("hru", "sru", "cru", "mru"):
+            self.columns[f"used_{resource}"][row] = used[resource]
+        self.version += 1
+
+    def remove(self, node_id: int):
+        """remove a node, the last row takes its place
+
+        Args:
+            node_id (int): node ID
+        """
+        row = self._rows.pop(node_id, None)
+        if row is None:
+            return
+
+        last = len(self._entries) - 1
+        if row != last:
+            self._entries[row] = self._entries[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+            self._rows[self.columns["id"][row]] = row
+
+        self._entries.pop()
+        for column in self.columns.values():
+            column.pop()
+        self.version += 1
+
+    def country_of(self, row: int):
+        """get the country of a row
+
+        Args:
+            row (int): row
+
+        Returns:
+            str: country name
+        """
+        return self.countries[self.columns["country"][row]]
+
+    def country_codes(self, countries: set[str]):
+        """get the codes of the country column for country names
+
+        Args:
+            countries (set[str]): country names
+
+        Returns:
+            set[int]: codes of the countries present in the table
+        """
+        return {self._country_codes[country] for country in countries if country in self._country_codes}
+
+    def _country_code(self, country: str):
+        """intern a country name"""
+        code = self._country_codes.get(country)
+        if code is None:
+            code = len(self.countries)
+            self.countries.append(country)
+            self._country_codes[country] = code
+        return code
+
+
+def _parse_coordinate(coordinate: str):
+    """parse a latitude or longitude, NaN if it is not a number"""
+    try:
+        return float(coordinate)
+    except (TypeError, ValueError):
+        return math.nan
@@ -0,0 +1,148 @@
+"""nonce manager module"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from substrate.identity import Identity
+
+if TYPE_CHECKING:
+    from scalecodec.types import GenericCall
+    from substrateinterface import SubstrateInterface
+    from substrateinterface.exceptions import SubstrateRequestException
+
+# rejections of an extrinsic signed with a nonce already used, by another client of the account for instance
+NONCE_ERRORS = ("Transaction is outdated", "Priority is too low", "Transaction is stale")
+
+
+def is_nonce_error(error: SubstrateRequestException):
+    """check if the node rejected an extrinsic because of its nonce
+
+    Args:
+        error (SubstrateRequestException): submission error, its argument is the node error or its message
+
+    Returns:
+        bool: True if the nonce is already used
+    """
+    message = str(error.args[0]) if len(error.args) > 0 else ""
+    return any(nonce_error in message for nonce_error in NONCE_ERRORS)
+
+
+class NonceManager:
+    """hands out increasing nonces for an identity, shared by all the threads and tasks signing with it
+
+    The account nonce is fetched once from the chain, then nonces are allocated locally.
+    A failed signing or submission resyncs the nonce from the chain on the next allocation, an extrinsic rejected
+    because its nonce was used meanwhile by another client of the account is signed and submitted again once.
+    """
+
+    _managers: dict[str, "NonceManager"] = {}
+    _managers_lock = threading.Lock()
+
+    def __init__(self, identity: Identity):
+        self.identity = identity
+        self._lock = threading.Lock()
+        self._nonce: int = None
+
+    @staticmethod
+    def for_identity(identity: Identity):
+        """get the nonce manager of an identity
+
+        Args:
+            identity (Identity): signer identity
+
+        Returns:
+            NonceManager: the nonce manager shared by all users of the identity address
+        """
+        with NonceManager._managers_lock:
+            manager = NonceManager._managers.get(identity.address)
+            if manager is None:
+                manager = NonceManager(identity)
+                NonceManager._managers[identity.address] = manager
+            return manager
+
+    def next(self, substrate: SubstrateInterface):
+        """allocate the next nonce
+
+        Args:
+            substrate (SubstrateInterface): substrate instance used to fetch the account nonce
+
+        Returns:
+            int: nonce
+        """
+        with self._lock:
+            if self._nonce is None:
+                # the next index counts the extrinsics of the account waiting in the transaction pool
+                response = substrate.rpc_request("system_accountNextIndex", [self.identity.address])
+                self._nonce = response["result"]
+
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def resync(self):
+        """drop the local nonce, it is fetched again from the chain on the next allocation"""
+        with self._lock:
+            self._nonce = None
+
+    def sign(self, substrate: SubstrateInterface, call: GenericCall):
+        """sign a call with the next nonce
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            call (GenericCall): composed call
+
+        Returns:
+            GenericExtrinsic: signed extrinsic
+        """
+        nonce = self.next(substrate)
+        try:
+            return substrate.create_signed_extrinsic(call, self.identity.key_pair, nonce=nonce)
+        except Exception:
+            # the nonce is not used, it would leave a gap holding back the next extrinsics
+            self.resync()
+            raise
+
+    def submit(
+        self,
+        substrate: SubstrateInterface,
+        call: GenericCall,
+        wait_for_inclusion: bool = True,
+        wait_for_finalization: bool = True,
+    ):
+        """sign a call with the next nonce and submit it, resyncing the nonce if the submission fails
+
+        An extrinsic rejected for its nonce is signed again with the nonce read from the chain and submitted once more.
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            call (GenericCall): composed call
+            wait_for_inclusion (bool, optional): wait for the extrinsic to be in a block
+            wait_for_finalization (bool, optional): wait for the extrinsic block to be finalized
+
+        Raises:
+            SubstrateRequestException: the node rejected the extrinsic
+
+        Returns:
+            ExtrinsicReceipt: extrinsic receipt
+        """
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface.exceptions import SubstrateRequestException
+
+        retried = False
+        while True:
+            extrinsic = self.sign(substrate, call)
+            try:
+                return substrate.submit_extrinsic(extrinsic, wait_for_inclusion, wait_for_finalization)
+            except SubstrateRequestException as exc:
+                # the node may not have the extrinsic, the next nonce is read again including the pool
+                self.resync()
+                if retried or not is_nonce_error(exc):
+                    raise
+                logging.warning("nonce of %s is used by another client, submitting again", self.identity.address)
+                retried = True
+            except Exception:
+                self.resync()
+                raise
@@ -0,0 +1,257 @@
+"""placement module"""
+
+import heapq
+import operator
+from array import array
+from dataclasses import dataclass
+from functools import partial
+from itertools import repeat
+from typing import Callable
+
+from substrateinterface import SubstrateInterface
+
+from substrate.node_table import NodeTable
+from substrate.storage import iter_map_pages
+
+RESOURCES = ("hru", "sru", "cru", "mru")
+
+# maximum number of filter masks kept between queries
+MAX_CACHED_MASKS = 256
+
+
+@dataclass
+class FarmCapacity:
+    """farm capacity class"""
+
+    farm_id: int
+    dedicated_farm: bool
+    free_public_ips: int
+
+
+@dataclass
+class PlacementQuery:
+    """placement query class, unset filters match every node"""
+
+    hru: int = 0
+    sru: int = 0
+    cru: int = 0
+    mru: int = 0
+    farm_ids: set[int] = None
+    countries: set[str] = None
+    certified: bool = None
+    public_ips: int = 0
+    dedicated_farm: bool = None
+
+
+class Placement:
+    """placement queries over a node table
+
+        placement = Placement.from_chain(substrate)
+        node_ids = placement.query(PlacementQuery(cru=2, mru=4 * GIGABYTE, public_ips=1), k=5)
+
+    Every filter is evaluated for all the rows at once into a byte mask, one byte per row, with iterators
+    running in C and the masks are combined as integers. Only the matching rows are scored.
+    The masks and free resources columns are kept until the table or the farms change, so repeated filters
+    cost a single integer operation.
+    """
+
+    def __init__(self, table: NodeTable, farms: dict[int, FarmCapacity] = None):
+        self.table = table
+        self.farms: dict[int, FarmCapacity] = dict(farms or {})
+
+        self._version: int = None
+        self._masks: dict[tuple, int] = {}
+        self._free: dict[str, array] = {}
+
+    @staticmethod
+    def from_chain(substrate: SubstrateInterface, page_size: int = 500, block_hash: str = None):
+        """load the nodes, farms and used resources of the chain at a single block
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            page_size (int, optional): number of entries per request
+            block_hash (str, optional): block hash to read at, the chain head is used if not set
+
+        Returns:
+            Placement: placement
+        """
+        if block_hash is None:
+            # all the maps are read at the same block
+            block_hash = substrate.get_chain_head()
+
+        placement = Placement(NodeTable.from_chain(substrate, page_size, block_hash))
+
+        for page in iter_map_pages(substrate, "TfgridModule", "Farms", page_size=page_size, block_hash=block_hash):
+            for _, farm in page:
+                placement.update_farm(farm.value)
+
+        contract_nodes: dict[int, int] = {}
+        for page in iter_map_pages(
+            substrate, "SmartContractModule", "Contracts", page_size=page_size, block_hash=block_hash
+        ):
+            for _, contract in page:
+                node_contract = contract.value["contract_type"].get("NodeContract")
+                if node_contract is not None:
+                    contract_nodes[contract.value["contract_id"]] = node_contract["node_id"]
+
+        used: dict[int, dict] = {}
+        for page in iter_map_pages(
+            substrate, "SmartContractModule", "NodeContractResources", page_size=page_size, block_hash=block_hash
+        ):
+            for _, contract_resources in page:
+                node_id = contract_nodes.get(contract_resources.value["contract_id"])
+                if node_id is None:
+                    continue
+                node_used = used.setdefault(node_id, dict.fromkeys(RESOURCES, 0))
+                for resource in RESOURCES:
+                    node_used[resource] += contract_resources.value["used"][resource]
+
+        for node_id, node_used in used.items():
+            if node_id in placement.table:
+                placement.table.set_used(node_id, node_used)
+
+        return placement
+
+    def update_farm(self, farm: dict):
+        """add or update a farm
+
+        Args:
+            farm (dict): decoded farm value, like the value of a Farms storage entry or a FarmStored event
+        """
+        self.farms[farm["id"]] = FarmCapacity(
+            farm_id=farm["id"],
+            dedicated_farm=bool(farm["dedicated_farm"]),
+            free_public_ips=sum(1 for public_ip in farm["public_ips"] if public_ip["contract_id"] == 0),
+        )
+        self._version = None
+
+    def query(
+        self,
+        query: PlacementQuery,
+        k: int = 10,
+        score: Callable[[NodeTable, int], object] = None,
+    ):
+        """get the best nodes matching a placement query
+
+        Args:
+            query (PlacementQuery): placement query
+            k (int, optional): maximum number of nodes
+            score (Callable[[NodeTable, int], object], optional): scoring function of a row, highest first,
+                the nodes with the most free memory first if not set
+
+        Returns:
+            list[int]: node IDs, best first
+        """
+        rows = self.matching_rows(query)
+        if score is None:
+            key = self._free_column("mru").__getitem__
+        else:
+            key = partial(score, self.table)
+        best = heapq.nlargest(k, rows, key=key)
+        return [self.table.columns["id"][row] for row in best]
+
+    def matching_rows(self, query: PlacementQuery):
+        """get the rows of the nodes matching a placement query
+
+        Args:
+            query (PlacementQuery): placement query
+
+        Returns:
+            Iterator[int]: rows
+        """
+        if self._version != self.table.version:
+            self._reset()
+
+        rows = len(self.table)
+        mask = _pack(repeat(1, rows))
+
+        for resource in RESOURCES:
+            required = getattr(query, resource)
+            if required > 0:
+                mask &= self._mask((resource, required), lambda r=resource, x=required: self._free_mask(r, x))
+
+        if query.countries is not None:
+            countries = frozenset(query.countries)
+            mask &= self._mask(("countries", countries), lambda: self._countries_mask(countries))
+
+        if query.certified is not None:
+            mask &= self._mask(("certified", query.certified), lambda: self._certified_mask(query.certified))
+
+        if query.farm_ids is not None or query.public_ips > 0 or query.dedicated_farm is not None:
+            farms = (
+                frozenset(query.farm_ids) if query.farm_ids is not None else None,
+                query.public_ips,
+                query.dedicated_farm,
+            )
+            mask &= self._mask(("farms", farms), lambda: self._farms_mask(*farms))
+
+        return _rows(mask.to_bytes(rows, "little"))
+
+    def _reset(self):
+        """drop the masks and free resources computed from a previous version of the table"""
+        self._masks.clear()
+        self._free.clear()
+        self._version = self.table.version
+
+    def _mask(self, key: tuple, compute: Callable[[], int]):
+        """get a filter mask, computed once per version of the table"""
+        mask = self._masks.get(key)
+        if mask is None:
+            if len(self._masks) >= MAX_CACHED_MASKS:
+                self._masks.clear()
+            mask = compute()
+            self._masks[key] = mask
+        return mask
+
+    def _free_column(self, resource: str):
+        """get the free amount of a resource of every row"""
+        if self._version != self.table.version:
+            self._reset()
+        free = self._free.get(resource)
+        if free is None:
+            columns = self.table.columns
+            free = array("q", map(operator.sub, columns[resource], columns[f"used_{resource}"]))
+            self._free[resource] = free
+        return free
+
+    def _free_mask(self, resource: str, required: int):
+        """mask of the rows with at least the required free resource"""
+        return _pack(map(operator.ge, self._free_column(resource), repeat(required)))
+
+    def _countries_mask(self, countries: frozenset[str]):
+        """mask of the rows in the countries"""
+        codes = self.table.country_codes(countries)
+        return _pack(map(codes.__contains__, self.table.columns["country"]))
+
+    def _certified_mask(self, certified: bool):
+        """mask of the certified rows, or of the not certified ones"""
+        flags = bytes(self.table.columns["certified"])
+        return _pack(flags if certified else map(operator.not_, flags))
+
+    def _farms_mask(self, farm_ids: frozenset[int], public_ips: int, dedicated_farm: bool):
+        """mask of the rows in the matching farms"""
+        farm_ids = self._matching_farms(farm_ids, public_ips, dedicated_farm)
+        return _pack(map(farm_ids.__contains__, self.table.columns["farm_id"]))
+
+    def _matching_farms(self, farm_ids: frozenset[int], public_ips: int, dedicated_farm: bool):
+        """get the IDs of the farms matching the farm filters"""
+        return {
+            farm_id
+            for farm_id in (self.farms if farm_ids is None else farm_ids)
+            if farm_id in self.farms
+            and self.farms[farm_id].free_public_ips >= public_ips
+            and (dedicated_farm is None or self.farms[farm_id].dedicated_farm == dedicated_farm)
+        }
+
+
+def _rows(flags: bytes):
+    """iterate over the rows set in a byte mask, searching for them in C"""
+    row = flags.find(1)
+    while row != -1:
+        yield row
+        row = flags.find(1, row + 1)
+
+
+def _pack(flags):
+    """pack row flags into an integer with a byte per row"""
+    return int.from_bytes(bytes(flags), "little")
@@ -0,0 +1,228 @@
+"""connection pool module"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from websocket import WebSocketException
+
+from substrate.metadata import open_connection
+
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
+CONNECTION_ERRORS = (WebSocketException, ConnectionError, TimeoutError, OSError)
+
+
+class ConnectionPool:
+    """thread safe pool of substrate connections
+
+    The pool can be passed wherever a SubstrateInterface is expected, every method call
+    is run on a connection checked out from the pool for the duration of the call.
+
+    The pooled connections can disagree on their runtime during an upgrade, so connection state such as
+    `metadata`, `runtime_config` or `block_hash` is only read on a checked out connection:
+
+        with pool.connection() as conn:
+            metadata = conn.metadata
+
+    `url` is the url of the first node, to open a dedicated connection.
+    """
+
+    def __init__(
+        self,
+        urls: str | list[str],
+        size: int = 4,
+        health_check_interval: float = 30,
+        checkout_timeout: float = None,
+    ):
+        if isinstance(urls, str):
+            urls = [urls]
+        if len(urls) == 0:
+            raise ValueError("at least one substrate url is required")
+        if size <= 0:
+            raise ValueError(f"pool size {size} is not valid")
+
+        self.url = urls[0]
+        self._urls = itertools.cycle(urls)
+        self._size = size
+        self._health_check_interval = health_check_interval
+        self._checkout_timeout = checkout_timeout
+
+        self._lock = threading.Lock()
+        self._idle = queue.LifoQueue()
+        self._connections: list[SubstrateInterface] = []
+        self._opened = 1
+        self._closed = False
+        self._last_used: dict[int, float] = {}
+        self._local = threading.local()
+
+        # connect eagerly so a wrong url fails here like a plain SubstrateInterface
+        self._release(self._new_connection())
+
+    @contextmanager
+    def connection(self):
+        """check out a connection for a sequence of calls, nested checkouts in a thread reuse it
+
+        Yields:
+            SubstrateInterface: substrate instance
+        """
+        held = getattr(self._local, "connection", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.connection = conn
+        healthy = True
+        try:
+            yield conn
+        except CONNECTION_ERRORS:
+            healthy = False
+            raise
+        finally:
+            self._local.connection = None
+            self._release(conn, healthy)
+
+    def close(self):
+        """close all connections of the pool"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._closed = True
+
+        for conn in connections:
+            conn.close()
+
+    def __getattr__(self, name: str):
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface import ExtrinsicReceipt, SubstrateInterface
+
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if callable(getattr(SubstrateInterface, name, None)):
+
+            def call(*args, **kwargs):
+                with self.connection() as conn:
+                    result = getattr(conn, name)(*args, **kwargs)
+
+                    if isinstance(result, ExtrinsicReceipt):
+                        # the receipt lazily queries its events, do it through the pool
+                        result.substrate = self
+                        if result.block_hash is not None:
+                            # decode its events and errors with the runtime of a single connection
+                            result.process_events()
+                return result
+
+            return call
+
+        held = getattr(self._local, "connection", None)
+        if held is None:
+            raise AttributeError(
+                f"{name} is connection state, read it on a checked out connection: `with pool.connection() as conn`"
+            )
+        return getattr(held, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _acquire(self):
+        """get an idle connection, open a new one if the pool is not full or wait for one"""
+        if self._closed:
+            raise ConnectionError("connection pool is closed")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self._size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                conn = self._new_connection()
+            else:
+                try:
+                    conn = self._idle.get(timeout=self._checkout_timeout)
+                except queue.Empty as exp:
+                    raise TimeoutError("timed out waiting for a substrate connection") from exp
+
+        idle_time = time.monotonic() - self._last_used.get(id(conn), 0)
+        if idle_time > self._health_check_interval:
+            try:
+                self._health_check(conn)
+            except CONNECTION_ERRORS:
+                self._release(conn, False)
+                raise
+
+        return conn
+
+    def _release(self, conn: SubstrateInterface, healthy: bool = True):
+        """put a connection back in the pool, an unhealthy one is checked on its next checkout"""
+        self._last_used[id(conn)] = time.monotonic() if healthy else 0
+        with self._lock:
+            if conn not in self._connections:
+                return
+        self._idle.put(conn)
+
+    def _new_connection(self):
+        """open a new connection to the next url, its slot in the pool is already reserved"""
+        with self._lock:
+            url = next(self._urls)
+
+        try:
+            conn = open_connection(url)
+            # the storage and event helpers decode with the runtime of the connection they check out
+            conn.init_runtime()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+        self._last_used[id(conn)] = time.monotonic()
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _health_check(self, conn: SubstrateInterface):
+        """reconnect a connection if it does not answer"""
+        try:
+            conn.rpc_request("system_health", [])
+        except CONNECTION_ERRORS:
+            self._reconnect(conn)
+            conn.init_runtime()
+
+    @staticmethod
+    def _reconnect(conn: SubstrateInterface):
+        """reopen the websocket of a connection"""
+        logging.warning("reconnecting to %s", conn.url)
+        try:
+            conn.close()
+        except CONNECTION_ERRORS:
+            pass
+        conn.connect_websocket()
+
+
+@contextmanager
+def connection(substrate: SubstrateInterface):
+    """use a single connection for a sequence of calls
+
+    Args:
+        substrate (SubstrateInterface): substrate instance or connection pool
+
+    Yields:
+        SubstrateInterface: a connection checked out from the pool, or the given substrate instance
+    """
+    if isinstance(substrate, ConnectionPool):
+        with substrate.connection() as conn:
+            yield conn
+    else:
+        yield substrate
@@ -0,0 +1,117 @@
+"""id resolver module"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
+# reverse lookup storage maps by module
+LOOKUP_STORAGE = {
+    "TwinIdByAccountID": "TfgridModule",
+    "NodeIdByTwinID": "TfgridModule",
+    "FarmIdByName": "TfgridModule",
+    "ContractIDByNameRegistration": "SmartContractModule",
+}
+
+
+class IdResolver:
+    """memoized reverse lookups of twin, node, farm and name contract IDs
+
+    Only existing mappings are memoized, a missing entry is queried again on the next lookup.
+    Writes that change a mapping update it with `set` or drop it with `invalidate`.
+    The memoized IDs are shared by the whole process, call `clear` before switching to another chain.
+    """
+
+    _lock = threading.Lock()
+    _ids: dict[str, dict] = {storage_function: {} for storage_function in LOOKUP_STORAGE}
+
+    @staticmethod
+    def resolve(substrate: SubstrateInterface, storage_function: str, key):
+        """get an ID from the memoized mappings or from the chain
+
+        Args:
+            substrate (SubstrateInterface): substrate instance
+            storage_function (str): lookup storage map name, one of LOOKUP_STORAGE
+            key (any): lookup key, an account address or public key for TwinIdByAccountID
+
+        Returns:
+            int: ID, 0 if the mapping does not exist
+        """
+        cached_id = IdResolver.get(storage_function, key)
+        if cached_id is not None:
+            return cached_id
+
+        resolved_id = substrate.query(LOOKUP_STORAGE[storage_function], storage_function, [key]).value or 0
+        if resolved_id != 0:
+            IdResolver.set(storage_function, key, resolved_id)
+
+        return resolved_id
+
+    @staticmethod
+    def get(storage_function: str, key):
+        """get a memoized ID
+
+        Args:
+            storage_function (str): lookup storage map name
+            key (any): lookup key
+
+        Returns:
+            int: ID, None if it is not memoized
+        """
+        with IdResolver._lock:
+            return IdResolver._ids[storage_function].get(IdResolver._normalize(storage_function, key))
+
+    @staticmethod
+    def set(storage_function: str, key, value: int):
+        """memoize an ID, after a write that created or changed the mapping
+
+        Args:
+            storage_function (str): lookup storage map name
+            key (any): lookup key
+            value (int): ID
+        """
+        with IdResolver._lock:
+            IdResolver._ids[storage_function][IdResolver._normalize(storage_function, key)] = value
+
+    @staticmethod
+    def invalidate(storage_function: str, key=None, value: int = None):
+        """drop memoized IDs, by key, by ID or all of a lookup
+
+        Args:
+            storage_function (str): lookup storage map name
+            key (any, optional): lookup key to drop
+            value (int, optional): ID to drop whatever its key
+        """
+        with IdResolver._lock:
+            ids = IdResolver._ids[storage_function]
+            if key is not None:
+                ids.pop(IdResolver._normalize(storage_function, key), None)
+            elif value is not None:
+                for memoized_key in [k for k, v in ids.items() if v == value]:
+                    del ids[memoized_key]
+            else:
+                ids.clear()
+
+    @staticmethod
+    def clear():
+        """drop all memoized IDs"""
+        with IdResolver._lock:
+            for ids in IdResolver._ids.values():
+                ids.clear()
+
+    @staticmethod
+    def _normalize(storage_function: str, key):
+        """use the hex public key for both the addresses and public keys of an account"""
+        # pylint: disable=import-outside-toplevel
+        from substrateinterface.utils.ss58 import ss58_decode
+
+        if storage_function != "TwinIdByAccountID":
+            return key
+        if isinstance(key, (bytes, bytearray)):
+            return f"0x{bytes(key).hex()}"
+        if key.startswith("0x"):
+            return key.lower()
+        return f"0x{ss58_decode(key)}"
@@ -0,0 +1,262 @@
+"""snapshot module"""
+
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import get_args, get_origin, get_type_hints
+
+SNAPSHOT_MAGIC = b"GRIDSNAP"
+SNAPSHOT_VERSION = 2
+# version of the entities fields, bumped when a snapshotted dataclass changes
+SNAPSHOT_SCHEMA_VERSION = 2
+
+# magic, version, schema version, block number, block hash, genesis hash, number of sections
+_HEADER = struct.Struct("<8sHHQ32s32sH")
+# name, number of entries, offset of the IDs, offset of the data
+_SECTION = struct.Struct("<16sQQQ")
+
+
+def write_snapshot(
+    path: str, block_number: int, block_hash: str, genesis_hash: str, sections: dict[str, MutableMapping]
+):
+    """write entities maps to a snapshot file, replaced atomically
+
+    The file starts with a header and a table of sections, every section has its sorted IDs, the end offsets
+    of the entries and the entries as JSON objects of their dataclass fields, so an entry is read without
+    loading the others.
+
+    Args:
+        path (str): snapshot file path
+        block_number (int): block number the entities are read at
+        block_hash (str): hex block hash
+        genesis_hash (str): hex genesis hash of the chain
+        sections (dict[str, MutableMapping]): dataclass entities by ID, by section name
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        offset = _HEADER.size + _SECTION.size * len(sections)
+        file.seek(offset)
+
+        table = []
+        for name, entities in sections.items():
+            ids = sorted(entities)
+            ids_offset = offset
+            data = [_encode_entity(entities[entity_id]) for entity_id in ids]
+
+            ends = []
+            end = 0
+            for entry in data:
+                end += len(entry)
+                ends.append(end)
+
+            file.write(struct.pack(f"<{len(ids)}Q", *ids))
+            file.write(struct.pack(f"<{len(ends)}Q", *ends))
+            data_offset = ids_offset + 16 * len(ids)
+            file.writelines(data)
+
+            offset = data_offset + end
+            table.append(_SECTION.pack(name.encode(), len(ids), ids_offset, data_offset))
+
+        file.seek(0)
+        file.write(
+            _HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                SNAPSHOT_SCHEMA_VERSION,
+                block_number,
+                _hash_bytes(block_hash),
+                _hash_bytes(genesis_hash),
+                len(sections),
+            )
+        )
+        file.writelines(table)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """memory mapped snapshot file
+
+        snapshot = Snapshot(path, {"nodes": Node})
+        nodes = snapshot.sections["nodes"]
+        node = nodes[node_id]
+
+    Opening a snapshot only maps the file, an entry is decoded from its JSON fields on its first access, as
+    the dataclass given for its section. A snapshot of another version or schema raises a ValueError.
+    """
+
+    def __init__(self, path: str, entity_types: dict[str, type]):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, schema_version, block_number, block_hash, genesis_hash, count = _HEADER.unpack_from(
+                self._mmap
+            )
+        except struct.error as exc:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a snapshot") from exc
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or schema_version != SNAPSHOT_SCHEMA_VERSION:
+            self._mmap.close()
+            raise ValueError(
+                f"{path} is not a snapshot of version {SNAPSHOT_VERSION} and schema {SNAPSHOT_SCHEMA_VERSION}"
+            )
+
+        self.block_number: int = block_number
+        self.block_hash = f"0x{block_hash.hex()}"
+        self.genesis_hash = f"0x{genesis_hash.hex()}"
+
+        view = memoryview(self._mmap)
+        self._view = view
+        self.sections: dict[str, SnapshotMap] = {}
+        for index in range(count):
+            name, entries, ids_offset, data_offset = _SECTION.unpack_from(
+                self._mmap, _HEADER.size + index * _SECTION.size
+            )
+            name = name.rstrip(b"\0").decode()
+            if name not in entity_types:
+                self.close()
+                raise ValueError(f"{path} has an unknown section {name}")
+            ids = view[ids_offset : ids_offset + 8 * entries].cast("Q")
+            ends = view[ids_offset + 8 * entries : data_offset].cast("Q")
+            self.sections[name] = SnapshotMap(view, ids, ends, data_offset, entity_types[name])
+
+    def close(self):
+        """unmap the file, the entries not accessed yet can not be read anymore"""
+        for section in self.sections.values():
+            section.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SnapshotMap(MutableMapping):
+    """entities of a snapshot section by ID, the changes are kept in memory over the mapped entries"""
+
+    def __init__(self, view: memoryview, ids: memoryview, ends: memoryview, data_offset: int, entity_type: type):
+        self._view = view
+        self._ids = ids
+        self._ends = ends
+        self._data_offset = data_offset
+        self._entity_type = entity_type
+        self._changed: dict = {}
+        self._deleted: set = set()
+
+    def __getitem__(self, entity_id: int):
+        if entity_id in self._changed:
+            return self._changed[entity_id]
+        if entity_id in self._deleted:
+            raise KeyError(entity_id)
+
+        index = self._index(entity_id)
+        if index is None:
+            raise KeyError(entity_id)
+
+        start = self._data_offset + (self._ends[index - 1] if index > 0 else 0)
+        end = self._data_offset + self._ends[index]
+        # copied out of the mapped file, a failed decode does not keep a view of it
+        entity = _decode_entity(self._entity_type, self._view[start:end].tobytes())
+        # decoded once
+        self._changed[entity_id] = entity
+        return entity
+
+    def __setitem__(self, entity_id: int, entity):
+        self._changed[entity_id] = entity
+        self._deleted.discard(entity_id)
+
+    def __delitem__(self, entity_id: int):
+        if entity_id not in self:
+            raise KeyError(entity_id)
+        self._changed.pop(entity_id, None)
+        if self._index(entity_id) is not None:
+            self._deleted.add(entity_id)
+
+    def __contains__(self, entity_id):
+        if entity_id in self._changed:
+            return True
+        return entity_id not in self._deleted and self._index(entity_id) is not None
+
+    def __iter__(self):
+        for entity_id in self._ids:
+            if entity_id not in self._deleted and entity_id not in self._changed:
+                yield entity_id
+        yield from self._changed
+
+    def __len__(self):
+        mapped_changed = sum(1 for entity_id in self._changed if self._index(entity_id) is not None)
+        return len(self._ids) - len(self._deleted) - mapped_changed + len(self._changed)
+
+    def release(self):
+        """release the views of the mapped file"""
+        self._ids.release()
+        self._ends.release()
+
+    def _index(self, entity_id):
+        """get the position of a mapped entry"""
+        if not isinstance(entity_id, int):
+            return None
+        index = bisect_left(self._ids, entity_id)
+        if index < len(self._ids) and self._ids[index] == entity_id:
+            return index
+        return None
+
+
+def _hash_bytes(block_hash: str):
+    """convert a hex hash to 32 bytes"""
+    return bytes.fromhex(block_hash[2:] if block_hash.startswith("0x") else block_hash)
+
+
+def _encode_entity(entity):
+    """encode a dataclass entity to a JSON object of its fields"""
+    return json.dumps(_to_plain(entity), separators=(",", ":")).encode()
+
+
+def _decode_entity(entity_type: type, data: bytes):
+    """decode a dataclass entity from the JSON object of its fields"""
+    return _from_plain(entity_type, json.loads(data))
+
+
+def _to_plain(value):
+    """convert the dataclasses of a value to dicts, bytes are written as hex like the chain values"""
+    if is_dataclass(value):
+        return {value_field.name: _to_plain(getattr(value, value_field.name)) for value_field in fields(value)}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, bytes):
+        return f"0x{value.hex()}"
+    return value
+
+
+def _from_plain(hint, value):
+    """rebuild the dataclasses of a value from the type hints of their fields"""
+    if value is None:
+        return None
+    if is_dataclass(hint):
+        hints = _field_hints(hint)
+        if set(value) != set(hints):
+            raise ValueError(f"snapshot entry does not match the fields of {hint.__name__}")
+        return hint(**{name: _from_plain(field_hint, value[name]) for name, field_hint in hints.items()})
+    if get_origin(hint) is list and len(get_args(hint)) == 1:
+        return [_from_plain(get_args(hint)[0], item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=None)
+def _field_hints(entity_type: type):
+    """get the type hints of the fields of a dataclass"""
+    hints = get_type_hints(entity_type)
+    return {entity_field.name: hints[entity_field.name] for entity_field in fields(entity_type)}
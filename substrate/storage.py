@@ -0,0 +1,312 @@
+"""storage module"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
+DEFAULT_CHUNK_SIZE = 256
+
+# length of the hash before the encoded key, by storage hasher keeping the key
+CONCAT_HASHER_LENGTHS = {"Blake2_128Concat": 16, "Twox64Concat": 8, "Identity": 0}
+
+
+def get_storage_function(substrate: SubstrateInterface, module: str, storage_function: str, block_hash: str = None):
+    """get the metadata of a storage function
+
+    Args:
+        substrate (SubstrateInterface): substrate instance
+        module (str): storage module name
+        storage_function (str): storage function name
+        block_hash (str, optional): block hash of the runtime to use
+
+    Raises:
+        StorageFunctionNotFound: storage function is not found in the metadata
+
+    Returns:
+        tuple: storage module metadata, storage function metadata
+    """
+    # pylint: disable=import-outside-toplevel
+    from substrateinterface.exceptions import StorageFunctionNotFound
+
+    substrate.init_runtime(block_hash=block_hash)
+
+    metadata_module = substrate.get_metadata_module(module, block_hash=block_hash)
+    storage_item = substrate.get_metadata_storage_function(module, storage_function, block_hash=block_hash)
+    if not metadata_module or not storage_item:
+        raise StorageFunctionNotFound(f'Storage function "{module}.{storage_function}" not found')
+
+    return metadata_module, storage_item
+
+
+def get_storage_key(
+    substrate: SubstrateInterface, module: str, storage_function: str, params: list = None, block_hash: str = None
+):
+    """get the storage key of a storage entry
+
+    Args:
+        substrate (SubstrateInterface): substrate instance
+        module (str): storage module name
+        storage_function (str): storage function name
+        params (list, optional): storage function params, a prefix of the map keys is allowed
+        block_hash (str, optional): block hash of the runtime to use
+
+    Returns:
+        str: hex storage key
+    """
+    metadata_module, storage_item = get_storage_function(substrate, module, storage_function, block_hash)
+    return storage_key_from_metadata(substrate, metadata_module, storage_item, params or [])
+
+
+def query_multi(
+    substrate: SubstrateInterface,
+    module: str,
+    storage_function: str,
+    params_list: list[list],
+    block_hash: str = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """query many entries of the same storage function with a request per chunk of keys
+
+    Args:
+        substrate (SubstrateInterface): substrate instance
+        module (str): storage module name
+        storage_function (str): storage function name
+        params_list (list[list]): params of every entry to query
+        block_hash (str, optional): block hash to query at, the chain head is used if not set
+        chunk_size (int, optional): maximum number of keys per request
+
+    Raises:
+        ValueError: chunk size is not valid
+        SubstrateRequestException: querying the storage failed
+
+    Returns:
+        list[ScaleType]: decoded entries in the order of params_list, None for missing optional entries
+    """
+    # pylint: disable=import-outside-toplevel
+    from substrate.pool import connection
+
+    if chunk_size <= 0:
+        raise ValueError(f"chunk size {chunk_size} is not valid")
+
+    with connection(substrate) as substrate:
+        if block_hash is None:
+            block_hash = substrate.get_chain_head()
+
+        metadata_module, storage_item = get_storage_function(substrate, module, storage_function, block_hash)
+        keys = [
+            storage_key_from_metadata(substrate, metadata_module, storage_item, list(params)) for params in params_list
+        ]
+
+        changes = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = list(dict.fromkeys(keys[start : start + chunk_size]))
+            changes.update(query_storage_at(substrate, chunk, block_hash))
+
+        return [decode_storage_value(substrate, storage_item, changes.get(key)) for key in keys]
+
+
+def query_storage_at(substrate: SubstrateInterface, keys: list[str], block_hash: str):
+    """get the raw values of storage keys in one request
+
+    Args:
+        substrate (SubstrateInterface): substrate instance
+        keys (list[str]): hex storage keys
+        block_hash (str): block hash to query at
+
+    Raises:
+        SubstrateRequestException: querying the storage failed
+
+    Returns:
+        dict[str, str]: hex values by storage key, None for missing keys
+    """
+    # pylint: disable=import-outside-toplevel
+    from substrateinterface.exceptions import SubstrateRequestException
+
+    if len(keys) == 0:
+        return {}
+
+    response = substrate.rpc_request("state_queryStorageAt", [keys, block_hash])
+    if "error" in response:
+        raise SubstrateRequestException(response["error"]["message"])
+
+    values = {}
+    for result_group in response["result"]:
+        for key, data in result_group["changes"]:
+            values[key] = data
+
+    return values
+
+
+def iter_map_pages(
+    substrate: SubstrateInterface,
+    module: str,
+    storage_function: str,
+    params: list = None,
+    page_size: int = 100,
+    start_key: str = None,
+    block_hash: str = None,
+    pin_head: bool = True,
+):
+    """iterate over the entries of a storage map one page at a time
+
+    Without a block hash the pages are read at the chain head of the first page, so the entries are the ones of a
+    single block. A node that prunes its state may drop that block during a long iteration, with `pin_head` set to
+    False every page is read at the chain head instead and entries changed meanwhile can be skipped or repeated.
+
+    Args:
+        substrate (SubstrateInterface): substrate instance
+        module (str): storage module name
+        storage_function (str): storage map name
+        params (list, optional): leading keys of a double map
+        page_size (int, optional): number of entries per page
+        start_key (str, optional): storage key to resume after
+        block_hash (str, optional): block hash to query at, the chain head is used if not set
+        pin_head (bool, optional): read all the pages at the chain head of the first page if block_hash is not set
+
+    Raises:
+        ValueError: page size is not valid
+        SubstrateRequestException: querying the storage failed
+
+    Yields:
+        list[tuple[str, ScaleType]]: storage keys and decoded values of a page
+    """
+    # pylint: disable=import-outside-toplevel
+    from substrateinterface.exceptions import SubstrateRequestException
+
+    from substrate.pool import connection
+
+    if page_size <= 0:
+        raise ValueError(f"page size {page_size} is not valid")
+
+    with connection(substrate) as conn:
+        if block_hash is None and pin_head:
+            block_hash = conn.get_chain_head()
+
+        metadata_module, storage_item = get_storage_function(conn, module, storage_function, block_hash)
+        prefix = storage_key_from_metadata(conn, metadata_module, storage_item, list(params or []))
+
+    last_key = start_key or prefix
+    while True:
+        # the connection is not held while the caller consumes the page
+        with connection(substrate) as conn:
+            page_hash = block_hash or conn.get_chain_head()
+
+            response = conn.rpc_request("state_getKeysPaged", [prefix, page_size, last_key, page_hash])
+            if "error" in response:
+                raise SubstrateRequestException(response["error"]["message"])
+
+            keys = response["result"]
+            if len(keys) == 0:
+                return
+
+            values = query_storage_at(conn, keys, page_hash)
+            page = [(key, decode_storage_value(conn, storage_item, values.get(key))) for key in keys]
+
+        yield page
+
+        if len(keys) < page_size:
+            return
+
+        last_key = keys[-1]
+
+
+def decode_storage_value(substrate: SubstrateInterface, storage_item, data: str, missing_as_option: bool = False):
+    """decode a raw storage value the same way `SubstrateInterface.query` does
+
+    Args:
+        substrate (SubstrateInterface): substrate instance
+        storage_item (StorageEntryMetadata): storage function metadata
+        data (str): hex value, None if the key is missing
+        missing_as_option (bool, optional): decode missing optional entries to an empty Option like `query`
+
+    Returns:
+        ScaleType: decoded value, None for missing optional entries
+    """
+    # pylint: disable=import-outside-toplevel
+    from scalecodec.base import ScaleBytes
+
+    value_scale_type = storage_item.get_value_type_string()
+
+    if data is None:
+        if storage_item.value["modifier"] != "Default":
+            if not missing_as_option:
+                return None
+            value_scale_type = f"Option<{value_scale_type}>"
+        data = storage_item.value_object["default"].value_object
+
+    obj = substrate.runtime_config.create_scale_object(
+        type_string=value_scale_type, data=ScaleBytes(data), metadata=substrate.metadata
+    )
+    obj.decode()
+    return obj
+
+
+def decode_map_key(substrate: SubstrateInterface, storage_item, key: str):
+    """decode the key of a storage map entry from its storage key, like the keys returned by `iter_map_pages`
+
+    Args:
+        substrate (SubstrateInterface): substrate instance with an initialized runtime
+        storage_item (StorageEntryMetadata): storage map metadata
+        key (str): hex storage key
+
+    Raises:
+        ValueError: the map hasher does not keep the key
+
+    Returns:
+        ScaleType: decoded first key of the map
+    """
+    # pylint: disable=import-outside-toplevel
+    from scalecodec.base import ScaleBytes
+
+    hasher = storage_item.get_param_hashers()[0]
+    if hasher not in CONCAT_HASHER_LENGTHS:
+        raise ValueError(f"storage hasher {hasher} does not keep the key")
+
+    # module and storage function prefixes, then the key hash
+    data = bytes.fromhex(key[2:] if key.startswith("0x") else key)[32 + CONCAT_HASHER_LENGTHS[hasher] :]
+    obj = substrate.runtime_config.create_scale_object(
+        type_string=storage_item.get_params_type_string()[0],
+        data=ScaleBytes(bytearray(data)),
+        metadata=substrate.metadata,
+    )
+    obj.decode(check_remaining=False)
+    return obj
+
+
+def storage_key_from_metadata(substrate: SubstrateInterface, metadata_module, storage_item, params: list):
+    """encode the params and hash them into a storage key without querying the runtime
+
+    Args:
+        substrate (SubstrateInterface): substrate instance with an initialized runtime
+        metadata_module (MetadataModule): storage module metadata
+        storage_item (StorageEntryMetadata): storage function metadata
+        params (list): storage function params, a prefix of the map keys is allowed
+
+    Returns:
+        str: hex storage key
+    """
+    # pylint: disable=import-outside-toplevel
+    from scalecodec.base import ScaleBytes
+
+    param_types = storage_item.get_params_type_string()
+    hashers = storage_item.get_param_hashers()
+
+    if len(params) > len(param_types):
+        raise ValueError(f"Storage function requires {len(param_types)} parameters, {len(params)} given")
+
+    encoded_params = []
+    for idx, param in enumerate(params):
+        if not isinstance(param, ScaleBytes):
+            param = substrate.convert_storage_parameter(param_types[idx], param)
+            param = substrate.runtime_config.create_scale_object(type_string=param_types[idx]).encode(param)
+        encoded_params.append(param)
+
+    return substrate.generate_storage_hash(
+        storage_module=metadata_module.value["storage"]["prefix"],
+        storage_function=storage_item.value["name"],
+        params=encoded_params,
+        hashers=hashers,
+    )
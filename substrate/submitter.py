@@ -0,0 +1,209 @@
+"""extrinsic submitter module"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from scalecodec.types import GenericCall
+from substrateinterface import ExtrinsicReceipt, SubstrateInterface
+from substrateinterface.exceptions import SubstrateRequestException
+
+from substrate.identity import Identity
+from substrate.metadata import open_connection
+from substrate.nonce import NonceManager
+
+
+class ExtrinsicSubmitter:
+    """submit extrinsics back to back without waiting for the inclusion of each one
+
+    Extrinsics are signed with nonces from the identity NonceManager, every submission returns a future
+    resolving with the ExtrinsicReceipt once the extrinsic is in a block (or finalized):
+
+        submitter = ExtrinsicSubmitter(substrate, identity)
+        futures = [submitter.submit(Contract.cancel_call(substrate, contract_id)) for contract_id in contract_ids]
+        receipts = [future.result() for future in futures]
+    """
+
+    def __init__(
+        self,
+        substrate: SubstrateInterface,
+        identity: Identity,
+        wait_for_finalization: bool = False,
+        poll_interval: float = 1,
+        timeout_blocks: int = 64,
+    ):
+        self.substrate = substrate
+        self.identity = identity
+        self.wait_for_finalization = wait_for_finalization
+        self.poll_interval = poll_interval
+        self.timeout_blocks = timeout_blocks
+
+        # guards the submissions and the pending extrinsics, future callbacks may resubmit
+        self._lock = threading.RLock()
+        self._nonce_manager = NonceManager.for_identity(identity)
+        self._last_block: int = None
+        self._pending: dict[str, tuple[Future, int]] = {}
+
+        self._stopped = threading.Event()
+        # the blocks are read on a dedicated connection, the submissions do not wait for them
+        self._watch_connection: SubstrateInterface = None
+        self._watcher: threading.Thread = None
+
+    def submit(self, call: GenericCall):
+        """sign and submit a call without waiting for its inclusion
+
+        Args:
+            call (GenericCall): composed call
+
+        Returns:
+            Future: resolves with the ExtrinsicReceipt, check its is_success for the dispatch result
+        """
+        future = Future()
+
+        with self._lock:
+            if self._stopped.is_set():
+                raise RuntimeError("extrinsic submitter is closed")
+
+            try:
+                if self._last_block is None:
+                    self._last_block = self._head(self.substrate)[1]
+
+                receipt = self._nonce_manager.submit(
+                    self.substrate, call, wait_for_inclusion=False, wait_for_finalization=False
+                )
+            except SubstrateRequestException as exp:
+                future.set_exception(exp)
+                return future
+
+            self._pending[receipt.extrinsic_hash] = (future, self._last_block)
+
+        self._start_watcher()
+        return future
+
+    def submit_many(self, calls: list[GenericCall]):
+        """sign and submit calls back to back
+
+        Args:
+            calls (list[GenericCall]): composed calls
+
+        Returns:
+            list[Future]: a future per call
+        """
+        return [self.submit(call) for call in calls]
+
+    def close(self, wait: bool = True):
+        """stop the submitter
+
+        Args:
+            wait (bool, optional): wait for the submitted extrinsics to be resolved
+        """
+        if not wait:
+            with self._lock:
+                for future, _ in self._pending.values():
+                    future.cancel()
+                self._pending.clear()
+
+        self._stopped.set()
+        if self._watcher is not None:
+            self._watcher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _start_watcher(self):
+        """start the thread watching new blocks for the submitted extrinsics"""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watch_connection = open_connection(self.substrate.url)
+            self._watcher = threading.Thread(target=self._watch, name="extrinsic-submitter", daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        """resolve the pending extrinsics from every new block until the submitter is closed"""
+        try:
+            while True:
+                with self._lock:
+                    if self._stopped.is_set() and len(self._pending) == 0:
+                        return
+
+                try:
+                    self._process_new_blocks(self._watch_connection)
+                except (SubstrateRequestException, ConnectionError, OSError):
+                    logging.exception("failed to process new blocks, retrying")
+
+                if self._stopped.is_set():
+                    # closed with extrinsics still pending, keep polling at the same pace until they are resolved
+                    time.sleep(self.poll_interval)
+                else:
+                    self._stopped.wait(self.poll_interval)
+        finally:
+            self._watch_connection.close()
+
+    def _head(self, substrate: SubstrateInterface):
+        """get the hash and number of the head block to watch"""
+        if self.wait_for_finalization:
+            block_hash = substrate.get_chain_finalised_head()
+        else:
+            block_hash = substrate.get_chain_head()
+
+        return block_hash, substrate.get_block_number(block_hash)
+
+    def _process_new_blocks(self, substrate: SubstrateInterface):
+        """look for the pending extrinsics in the blocks since the last processed one
+
+        The blocks are read without holding the lock, it is only taken to resolve the pending extrinsics.
+        """
+        head_hash, head_number = self._head(substrate)
+
+        for block_number in range(self._last_block + 1, head_number + 1):
+            block_hash = head_hash if block_number == head_number else substrate.get_block_hash(block_number)
+            block = substrate.get_block(block_hash=block_hash)
+
+            included = []
+            with self._lock:
+                for idx, extrinsic in enumerate(block["extrinsics"]):
+                    if extrinsic is None or not extrinsic.extrinsic_hash:
+                        continue
+
+                    extrinsic_hash = f"0x{extrinsic.extrinsic_hash.hex()}"
+                    pending = self._pending.pop(extrinsic_hash, None)
+                    if pending is not None:
+                        included.append((idx, extrinsic_hash, pending[0]))
+
+            for idx, extrinsic_hash, future in included:
+                receipt = ExtrinsicReceipt(
+                    substrate,
+                    extrinsic_hash,
+                    block_hash,
+                    block_number=block_number,
+                    extrinsic_idx=idx,
+                    finalized=self.wait_for_finalization,
+                )
+                # fetch the events now, then hand the receipt over to the submitter connection
+                _ = receipt.is_success
+                receipt.substrate = self.substrate
+                future.set_result(receipt)
+
+            with self._lock:
+                self._last_block = block_number
+
+        with self._lock:
+            timed_out = [
+                (extrinsic_hash, future)
+                for extrinsic_hash, (future, submitted_block) in self._pending.items()
+                if head_number - submitted_block > self.timeout_blocks
+            ]
+            for extrinsic_hash, _ in timed_out:
+                del self._pending[extrinsic_hash]
+            if len(timed_out) > 0:
+                self._nonce_manager.resync()
+
+        for extrinsic_hash, future in timed_out:
+            future.set_exception(
+                TimeoutError(f"extrinsic {extrinsic_hash} was not included in {self.timeout_blocks} blocks")
+            )
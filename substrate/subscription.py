@@ -0,0 +1,166 @@
+"""events subscription module"""
+
+import logging
+import threading
+from typing import Callable
+
+from substrateinterface import SubstrateInterface
+
+from substrate.event_records import EventRecords
+from substrate.events import Event
+from substrate.metadata import open_connection
+from substrate.pool import CONNECTION_ERRORS, connection
+from substrate.storage import get_storage_function
+
+
+class EventSubscription:
+    """push the decoded events of every finalized block to callbacks
+
+        def on_events(block_number: int, block_hash: str, records: EventRecords):
+            for event in records.SmartContractModule_NodeContractCanceled:
+                ...
+
+        with EventSubscription(substrate, twin_ids={twin_id}) as subscription:
+            subscription.add_callback(on_events)
+            subscription.start()
+
+    The finalized heads are received on a dedicated connection, the events are fetched through the given
+    substrate instance or connection pool. Blocks skipped by a finality jump are processed in order,
+    from start_block if it is set or from the first finalized head received.
+
+    A block that fails to be fetched or decoded is logged and fetched again with the next head, a lost head
+    subscription is reconnected. `is_running` is False once the subscription stopped, with the error that
+    stopped it in `error` if it was not closed.
+    """
+
+    def __init__(
+        self,
+        substrate: SubstrateInterface,
+        filters: list[tuple[str, str]] = None,
+        twin_ids: set[int] = None,
+        start_block: int = None,
+    ):
+        self.substrate = substrate
+        self.wanted = Event.wanted_events(filters)
+        self.twin_ids = set(twin_ids) if twin_ids is not None else None
+
+        self._callbacks: list[Callable] = []
+        self._events_key: str = None
+        self._last_block: int = start_block - 1 if start_block is not None else None
+        # error that stopped the subscription, None while it runs or once it is closed
+        self.error: Exception = None
+        self._stopped = threading.Event()
+        self._head_connection: SubstrateInterface = None
+        self._thread: threading.Thread = None
+
+    def add_callback(self, callback: Callable[[int, str, EventRecords], None]):
+        """register a callback called with the block number, block hash and event records of every matching block
+
+        Args:
+            callback (Callable[[int, str, EventRecords], None]): callback, called from the subscription thread
+        """
+        self._callbacks.append(callback)
+
+    def is_running(self):
+        """check if the subscription is receiving the finalized heads
+
+        Returns:
+            bool: False if it is not started, closed, or stopped by an error
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """start receiving the finalized heads in a thread"""
+        if self._thread is not None:
+            return
+
+        _, self._events_key = Event.events_storage(self.substrate)
+        self._head_connection = open_connection(self.substrate.url)
+        self._thread = threading.Thread(target=self._run, name="event-subscription", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """stop the subscription"""
+        self._stopped.set()
+        if self._head_connection is not None:
+            try:
+                # interrupts the subscription waiting for the next head
+                self._head_connection.close()
+            except CONNECTION_ERRORS:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _run(self):
+        """receive the finalized heads until the subscription is closed"""
+        while not self._stopped.is_set():
+            try:
+                self._head_connection.rpc_request("chain_subscribeFinalizedHeads", [], self._on_head)
+            except CONNECTION_ERRORS:
+                if self._stopped.is_set():
+                    return
+                logging.exception("event subscription lost the finalized heads subscription, reconnecting")
+            except Exception as exc:  # pylint: disable=broad-except
+                self.error = exc
+                logging.exception("event subscription stopped")
+                return
+
+            self._stopped.wait(1)
+            try:
+                self._head_connection.connect_websocket()
+            except CONNECTION_ERRORS:
+                logging.exception("failed to reconnect the event subscription")
+
+    def _on_head(self, message: dict, update_nr: int, subscription_id: str):
+        """process the blocks up to a new finalized head, a returned value ends the subscription"""
+        if self._stopped.is_set():
+            return True
+
+        head_number = int(message["params"]["result"]["number"], 16)
+        first_block = head_number if self._last_block is None else self._last_block + 1
+
+        for block_number in range(first_block, head_number + 1):
+            try:
+                block_hash, records = self._fetch(block_number)
+            except Exception:  # pylint: disable=broad-except
+                # the block is not marked as processed, it is fetched again with the next head
+                logging.exception("event subscription failed to fetch block %s", block_number)
+                if self._last_block is None:
+                    self._last_block = block_number - 1
+                return None
+            self._last_block = block_number
+
+            if records is None:
+                continue
+
+            for callback in self._callbacks:
+                try:
+                    callback(block_number, block_hash, records)
+                except Exception:  # pylint: disable=broad-except
+                    logging.exception("event subscription callback failed")
+
+        return None
+
+    def _fetch(self, block_number: int):
+        """fetch and decode the matching events of a block, the records are None if none matches"""
+        with connection(self.substrate) as conn:
+            block_hash = conn.get_block_hash(block_number)
+            # the checked out connection may be at another runtime, or not initialized yet
+            _, storage_item = get_storage_function(conn, "System", "Events", block_hash)
+            events = Event.get_block_events(conn, (storage_item, self._events_key), block_hash, self.wanted)
+
+        if len(events) == 0:
+            return block_hash, None
+
+        records = EventRecords.decode(events)
+        if self.twin_ids is not None:
+            records = records.filter_twins(self.twin_ids)
+            if len(records) == 0:
+                return block_hash, None
+        return block_hash, records
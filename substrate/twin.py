@@ -1,11 +1,20 @@
 """Twin module"""
+
+from __future__ import annotations
+
 from dataclasses import dataclass
-from substrateinterface import SubstrateInterface
+from typing import TYPE_CHECKING
 
+from substrate.event_records import EventRecords
 from substrate.exceptions import TwinCreationException, TwinUpdateException
 from .identity import Identity
+from .nonce import NonceManager
+from .resolver import IdResolver
 import ipaddress
 
+if TYPE_CHECKING:
+    from substrateinterface import SubstrateInterface
+
 
 @dataclass
 class TwinInfo:
@@ -33,9 +42,6 @@ class Twin:
             Twin_Info: the info for a twin
         """
         twin_id = self.get_twin_id_from_public_key(self.substrate, self.identity.public_key)
-        if twin_id.value is None:
-            raise ValueError("account with public key: " + self.identity.public_key + "has no twin")
-
         return self.get_from_id(self.substrate, twin_id)
 
     def create(self, ip: str):
@@ -58,13 +64,17 @@ class Twin:
 
         call = self.substrate.compose_call("TfgridModule", "create_twin", {"ip": ip})
 
-        extrinsic = self.substrate.create_signed_extrinsic(call, self.identity.key_pair)
-        call_response = self.substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(self.identity).submit(self.substrate, call)
 
         if not call_response.is_success:
             raise TwinCreationException(call_response.error_message)
 
-        twin_id = self.get().id
+        twins_stored = EventRecords.decode(call_response.triggered_events).TfgridModule_TwinStored
+        if len(twins_stored) == 0:
+            raise TwinCreationException("failed to get twin id after creation")
+
+        twin_id = twins_stored[-1].twin.id
+        IdResolver.set("TwinIdByAccountID", self.identity.public_key, twin_id)
         return twin_id
 
     def update(self, ip: str):
@@ -83,8 +93,7 @@ class Twin:
 
         call = self.substrate.compose_call("TfgridModule", "update_twin", {"ip": ip})
 
-        extrinsic = self.substrate.create_signed_extrinsic(call, self.identity.key_pair)
-        call_response = self.substrate.submit_extrinsic(extrinsic, True, True)
+        call_response = NonceManager.for_identity(self.identity).submit(self.substrate, call)
 
         if not call_response.is_success:
             raise TwinUpdateException(call_response.error_message)
@@ -107,13 +116,31 @@ class Twin:
         if twin.value is None:
             raise ValueError(f"twin with id {id} is not found")
 
-        version = twin["version"].value
-        twin_id = twin["id"].value
-        account_id = twin["account_id"].value
-        ip = twin["ip"].value
-        entities = twin["entities"].value
+        return Twin.decode(twin)
+
+    @staticmethod
+    def decode(twin):
+        """decode a twin storage entry
+
+        Args:
+            twin (ScaleType): twin storage entry
+
+        Returns:
+            Twin_Info: the info for a twin
+        """
+        return Twin.from_value(twin.value)
+
+    @staticmethod
+    def from_value(twin: dict):
+        """build a twin info from the plain value of a twin storage entry or event
 
-        return TwinInfo(version, twin_id, account_id, ip, entities)
+        Args:
+            twin (dict): twin storage entry value
+
+        Returns:
+            Twin_Info: the info for a twin
+        """
+        return TwinInfo(twin["version"], twin["id"], twin["account_id"], twin["ip"], twin["entities"])
 
     @staticmethod
     def get_twin_id_from_public_key(substrate: SubstrateInterface, public_key: bytes):
@@ -124,7 +151,7 @@ class Twin:
             substrate (SubstrateInterface): substrate client
         """
 
-        twin_id = substrate.query("TfgridModule", "TwinIdByAccountID", [public_key])
+        twin_id = IdResolver.resolve(substrate, "TwinIdByAccountID", public_key)
         if twin_id == 0:
             raise ValueError(f"twin with public key {public_key} is not found")
 
@@ -76,3 +76,14 @@ def test_get_balance_by_public_key():
     except Exception as exp:
         logging.exception(exp)
         assert False
+
+
+def test_get_many():
+    """test get the balances of many accounts at a single block"""
+
+    snapshot = account.Account.get_many(substrate, [ALICE_IDENTITY.public_key, ALICE_ADDRESS, bytes(32)], chunk_size=2)
+
+    assert snapshot.addresses[0] == ALICE_ADDRESS
+    assert len(snapshot) == 2
+    assert snapshot.get(ALICE_ADDRESS).free > 0
+    assert snapshot.free[1] == 0
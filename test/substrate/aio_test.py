@@ -0,0 +1,73 @@
+"""asyncio substrate testing"""
+
+import asyncio
+
+import pytest
+from substrateinterface.exceptions import SubstrateRequestException
+
+from substrate import aio
+from substrate.farm import Farm
+from substrate.node import Location, Node, OptionSerial, Resources
+from test.substrate.utils import get_substrate_url, start_local_connection, ALICE_IDENTITY, TEST_NAME, GIGABYTE
+
+substrate = start_local_connection()
+
+
+def test_concurrent_reads():
+    """test many concurrent reads over one websocket"""
+
+    farm_id = Farm.create(substrate, ALICE_IDENTITY, TEST_NAME, [])
+
+    async def read_farms():
+        async with await aio.AsyncSubstrate.connect(get_substrate_url()) as async_substrate:
+            return await asyncio.gather(*[aio.Farm.get(async_substrate, farm_id) for _ in range(100)])
+
+    farms = asyncio.run(read_farms())
+    assert all(farm.id == farm_id for farm in farms)
+
+
+def test_name_contract():
+    """test create and cancel a name contract"""
+
+    async def create_and_cancel():
+        async with await aio.AsyncSubstrate.connect(get_substrate_url()) as async_substrate:
+            contract_id = await aio.Contract.create_name_contract(async_substrate, ALICE_IDENTITY, TEST_NAME)
+            contract = await aio.Contract.get(async_substrate, contract_id)
+            await aio.Contract.cancel(async_substrate, ALICE_IDENTITY, contract_id)
+            return contract
+
+    contract = asyncio.run(create_and_cancel())
+    assert contract.contract_type.is_name_contract
+
+
+def test_request_error():
+    """test a failed request raises with the node error message"""
+
+    async def request():
+        async with await aio.AsyncSubstrate.connect(get_substrate_url()) as async_substrate:
+            await async_substrate.rpc_request("unknown_method", [])
+
+    with pytest.raises(SubstrateRequestException) as exp:
+        asyncio.run(request())
+
+    assert isinstance(exp.value.args[0], str)
+
+
+def test_node_contract_existing_hash():
+    """test creating a node contract with the hash of an existing one returns its ID"""
+
+    farm_id = Farm.create(substrate, ALICE_IDENTITY, TEST_NAME, [])
+    resources = Resources(hru=1024 * GIGABYTE, sru=100 * GIGABYTE, cru=8, mru=1024 * GIGABYTE)
+    location = Location(city="someCity", country="someCountry", latitude="51.049999", longitude="3.733333")
+    serial_number = OptionSerial(has_value=True, as_value="some_serial")
+    node_id = Node.create(substrate, ALICE_IDENTITY, farm_id, resources, location, [], False, False, serial_number)
+
+    async def create_twice():
+        async with await aio.AsyncSubstrate.connect(get_substrate_url()) as async_substrate:
+            contract_id = await aio.Contract.create_node_contract(async_substrate, ALICE_IDENTITY, node_id, "", "", 0)
+            existing_id = await aio.Contract.create_node_contract(async_substrate, ALICE_IDENTITY, node_id, "", "", 0)
+            await aio.Contract.cancel(async_substrate, ALICE_IDENTITY, contract_id)
+            return contract_id, existing_id
+
+    contract_id, existing_id = asyncio.run(create_twice())
+    assert existing_id == contract_id
@@ -0,0 +1,69 @@
+"""balance watcher testing"""
+
+import threading
+
+from substrate.account import Account
+from substrate.balance_watcher import BalanceChange, BalanceWatcher
+from substrate.contract import Contract
+from test.substrate.utils import start_local_connection, ALICE_IDENTITY, TEST_NAME
+
+substrate = start_local_connection()
+
+
+def test_initial_values():
+    """test the watched accounts match the chain once subscribed"""
+
+    received = threading.Event()
+
+    with BalanceWatcher(substrate, [ALICE_IDENTITY.public_key]) as watcher:
+        watcher.add_callback(lambda change: received.set())
+        watcher.start()
+        received.wait(timeout=60)
+
+        account_info = watcher.get(ALICE_IDENTITY.public_key)
+
+    assert account_info == Account.get_from_public_key(substrate, ALICE_IDENTITY.public_key)
+
+
+def test_balance_change():
+    """test the fees of an extrinsic are received as a change"""
+
+    changes: list[BalanceChange] = []
+    changed = threading.Event()
+
+    def on_change(change: BalanceChange):
+        changes.append(change)
+        if change.previous is not None:
+            changed.set()
+
+    with BalanceWatcher(substrate, [ALICE_IDENTITY.public_key]) as watcher:
+        watcher.add_callback(on_change)
+        watcher.start()
+
+        contract_id = Contract.create_name_contract(substrate, ALICE_IDENTITY, f"{TEST_NAME}_balance_watcher")
+        changed.wait(timeout=60)
+
+    Contract.cancel(substrate, ALICE_IDENTITY, contract_id)
+
+    assert changes[-1].current.balance.free < changes[0].current.balance.free
+
+
+def test_threshold_initial_value():
+    """test an account already below the threshold is only reported when asked for"""
+
+    received = threading.Event()
+    below: list[BalanceChange] = []
+    initially_below: list[BalanceChange] = []
+
+    # the free balance of alice is below any threshold over it
+    threshold = Account.get_from_public_key(substrate, ALICE_IDENTITY.public_key).balance.free * 2
+
+    with BalanceWatcher(substrate, [ALICE_IDENTITY.public_key]) as watcher:
+        watcher.add_threshold_callback(threshold, below.append)
+        watcher.add_threshold_callback(threshold, initially_below.append, notify_initial=True)
+        watcher.add_callback(lambda change: received.set())
+        watcher.start()
+        received.wait(timeout=60)
+
+    assert len(below) == 0
+    assert len(initially_below) == 1
@@ -0,0 +1,56 @@
+"""bridge index testing"""
+
+import os
+import tempfile
+
+from substrate.bridge import MintTransaction
+from substrate.bridge_index import BridgeIndex
+from substrate.event_records import EventRecords, MintCompleted
+from test.substrate.utils import start_local_connection
+
+substrate = start_local_connection()
+
+
+def test_bootstrap():
+    """test the indexed transactions match the chain"""
+
+    index = BridgeIndex(substrate)
+    index.bootstrap()
+
+    for tx_id in index.minted:
+        assert MintTransaction.is_minted_already(substrate, tx_id)
+    assert not index.is_minted("bridge_index_test_id")
+    assert not index.is_refunded("bridge_index_test_hash")
+
+    index.sync()
+
+
+def test_save_load():
+    """test an index is restarted from its file"""
+
+    index = BridgeIndex(substrate)
+    index.bootstrap()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bridge_index.json")
+        index.save(path)
+        loaded = BridgeIndex.load(substrate, path)
+
+    assert loaded.minted == index.minted
+    assert loaded.refunded == index.refunded
+    assert loaded.block_number == index.block_number
+
+
+def test_mint_completed_without_tx_id():
+    """test a mint completed event of an older runtime reads the executed mints again"""
+
+    index = BridgeIndex(substrate)
+    index.bootstrap()
+    minted = set(index.minted)
+    index.minted.clear()
+
+    records = EventRecords()
+    records.TFTBridgeModule_MintCompleted = [MintCompleted(None, None, 1, "", [])]
+    index.apply(index.block_number + 1, index.block_hash, records)
+
+    assert index.minted == minted
@@ -2,7 +2,14 @@
 
 import logging
 import pytest
-from substrate.bridge import MintTransaction, RefundTransaction
+from substrate.bridge import (
+    BRIDGE_TX_NEW,
+    BridgeBatchProcessor,
+    MintRequest,
+    MintTransaction,
+    RefundRequest,
+    RefundTransaction,
+)
 from substrate.exceptions import (
     ProposeOrVoteMintTransactionException,
     RefundTransactionCreationOrAddingSigException,
@@ -41,3 +48,26 @@ def test_mint_transactions():
         MintTransaction.propose_or_vote_mint_transaction(substrate, ALICE_IDENTITY, "test_id", ALICE_ADDRESS, 1)
 
     assert not MintTransaction.is_minted_already(substrate, "test_id")
+
+
+def test_batch_processor():
+    """test the statuses and batched calls of a window of bridge transactions"""
+
+    processor = BridgeBatchProcessor(substrate, ALICE_IDENTITY, max_batch_size=2)
+
+    tx_ids = [f"batch_test_id_{i}" for i in range(3)]
+    assert processor.mint_statuses(tx_ids + tx_ids[:1]) == dict.fromkeys(tx_ids, BRIDGE_TX_NEW)
+    assert processor.refund_statuses(tx_ids) == dict.fromkeys(tx_ids, BRIDGE_TX_NEW)
+
+    with pytest.raises(ValueError):
+        processor.refund_statuses(["x" * 33])
+
+    # ValidatorNotExists, the calls fail one by one
+    result = processor.process_mints([MintRequest(tx_id, ALICE_ADDRESS, 1) for tx_id in tx_ids])
+    assert list(result.call_results) == tx_ids
+    assert not any(call_result.is_success for call_result in result.call_results.values())
+    # indexes of the submitted calls, across the two batches
+    assert [call_result.index for call_result in result.call_results.values()] == [0, 1, 2]
+
+    result = processor.process_refunds([RefundRequest(tx_id, "", 1, "", "", 0) for tx_id in tx_ids])
+    assert list(result.call_results) == tx_ids
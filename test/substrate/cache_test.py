@@ -0,0 +1,36 @@
+"""storage cache testing"""
+
+from substrate.cache import StorageCache
+from substrate.farm import Farm
+from substrate.twin import Twin
+from test.substrate.utils import start_local_connection
+
+substrate = start_local_connection()
+
+
+def test_cached_reads():
+    """test reading the same farm and twin again is served from the cache"""
+
+    cache = StorageCache(substrate)
+
+    farm = Farm.get(cache, 1)
+    twin = Twin.get_from_id(cache, farm.twin_id)
+    assert cache.misses == 2
+
+    assert Farm.get(cache, 1) == farm
+    assert Twin.get_from_id(cache, farm.twin_id) == twin
+    assert cache.hits == 2
+
+
+def test_advance_cache():
+    """test the cached entries are kept on a new finalized head if they did not change"""
+
+    cache = StorageCache(substrate)
+    farm = Farm.get(cache, 1)
+
+    cache.advance(substrate.get_chain_finalised_head())
+    assert Farm.get(cache, 1) == farm
+
+    cache.invalidate("TfgridModule", "Farms", [1])
+    Farm.get(cache, 1)
+    assert cache.misses == 2
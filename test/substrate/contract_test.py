@@ -117,3 +117,35 @@ def test_rent_contract():
 
     assert rent_contract_id == contract_id
     assert created_contract.contract_type.is_rent_contract
+
+
+def test_cancel_batch():
+    """test canceling many contracts in a single batch extrinsic"""
+
+    names = [f"{TEST_NAME}_batch_{i}" for i in range(3)]
+    contract_ids = [Contract.create_name_contract(substrate, ALICE_IDENTITY, name) for name in names]
+
+    call_results = Contract.cancel_batch(substrate, ALICE_IDENTITY, contract_ids)
+    assert [res.is_success for res in call_results] == [True] * len(contract_ids)
+
+    # every call has its own cancellation events, the fee withdrawal is not part of the first call
+    assert all(event.value["event_id"] != "Withdraw" for event in call_results[0].events)
+    for res in call_results:
+        assert any(event.value["module_id"] == "SmartContractModule" for event in res.events)
+
+    for contract_id in contract_ids:
+        try:
+            Contract.get(substrate, contract_id)
+            assert False, f"contract {contract_id} is not canceled"
+        except ValueError:
+            pass
+
+
+def test_cancel_batch_partial_failure():
+    """test a failed cancellation is reported in its result while the others are canceled"""
+
+    contract_id = Contract.create_name_contract(substrate, ALICE_IDENTITY, f"{TEST_NAME}_batch_partial")
+
+    # the second cancellation fails, the contract is already canceled
+    call_results = Contract.cancel_batch(substrate, ALICE_IDENTITY, [contract_id, contract_id])
+    assert [res.is_success for res in call_results] == [True, False]
@@ -0,0 +1,31 @@
+"""events testing"""
+
+from substrate.contract import Contract
+from substrate.events import Event
+from substrate.pool import ConnectionPool
+from test.substrate.utils import get_substrate_url, ALICE_IDENTITY, TEST_NAME
+
+pool = ConnectionPool(get_substrate_url(), size=4)
+
+
+def test_scan_contract_events():
+    """test scanning the blocks of a name contract creation and cancellation"""
+
+    start_block = pool.get_block_number(pool.get_chain_head())
+
+    name = f"{TEST_NAME}_scan"
+    contract_id = Contract.create_name_contract(pool, ALICE_IDENTITY, name)
+    Contract.cancel(pool, ALICE_IDENTITY, contract_id)
+
+    end_block = pool.get_block_number(pool.get_chain_head())
+
+    filters = [("SmartContractModule", "ContractCreated"), ("SmartContractModule", "NameContractCanceled")]
+    scanned = list(Event.scan(pool, start_block, end_block, filters))
+
+    block_numbers = [block_number for block_number, _, _ in scanned]
+    assert block_numbers == sorted(block_numbers)
+
+    created = [e.contract.contract_id for _, _, records in scanned for e in records.SmartContractModule_ContractCreated]
+    canceled = [e.contract_id for _, _, records in scanned for e in records.SmartContractModule_NameContractCanceled]
+    assert contract_id in created
+    assert contract_id in canceled
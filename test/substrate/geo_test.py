@@ -0,0 +1,56 @@
+"""geo index testing"""
+
+from substrate.event_records import EventRecords, NodeDeleted
+from substrate.geo import GeoIndex
+from substrate.node_table import NodeTable
+from test.substrate.utils import start_local_connection
+
+substrate = start_local_connection()
+
+
+def test_nearest():
+    """test the nearest node of a node location is the node itself"""
+
+    table = NodeTable.from_chain(substrate)
+    index = GeoIndex.from_table(table)
+    if len(index) == 0:
+        return
+
+    row = next(row for row in range(len(table)) if table.columns["id"][row] in index)
+    latitude, longitude = table.columns["latitude"][row], table.columns["longitude"][row]
+
+    nearest = index.nearest(latitude, longitude, k=1)
+    assert nearest[0][1] == 0
+    assert table.columns["id"][row] in [node_id for node_id, _ in index.within_radius(latitude, longitude, 1)]
+
+
+def test_update():
+    """test moving and removing a node"""
+
+    index = GeoIndex()
+    index.update(1, "50.85", "4.35")
+    index.update(2, "30.04", "31.23")
+    assert [node_id for node_id, _ in index.nearest(50, 4, k=2)] == [1, 2]
+
+    index.update(1, "-33.92", "18.42")
+    assert [node_id for node_id, _ in index.nearest(50, 4, k=2)] == [2, 1]
+
+    index.update(2, "", "")
+    assert 2 not in index
+    assert index.within_radius(30.04, 31.23, 100) == []
+
+
+def test_apply_node_deleted():
+    """test a deleted node is removed from the index"""
+
+    index = GeoIndex()
+    index.update(1, "50.85", "4.35")
+    index.update(2, "50.88", "4.70")
+
+    records = EventRecords()
+    records.TfgridModule_NodeDeleted = [NodeDeleted(None, 1, [])]
+    index.apply(records)
+
+    assert 1 not in index
+    assert [node_id for node_id, _ in index.nearest(50.85, 4.35, k=2)] == [2]
+    assert [node_id for node_id, _ in index.within_radius(50.85, 4.35, 100)] == [2]
@@ -0,0 +1,75 @@
+"""import time testing"""
+
+import subprocess
+import sys
+
+import pytest
+
+# import time budget of the manager module, in seconds
+IMPORT_TIME_BUDGET = 0.05
+
+# import time budget of the model modules, they define their dataclasses and the event records ones
+MODEL_IMPORT_TIME_BUDGET = 0.1
+
+MODEL_MODULES = ["substrate.twin", "substrate.node", "substrate.farm", "substrate.contract", "substrate.account"]
+
+IMPORT_SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+
+print(elapsed, "substrateinterface" in sys.modules, "requests" in sys.modules)
+"""
+
+
+def run_import_script(module: str = "substrate.manager"):
+    """import a module in a new interpreter"""
+    script = IMPORT_SCRIPT.format(module=module)
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, check=True, text=True).stdout
+    elapsed, substrate_interface, requests = output.split()
+    return float(elapsed), substrate_interface == "True", requests == "True"
+
+
+def test_manager_import_is_lazy():
+    """test importing the manager module does not import the heavy dependencies"""
+
+    _, substrate_interface, requests = run_import_script()
+    assert not substrate_interface
+    assert not requests
+
+
+def test_manager_import_time():
+    """test importing the manager module stays under its budget, the best of a few runs"""
+
+    elapsed = min(run_import_script()[0] for _ in range(3))
+    assert elapsed < IMPORT_TIME_BUDGET
+
+
+@pytest.mark.parametrize("module", MODEL_MODULES)
+def test_model_import_is_lazy(module: str):
+    """test importing a model module does not import the heavy dependencies"""
+
+    _, substrate_interface, requests = run_import_script(module)
+    assert not substrate_interface
+    assert not requests
+
+
+@pytest.mark.parametrize("module", ["substrate.twin", "substrate.node"])
+def test_model_import_time(module: str):
+    """test importing a model module stays under its budget, the best of a few runs"""
+
+    elapsed = min(run_import_script(module)[0] for _ in range(3))
+    assert elapsed < MODEL_IMPORT_TIME_BUDGET
+
+
+def test_lazy_attributes():
+    """test the package exposes its classes lazily"""
+
+    import substrate  # pylint: disable=import-outside-toplevel
+    from substrate.twin import Twin  # pylint: disable=import-outside-toplevel
+
+    assert substrate.Twin is Twin
+    assert "Manager" in dir(substrate)
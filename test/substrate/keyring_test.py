@@ -0,0 +1,31 @@
+"""keyring testing"""
+
+from substrate.identity import Identity
+from substrate.keyring import Keyring
+from test.substrate.utils import ALICE_MNEMONICS, ALICE_ADDRESS
+
+
+def test_cached_identity():
+    """test an identity is derived once per phrase"""
+
+    keyring = Keyring()
+
+    identity = keyring.from_phrase(ALICE_MNEMONICS)
+    assert identity.address == ALICE_ADDRESS
+    assert keyring.from_phrase(ALICE_MNEMONICS) is identity
+    assert keyring.hits == 1 and keyring.misses == 1
+
+
+def test_derive_many():
+    """test the derived identities match the identities of their URIs"""
+
+    keyring = Keyring(max_size=100)
+
+    identities = keyring.derive_many(ALICE_MNEMONICS, 80, processes=2)
+    assert len(identities) == 80
+    assert identities[5].address == Identity.generate_from_sr25519_phrase(f"{ALICE_MNEMONICS}//5").address
+    assert keyring.from_sr25519_phrase(f"{ALICE_MNEMONICS}//5") is identities[5]
+
+    identities = keyring.derive_many(ALICE_MNEMONICS, 40, start=60)
+    assert identities[0] is keyring.from_sr25519_phrase(f"{ALICE_MNEMONICS}//60")
+    assert len(keyring) == 100
@@ -0,0 +1,23 @@
+"""metadata cache testing"""
+
+import os
+
+from substrate.metadata import MetadataCache, open_connection
+from test.substrate.utils import get_substrate_url
+
+
+def test_metadata_cache(tmp_path):
+    """test a new connection reads the metadata cached by a previous one"""
+
+    substrate = open_connection(get_substrate_url(), str(tmp_path))
+    substrate.init_runtime()
+    genesis_hash = substrate.get_block_hash(0)
+    assert os.path.exists(tmp_path / genesis_hash / f"{substrate.runtime_version}.scale")
+
+    MetadataCache._decoded.clear()
+    cached = open_connection(get_substrate_url(), str(tmp_path))
+    metadata = cached.cache_region.get(f"METADATA_{substrate.runtime_version}")
+    assert metadata is not None
+
+    cached.init_runtime()
+    assert cached.get_metadata_storage_function("TfgridModule", "Nodes") is not None
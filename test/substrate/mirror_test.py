@@ -0,0 +1,64 @@
+"""grid mirror testing"""
+
+from substrate.contract import Contract
+from substrate.farm import Farm, PublicIP
+from substrate.mirror import GridMirror
+from substrate.node import Location, Node, OptionSerial, Resources
+from test.substrate.utils import start_local_connection, ALICE_IDENTITY, TEST_NAME, GIGABYTE
+
+substrate = start_local_connection()
+
+
+def test_bootstrap():
+    """test the mirrored entities match the chain"""
+
+    mirror = GridMirror(substrate)
+    mirror.bootstrap()
+
+    farm_id = next(iter(mirror.farms))
+    assert mirror.get_farm(farm_id) == Farm.get(substrate, farm_id)
+
+    node_id = next(iter(mirror.nodes))
+    assert mirror.get_node(node_id) == Node.get(substrate, node_id)
+
+
+def test_sync():
+    """test a name contract created and canceled after the bootstrap is mirrored"""
+
+    mirror = GridMirror(substrate)
+    mirror.bootstrap()
+
+    contract_id = Contract.create_name_contract(substrate, ALICE_IDENTITY, f"{TEST_NAME}_mirror")
+    mirror.sync()
+    assert mirror.get_contract(contract_id).contract_id == contract_id
+
+    Contract.cancel(substrate, ALICE_IDENTITY, contract_id)
+    mirror.sync()
+    assert contract_id not in mirror.contracts
+
+
+def test_sync_public_ips():
+    """test the public IPs reserved and freed by a node contract are mirrored in its farm and contract"""
+
+    mirror = GridMirror(substrate)
+    mirror.bootstrap()
+
+    farm_id = Farm.create(
+        substrate, ALICE_IDENTITY, f"{TEST_NAME}_mirror_ips", [PublicIP(ip="2.2.2.2/24", gw="2.2.2.1", contract_id=0)]
+    )
+    resources = Resources(hru=1024 * GIGABYTE, sru=100 * GIGABYTE, cru=8, mru=1024 * GIGABYTE)
+    location = Location(city="someCity", country="someCountry", latitude="51.049999", longitude="3.733333")
+    serial_number = OptionSerial(has_value=True, as_value="some_serial")
+    node_id = Node.create(substrate, ALICE_IDENTITY, farm_id, resources, location, [], False, False, serial_number)
+
+    # reserve the farm public IP
+    contract_id = Contract.create_node_contract(substrate, ALICE_IDENTITY, node_id, "", "", 1)
+    mirror.sync()
+    assert mirror.get_farm(farm_id) == Farm.get(substrate, farm_id)
+    assert mirror.get_contract(contract_id) == Contract.get(substrate, contract_id)
+
+    # free the farm public IP
+    Contract.cancel(substrate, ALICE_IDENTITY, contract_id)
+    mirror.sync()
+    assert mirror.get_farm(farm_id) == Farm.get(substrate, farm_id)
+    assert contract_id not in mirror.contracts
@@ -0,0 +1,36 @@
+"""node table testing"""
+
+from substrate.node import Node
+from substrate.node_table import NodeTable
+from test.substrate.utils import start_local_connection
+
+substrate = start_local_connection()
+
+
+def test_from_chain():
+    """test the columns of a node table match the nodes of the chain"""
+
+    table = NodeTable.from_chain(substrate)
+    assert len(table) > 0
+
+    node_id = table.columns["id"][0]
+    node = Node.get(substrate, node_id)
+    assert table[node_id] == node
+
+    row = table.row_of(node_id)
+    assert table.columns["farm_id"][row] == node.farm_id
+    assert table.columns["cru"][row] == node.resources.cru
+    assert table.country_of(row) == node.location.country
+
+
+def test_remove():
+    """test removing a node keeps the rows of the other nodes"""
+
+    table = NodeTable.from_chain(substrate)
+    node_ids = list(table.columns["id"])
+
+    table.remove(node_ids[0])
+    assert node_ids[0] not in table
+    assert len(table) == len(node_ids) - 1
+    for node_id in node_ids[1:]:
+        assert table.columns["id"][table.row_of(node_id)] == node_id
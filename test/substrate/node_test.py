@@ -121,3 +121,62 @@ def test_get_node_by_id():
     assert node.id == test_node_id
     assert node.twin_id == test_twin_id
     assert node.farm_id == test_farm_id
+
+
+def test_get_many_nodes():
+    """test get many nodes by IDs"""
+
+    missing_node_id = Node.get_last_node_id(substrate) + 1
+
+    nodes, missing_ids = Node.get_many(substrate, [test_node_id, missing_node_id, test_node_id], chunk_size=2)
+    assert len(nodes) == 3
+    assert nodes[0].id == test_node_id
+    assert nodes[1] is None
+    assert nodes[2].id == test_node_id
+    assert missing_ids == [missing_node_id]
+
+
+def test_iter_all_nodes():
+    """test iterate over all nodes and resume from a cursor"""
+
+    cursor = None
+    node_ids = []
+    for key, node in Node.iter_all(substrate, page_size=2):
+        node_ids.append(node.id)
+        cursor = key
+        if len(node_ids) == 2:
+            break
+
+    resumed_ids = [node.id for _, node in Node.iter_all(substrate, page_size=2, start_key=cursor)]
+
+    assert not set(node_ids) & set(resumed_ids)
+    assert test_node_id in node_ids + resumed_ids
+
+
+def test_iter_all_single_block():
+    """test the nodes created while iterating are not returned, all the pages are read at the first chain head"""
+
+    resources = Resources(hru=1024 * GIGABYTE, sru=100 * GIGABYTE, cru=8, mru=1024 * GIGABYTE)
+    location = Location(city="someCity", country="someCountry", latitude="51.049999", longitude="3.733333")
+    serial_number = OptionSerial(has_value=True, as_value="some_serial")
+
+    nodes = Node.iter_all(substrate, page_size=1)
+    node_ids = [next(nodes)[1].id]
+
+    created_node_id = Node.create(
+        substrate, ALICE_IDENTITY, test_farm_id, resources, location, [], False, False, serial_number
+    )
+    node_ids.extend(node.id for _, node in nodes)
+
+    assert created_node_id not in node_ids
+    assert test_node_id in node_ids
+
+
+def test_from_value():
+    """test building a node from the plain storage value"""
+
+    entry = substrate.query("TfgridModule", "Nodes", [test_node_id])
+    node = Node.from_value(entry.value)
+
+    assert node == Node.get(substrate, test_node_id)
+    assert all(isinstance(interface.name, str) for interface in node.interfaces)
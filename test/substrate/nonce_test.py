@@ -0,0 +1,59 @@
+"""nonce manager testing"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from substrate.contract import Contract
+from substrate.nonce import NonceManager
+from substrate.pool import ConnectionPool
+from test.substrate.utils import get_substrate_url, ALICE_IDENTITY, TEST_NAME
+
+pool = ConnectionPool(get_substrate_url(), size=4)
+
+
+def test_concurrent_name_contracts():
+    """test creating and canceling name contracts from many threads with the same identity"""
+
+    names = [f"{TEST_NAME}_nonce_{i}" for i in range(4)]
+
+    with ThreadPoolExecutor(len(names)) as executor:
+        list(executor.map(lambda name: Contract.create_name_contract(pool, ALICE_IDENTITY, name), names))
+
+    contract_ids = [Contract.get_contract_id_by_name_registration(pool, name) for name in names]
+
+    with ThreadPoolExecutor(len(contract_ids)) as executor:
+        list(executor.map(lambda contract_id: Contract.cancel(pool, ALICE_IDENTITY, contract_id), contract_ids))
+
+
+def test_resync_nonce():
+    """test the nonce is fetched again from the chain after a resync"""
+
+    nonce_manager = NonceManager.for_identity(ALICE_IDENTITY)
+    assert nonce_manager is NonceManager.for_identity(ALICE_IDENTITY)
+
+    nonce_manager.resync()
+    nonce = nonce_manager.next(pool)
+    assert nonce_manager.next(pool) == nonce + 1
+
+    nonce_manager.resync()
+    assert nonce_manager.next(pool) == nonce
+
+    # the allocated nonces were not used
+    nonce_manager.resync()
+
+
+def test_outside_transaction():
+    """test a managed submission succeeds after a transaction of the same account sent outside the manager"""
+
+    contract_id = Contract.create_name_contract(pool, ALICE_IDENTITY, f"{TEST_NAME}_nonce_outside")
+
+    # signed with the nonce read from the chain, the manager local nonce is now used
+    with pool.connection() as conn:
+        call = Contract.create_name_contract_call(conn, f"{TEST_NAME}_nonce_outside_2")
+        extrinsic = conn.create_signed_extrinsic(call, ALICE_IDENTITY.key_pair)
+        receipt = conn.submit_extrinsic(extrinsic, wait_for_inclusion=True)
+        assert receipt.is_success
+
+    Contract.cancel(pool, ALICE_IDENTITY, contract_id)
+    Contract.cancel(
+        pool, ALICE_IDENTITY, Contract.get_contract_id_by_name_registration(pool, f"{TEST_NAME}_nonce_outside_2")
+    )
@@ -0,0 +1,33 @@
+"""placement testing"""
+
+from substrate.node import Node
+from substrate.placement import Placement, PlacementQuery
+from test.substrate.utils import start_local_connection
+
+substrate = start_local_connection()
+
+
+def test_query():
+    """test the nodes of a placement query match its filters"""
+
+    placement = Placement.from_chain(substrate)
+    assert len(placement.table) > 0
+
+    node_ids = placement.query(PlacementQuery(cru=1, certified=False), k=5)
+    assert 0 < len(node_ids) <= 5
+
+    for node_id in node_ids:
+        node = Node.get(substrate, node_id)
+        assert node.resources.cru >= 1
+        assert not node.certification.is_certified
+
+
+def test_query_farm():
+    """test a placement query on a single farm"""
+
+    placement = Placement.from_chain(substrate)
+    farm_id = placement.table.columns["farm_id"][0]
+
+    node_ids = placement.query(PlacementQuery(farm_ids={farm_id}), k=len(placement.table))
+    assert len(node_ids) > 0
+    assert all(Node.get(substrate, node_id).farm_id == farm_id for node_id in node_ids)
@@ -0,0 +1,62 @@
+"""connection pool testing"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from substrate.farm import Farm
+from substrate.node import Node
+from substrate.pool import ConnectionPool
+from substrate.storage import query_multi
+from test.substrate.utils import get_substrate_url, ALICE_IDENTITY, TEST_NAME
+
+pool = ConnectionPool(get_substrate_url(), size=4)
+
+
+def test_pool_concurrent_reads():
+    """test concurrent reads from many threads through the pool"""
+
+    farm_id = Farm.create(pool, ALICE_IDENTITY, TEST_NAME, [])
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        farms = list(executor.map(lambda _: Farm.get(pool, farm_id), range(32)))
+
+    assert all(farm.id == farm_id for farm in farms)
+
+
+def test_pool_connection_checkout():
+    """test a checked out connection is reused by nested checkouts"""
+
+    with pool.connection() as conn:
+        with pool.connection() as nested_conn:
+            assert conn is nested_conn
+
+        assert Node.get_last_node_id(conn) != 0
+
+
+def test_pool_decode_on_new_connection():
+    """test raw storage is decoded on a connection opened after the first one"""
+
+    fresh_pool = ConnectionPool(get_substrate_url(), size=2)
+    with fresh_pool.connection():
+        # the first connection is held, the second one is opened for this thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            farms = executor.submit(
+                lambda: query_multi(fresh_pool, "TfgridModule", "Farms", [[1]]),
+            ).result()
+    fresh_pool.close()
+
+    assert farms[0].value["id"] == 1
+
+
+def test_pool_connection_state():
+    """test the connection state is only read on a checked out connection"""
+
+    try:
+        _ = pool.metadata
+        assert False, "the metadata is read outside a checkout"
+    except AttributeError:
+        pass
+
+    with pool.connection() as conn:
+        assert pool.metadata is conn.metadata
+
+    assert pool.url == get_substrate_url()
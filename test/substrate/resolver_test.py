@@ -0,0 +1,29 @@
+"""id resolver testing"""
+
+from substrate.contract import Contract
+from substrate.resolver import IdResolver
+from substrate.twin import Twin
+from test.substrate.utils import start_local_connection, ALICE_ADDRESS, ALICE_IDENTITY, TEST_NAME
+
+substrate = start_local_connection()
+
+
+def test_resolve_twin_id():
+    """test the twin ID of an account is memoized for both its address and public key"""
+
+    IdResolver.clear()
+
+    twin_id = Twin.get_twin_id_from_public_key(substrate, ALICE_ADDRESS)
+    assert IdResolver.get("TwinIdByAccountID", ALICE_IDENTITY.public_key) == twin_id
+
+
+def test_name_contract_mapping():
+    """test creating and canceling a name contract updates its memoized ID"""
+
+    name = f"{TEST_NAME}_resolver"
+    contract_id = Contract.create_name_contract(substrate, ALICE_IDENTITY, name)
+    assert IdResolver.get("ContractIDByNameRegistration", name) == contract_id
+
+    Contract.cancel(substrate, ALICE_IDENTITY, contract_id)
+    assert IdResolver.get("ContractIDByNameRegistration", name) is None
+    assert Contract.get_contract_id_by_name_registration(substrate, name) == 0
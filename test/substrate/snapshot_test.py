@@ -0,0 +1,98 @@
+"""snapshot testing"""
+
+import pytest
+
+from substrate.mirror import SNAPSHOT_SECTIONS, GridMirror
+from substrate.node import Node
+from substrate.snapshot import SNAPSHOT_SCHEMA_VERSION, Snapshot, write_snapshot
+from test.substrate.utils import start_local_connection, GIGABYTE
+
+BLOCK_HASH = "0x" + "11" * 32
+GENESIS_HASH = "0x" + "22" * 32
+
+
+@pytest.fixture(name="substrate", scope="module")
+def fixture_substrate():
+    """connection of the tests reading the chain, the file format tests run offline"""
+    return start_local_connection()
+
+
+def node_value(node_id: int, public_config: dict = None):
+    """value of a node storage entry"""
+    return {
+        "version": 6,
+        "id": node_id,
+        "farm_id": 1,
+        "twin_id": 1,
+        "resources": {"hru": 1024 * GIGABYTE, "sru": 100 * GIGABYTE, "cru": 8, "mru": 16 * GIGABYTE},
+        "location": {"city": "someCity", "country": "someCountry", "latitude": "51.049999", "longitude": "3.733333"},
+        "public_config": public_config,
+        "created": 1,
+        "farming_policy_id": 1,
+        "interfaces": [{"name": "zos", "mac": "00:00:00:00:00:01", "ips": ["10.0.0.1"]}],
+        "certification": "Diy",
+        "secure_boot": False,
+        "virtualized": False,
+        "serial_number": "some_serial",
+        "connection_price": 80,
+    }
+
+
+def write_nodes(path: str, nodes: list[Node]):
+    """write a snapshot of nodes"""
+    sections = {"farms": {}, "nodes": {node.id: node for node in nodes}, "twins": {}, "contracts": {}}
+    write_snapshot(path, 1, BLOCK_HASH, GENESIS_HASH, sections)
+
+
+def test_nodes_public_config(tmp_path):
+    """test nodes with and without a public config are loaded from their snapshot"""
+
+    public_config = {
+        "ip4": {"ip": "185.206.122.33/24", "gw": "185.206.122.1"},
+        "ip6": {"ip": "2a10:b600:1::0cc4:7a30:65b5/64", "gw": "2a10:b600:1::1"},
+        "domain": "gateway.grid.tf",
+    }
+    nodes = [Node.from_value(node_value(1)), Node.from_value(node_value(2, public_config))]
+
+    path = str(tmp_path / "grid.snapshot")
+    write_nodes(path, nodes)
+
+    with Snapshot(path, SNAPSHOT_SECTIONS) as snapshot:
+        assert snapshot.block_hash == BLOCK_HASH
+        assert dict(snapshot.sections["nodes"]) == {node.id: node for node in nodes}
+        assert snapshot.sections["nodes"][2].public_config.as_value.domain.as_value == "gateway.grid.tf"
+
+
+def test_load_other_schema(tmp_path):
+    """test a snapshot written with another schema version is not loaded"""
+
+    path = tmp_path / "grid.snapshot"
+    write_nodes(str(path), [Node.from_value(node_value(1))])
+
+    data = bytearray(path.read_bytes())
+    # schema version follows the magic and the format version
+    data[10:12] = (SNAPSHOT_SCHEMA_VERSION + 1).to_bytes(2, "little")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        Snapshot(str(path), SNAPSHOT_SECTIONS)
+
+
+def test_save_load(tmp_path, substrate):
+    """test a mirror loaded from its snapshot has the same entities and catches up"""
+
+    mirror = GridMirror(substrate)
+    mirror.bootstrap()
+
+    path = str(tmp_path / "grid.snapshot")
+    mirror.save(path)
+
+    loaded = GridMirror.load(substrate, path)
+    assert loaded.block_number == mirror.block_number
+    assert dict(loaded.nodes) == mirror.nodes
+    assert dict(loaded.farms) == mirror.farms
+    assert dict(loaded.twins) == mirror.twins
+    assert dict(loaded.contracts) == mirror.contracts
+
+    loaded.sync()
+    assert loaded.block_number >= mirror.block_number
@@ -0,0 +1,27 @@
+"""extrinsic submitter testing"""
+
+from substrate.contract import Contract
+from substrate.submitter import ExtrinsicSubmitter
+from test.substrate.utils import start_local_connection, ALICE_IDENTITY, TEST_NAME
+
+substrate = start_local_connection()
+
+
+def test_pipelined_name_contracts():
+    """test creating and canceling name contracts without waiting for each inclusion"""
+
+    names = [f"{TEST_NAME}_pipelined_{i}" for i in range(5)]
+
+    with ExtrinsicSubmitter(substrate, ALICE_IDENTITY) as submitter:
+        futures = submitter.submit_many([Contract.create_name_contract_call(substrate, name) for name in names])
+        receipts = [future.result(timeout=120) for future in futures]
+
+    assert all(receipt.is_success for receipt in receipts)
+
+    contract_ids = [Contract.get_contract_id_by_name_registration(substrate, name) for name in names]
+
+    with ExtrinsicSubmitter(substrate, ALICE_IDENTITY) as submitter:
+        futures = submitter.submit_many([Contract.cancel_call(substrate, contract_id) for contract_id in contract_ids])
+        receipts = [future.result(timeout=120) for future in futures]
+
+    assert all(receipt.is_success for receipt in receipts)
@@ -0,0 +1,74 @@
+"""events subscription testing"""
+
+import threading
+
+from substrateinterface.exceptions import SubstrateRequestException
+
+from substrate.contract import Contract
+from substrate.event_records import EventRecords
+from substrate.events import Event
+from substrate.subscription import EventSubscription
+from substrate.twin import Twin
+from test.substrate.utils import start_local_connection, ALICE_IDENTITY, TEST_NAME
+
+substrate = start_local_connection()
+
+
+def test_subscribe_contract_created():
+    """test a subscription receives the creation of a twin contract"""
+
+    twin_id = Twin.get_twin_id_from_public_key(substrate, ALICE_IDENTITY.public_key)
+    created: list[int] = []
+    received = threading.Event()
+
+    def on_events(block_number: int, block_hash: str, records: EventRecords):
+        created.extend(e.contract.contract_id for e in records.SmartContractModule_ContractCreated)
+        received.set()
+
+    with EventSubscription(
+        substrate, filters=[("SmartContractModule", "ContractCreated")], twin_ids={twin_id}
+    ) as subscription:
+        subscription.add_callback(on_events)
+        subscription.start()
+
+        contract_id = Contract.create_name_contract(substrate, ALICE_IDENTITY, f"{TEST_NAME}_subscription")
+        received.wait(timeout=60)
+
+    Contract.cancel(substrate, ALICE_IDENTITY, contract_id)
+
+    assert contract_id in created
+
+
+def test_failed_block_fetched_again(monkeypatch):
+    """test a block failing to be fetched is delivered with the next head and the subscription keeps running"""
+
+    get_block_events = Event.get_block_events
+    failed = threading.Event()
+
+    def fail_once(*args, **kwargs):
+        if not failed.is_set():
+            failed.set()
+            raise SubstrateRequestException("test failure")
+        return get_block_events(*args, **kwargs)
+
+    monkeypatch.setattr(Event, "get_block_events", fail_once)
+
+    blocks: list[int] = []
+    received = threading.Event()
+
+    def on_events(block_number: int, block_hash: str, records: EventRecords):
+        blocks.append(block_number)
+        if len(blocks) >= 2:
+            received.set()
+
+    with EventSubscription(substrate) as subscription:
+        subscription.add_callback(on_events)
+        subscription.start()
+        received.wait(timeout=60)
+        assert subscription.is_running()
+
+    assert failed.is_set()
+    assert not subscription.is_running()
+    assert subscription.error is None
+    # every block has the timestamp events, none is skipped
+    assert blocks == list(range(blocks[0], blocks[0] + len(blocks)))
@@ -1,9 +1,9 @@
 """utils module to be used in testing"""
 
 import os
-from substrateinterface import SubstrateInterface
 
 from substrate.identity import Identity
+from substrate.metadata import open_connection
 
 ACTIVATION_URL = "https://activation.dev.grid.tf/activation/activate"
 # TODO change to ALICE ones
@@ -19,13 +19,17 @@ TEST_NAME = "test_name"
 GIGABYTE = 1024 * 1024 * 1024
 
 
+def get_substrate_url():
+    """get the substrate url to test against"""
+    if "CI" in os.environ:
+        return "ws://127.0.0.1:9944"
+    return "wss://tfchain.dev.grid.tf"
+
+
 def start_local_connection():
     """start a substrate local connection to test"""
     try:
-        if "CI" in os.environ:
-            sub = SubstrateInterface(url="ws://127.0.0.1:9944")
-        else:
-            sub = SubstrateInterface(url="wss://tfchain.dev.grid.tf")
+        sub = open_connection(get_substrate_url())
         assert True
         return sub
 